@@ -0,0 +1,18 @@
+"""
+Benchmarks of the circuit verifiers and table builders.
+
+Each `bench_*` module registers its benchmarks with `runner.benchmark`.  Run
+them with `make bench`, or `python -m benchmarks --help` for the options.
+"""
+
+from . import (
+    bench_bytecode_circuit,
+    bench_copy_circuit,
+    bench_evm_circuit,
+    bench_exp_circuit,
+    bench_import,
+    bench_pi_circuit,
+    bench_state_circuit,
+    bench_tx_circuit,
+)
+from .runner import BENCHMARKS, benchmark, run
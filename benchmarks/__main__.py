@@ -0,0 +1,42 @@
+"""
+Run the benchmarks and report the best time of each one, optionally writing
+the results as JSON or comparing them with a previous report.
+"""
+
+import argparse
+import json
+
+from . import BENCHMARKS, run
+from .runner import compare, load, report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "names", nargs="*", help="run only the benchmarks whose name contains one of these"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark")
+    parser.add_argument("--scale", type=int, default=1, help="multiplier of the workload sizes")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare the results with a previous JSON report"
+    )
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            print(f"{name} sizes={list(bench.sizes)}")
+        return
+
+    results = run(args.names, repeat=args.repeat, scale=args.scale)
+    output = report(results, args.repeat, args.scale)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(output, file, indent=2)
+    if args.compare:
+        compare(output, load(args.compare))
+
+
+if __name__ == "__main__":
+    main()
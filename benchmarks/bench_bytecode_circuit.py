@@ -0,0 +1,51 @@
+from math import ceil, log2
+
+from zkevm_specs.bytecode_circuit import (
+    assign_bytecode_circuit,
+    assign_keccak_table,
+    assign_push_table,
+    check_bytecode_row,
+    verify_bytecode_circuit,
+)
+from zkevm_specs.util import FQ
+
+from .runner import Workload, benchmark
+from .workloads import bytecodes
+
+RANDOMNESS = FQ(0x1234567890ABCDEF)
+
+
+def circuit_size(n_bytes: int) -> int:
+    # one header row per bytecode of at most 256 bytes, and the padding row
+    return ceil(log2(2 * n_bytes + 2))
+
+
+@benchmark("bytecode_circuit.assign_bytecode_circuit", sizes=(1024, 4096))
+def bench_assign_bytecode_circuit(n_bytes: int) -> Workload:
+    unrolled = bytecodes(n_bytes)
+    return lambda: assign_bytecode_circuit(circuit_size(n_bytes), unrolled, RANDOMNESS)
+
+
+@benchmark("bytecode_circuit.check_bytecode_row", sizes=(1024, 4096))
+def bench_check_bytecode_row(n_bytes: int) -> Workload:
+    unrolled = bytecodes(n_bytes)
+    rows = assign_bytecode_circuit(circuit_size(n_bytes), unrolled, RANDOMNESS)
+    push_table = assign_push_table()
+    keccak_table = assign_keccak_table([bytecode.bytes for bytecode in unrolled], RANDOMNESS)
+
+    def run():
+        for idx, row in enumerate(rows):
+            next_row = rows[(idx + 1) % len(rows)]
+            check_bytecode_row(row, next_row, push_table, keccak_table, RANDOMNESS)
+
+    return run
+
+
+@benchmark("bytecode_circuit.verify_bytecode_circuit", sizes=(1024, 4096))
+def bench_verify_bytecode_circuit(n_bytes: int) -> Workload:
+    unrolled = bytecodes(n_bytes)
+    # a circuit with as many padding rows as bytecode rows
+    rows = assign_bytecode_circuit(circuit_size(n_bytes) + 1, unrolled, RANDOMNESS)
+    push_table = assign_push_table()
+    keccak_table = assign_keccak_table([bytecode.bytes for bytecode in unrolled], RANDOMNESS)
+    return lambda: verify_bytecode_circuit(rows, push_table, keccak_table, RANDOMNESS)
@@ -0,0 +1,15 @@
+from zkevm_specs.copy_circuit import verify_copy_table
+
+from .runner import Workload, benchmark
+from .workloads import memory_copy
+
+
+@benchmark("copy_circuit.verify_copy_table", sizes=(256, 1024))
+def bench_verify_copy_table(length: int) -> Workload:
+    copy_circuit, tables, r = memory_copy(length)
+    return lambda: verify_copy_table(copy_circuit, tables, r)
+
+
+@benchmark("copy_circuit.CopyCircuit.copy", sizes=(256, 1024))
+def bench_copy(length: int) -> Workload:
+    return lambda: memory_copy(length)
@@ -0,0 +1,42 @@
+from zkevm_specs.evm_circuit import ExecutionState, Instruction, verify_step, verify_steps
+
+from .runner import Workload, benchmark
+from .workloads import STACK_OPS, evm_block
+
+STEPS = (256, 1024)
+
+
+@benchmark("evm_circuit.verify_steps", sizes=STEPS)
+def bench_verify_steps(n_steps: int) -> Workload:
+    tables, steps = evm_block(n_steps)
+    return lambda: verify_steps(tables, steps)
+
+
+def bench_verify_steps_of(state: ExecutionState):
+    """Time verify_step over the steps of a single execution state of the block"""
+
+    def setup(n_steps: int) -> Workload:
+        tables, steps = evm_block(n_steps)
+        pairs = [
+            (curr, next) for curr, next in zip(steps, steps[1:]) if curr.execution_state == state
+        ]
+
+        def run():
+            for curr, next in pairs:
+                verify_step(
+                    Instruction(
+                        tables=tables,
+                        curr=curr,
+                        next=next,
+                        is_first_step=False,
+                        is_last_step=False,
+                    )
+                )
+
+        return run
+
+    return setup
+
+
+for state in sorted(set([ExecutionState.PUSH] + [state for state, *_ in STACK_OPS.values()])):
+    benchmark(f"evm_circuit.verify_steps[{state.name}]", sizes=STEPS)(bench_verify_steps_of(state))
@@ -0,0 +1,15 @@
+from zkevm_specs.exp_circuit import verify_exp_circuit
+
+from .runner import Workload, benchmark
+from .workloads import exp_events
+
+
+@benchmark("exp_circuit.verify_exp_circuit", sizes=(4, 16))
+def bench_verify_exp_circuit(n_events: int) -> Workload:
+    exp_circuit = exp_events(n_events)
+    return lambda: verify_exp_circuit(exp_circuit)
+
+
+@benchmark("exp_circuit.ExpCircuit.add_event", sizes=(4, 16))
+def bench_add_event(n_events: int) -> Workload:
+    return lambda: exp_events(n_events)
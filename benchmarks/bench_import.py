@@ -0,0 +1,10 @@
+import subprocess
+import sys
+
+from .runner import Workload, benchmark
+
+
+@benchmark("import zkevm_specs")
+def bench_import(_: int) -> Workload:
+    # a fresh interpreter for every run, so nothing is cached in sys.modules
+    return lambda: subprocess.run([sys.executable, "-c", "import zkevm_specs"], check=True)
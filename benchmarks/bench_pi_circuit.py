@@ -0,0 +1,23 @@
+from zkevm_specs.pi_circuit import public_data2witness, verify_circuit
+from zkevm_specs.util import FQ
+
+from .runner import Workload, benchmark
+from .workloads import public_data
+
+RANDOMNESS = FQ(0x1234567890ABCDEF)
+CALLDATA_BYTES_PER_TX = 4
+
+
+@benchmark("pi_circuit.public_data2witness", sizes=(2, 8))
+def bench_public_data2witness(max_txs: int) -> Workload:
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    data = public_data(max_txs - 1, max_calldata_bytes)
+    return lambda: public_data2witness(data, max_txs, max_calldata_bytes, RANDOMNESS)
+
+
+@benchmark("pi_circuit.verify_circuit", sizes=(2, 8))
+def bench_verify_circuit(max_txs: int) -> Workload:
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    data = public_data(max_txs - 1, max_calldata_bytes)
+    witness = public_data2witness(data, max_txs, max_calldata_bytes, RANDOMNESS)
+    return lambda: verify_circuit(witness, max_txs, max_calldata_bytes)
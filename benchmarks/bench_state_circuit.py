@@ -0,0 +1,23 @@
+from zkevm_specs.state_circuit import Tables, assign_state_circuit, mpt_table_from_ops
+from zkevm_specs.state_circuit import verify_state_circuit
+
+from .runner import Workload, benchmark
+from .workloads import state_ops
+
+
+@benchmark("state_circuit.check_state_row", sizes=(1024, 4096, 16384))
+def bench_check_state_row(n_rows: int) -> Workload:
+    ops = state_ops(n_rows)
+    rows = assign_state_circuit(ops)
+    tables = Tables(mpt_table_from_ops(ops))
+
+    def run():
+        assert verify_state_circuit(rows, tables) == []
+
+    return run
+
+
+@benchmark("state_circuit.assign_state_circuit", sizes=(1024, 4096, 16384))
+def bench_assign_state_circuit(n_rows: int) -> Workload:
+    ops = state_ops(n_rows)
+    return lambda: assign_state_circuit(ops)
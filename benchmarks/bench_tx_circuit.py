@@ -0,0 +1,39 @@
+from zkevm_specs.tx_circuit import txs2witness, verify_circuit
+from zkevm_specs.util import FQ, U64
+
+from .runner import Workload, benchmark
+from .workloads import signed_txs
+
+RANDOMNESS = FQ(0x1234567890ABCDEF)
+CHAIN_ID = U64(1337)
+CALLDATA_BYTES_PER_TX = 32
+
+
+@benchmark("tx_circuit.txs2witness", sizes=(16, 64))
+def bench_txs2witness(max_txs: int) -> Workload:
+    txs = signed_txs(max_txs - 1, CHAIN_ID)
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    return lambda: txs2witness(txs, CHAIN_ID, max_txs, max_calldata_bytes, RANDOMNESS)
+
+
+@benchmark("tx_circuit.verify_circuit", sizes=(16, 64))
+def bench_verify_circuit(max_txs: int) -> Workload:
+    txs = signed_txs(max_txs - 1, CHAIN_ID)
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    witness = txs2witness(txs, CHAIN_ID, max_txs, max_calldata_bytes, RANDOMNESS)
+    return lambda: verify_circuit(witness, max_txs, max_calldata_bytes, RANDOMNESS)
+
+
+@benchmark("tx_circuit.txs2witness[workers=4]", sizes=(64,))
+def bench_txs2witness_workers(max_txs: int) -> Workload:
+    txs = signed_txs(max_txs - 1, CHAIN_ID)
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    return lambda: txs2witness(txs, CHAIN_ID, max_txs, max_calldata_bytes, RANDOMNESS, workers=4)
+
+
+@benchmark("tx_circuit.verify_circuit[workers=4]", sizes=(64,))
+def bench_verify_circuit_workers(max_txs: int) -> Workload:
+    txs = signed_txs(max_txs - 1, CHAIN_ID)
+    max_calldata_bytes = max_txs * CALLDATA_BYTES_PER_TX
+    witness = txs2witness(txs, CHAIN_ID, max_txs, max_calldata_bytes, RANDOMNESS)
+    return lambda: verify_circuit(witness, max_txs, max_calldata_bytes, RANDOMNESS, workers=4)
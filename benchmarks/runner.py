@@ -0,0 +1,114 @@
+import json
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, field
+from statistics import mean, median
+from typing import Callable, Dict, List, Optional, Sequence
+
+# A benchmark builds its workload for a given size and returns the function to
+# time, so that generating the workload is not part of the measurement.
+Workload = Callable[[], object]
+Setup = Callable[[int], Workload]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Setup
+    sizes: Sequence[int]
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    times: List[float] = field(default_factory=list)
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "min": min(self.times),
+            "mean": mean(self.times),
+            "median": median(self.times),
+            "times": self.times,
+        }
+
+
+BENCHMARKS: Dict[str, Benchmark] = dict()
+
+
+def benchmark(name: str, sizes: Sequence[int] = (1,)) -> Callable[[Setup], Setup]:
+    """Register a benchmark setup function under `name`, run for every size"""
+
+    def register(setup: Setup) -> Setup:
+        assert name not in BENCHMARKS, f"Benchmark {name} is already registered"
+        BENCHMARKS[name] = Benchmark(name, setup, sizes)
+        return setup
+
+    return register
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    scale: int = 1,
+    log: Callable[[str], None] = print,
+) -> List[Result]:
+    """
+    Run the benchmarks whose name contains one of `names` (all of them by
+    default), `repeat` times each, with their sizes multiplied by `scale`.
+    """
+    results = []
+    for bench in BENCHMARKS.values():
+        if names and not any(name in bench.name for name in names):
+            continue
+        for size in bench.sizes:
+            size *= scale
+            workload = bench.setup(size)
+            result = Result(bench.name, size)
+            for _ in range(repeat):
+                start = time.perf_counter()
+                workload()
+                result.times.append(time.perf_counter() - start)
+            log(f"{bench.name:<48} size={size:<8} min={min(result.times):.4f}s")
+            results.append(result)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: List[Result], repeat: int, scale: int) -> Dict[str, object]:
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+        "scale": scale,
+        "results": [result.to_json() for result in results],
+    }
+
+
+def compare(report: Dict, baseline: Dict, log: Callable[[str], None] = print) -> None:
+    """Print the ratio of the best times of `report` to the ones of `baseline`"""
+    base_times = {(r["name"], r["size"]): r["min"] for r in baseline["results"]}
+    log(f"Compared to {baseline.get('revision') or 'baseline'}:")
+    for result in report["results"]:  # type: ignore
+        key = (result["name"], result["size"])
+        if key in base_times and base_times[key] > 0:
+            ratio = result["min"] / base_times[key]
+            log(f"{result['name']:<48} size={result['size']:<8} {ratio:.2f}x")
+
+
+def load(path: str) -> Dict:
+    with open(path) as file:
+        return json.load(file)
@@ -0,0 +1,260 @@
+"""
+Synthetic workloads for the benchmarks.  Every generator is deterministic for
+a given size, so that runs on different commits measure the same work.
+"""
+
+from random import Random
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from eth_keys import keys  # type: ignore
+from eth_utils import keccak
+import rlp  # type: ignore
+
+from zkevm_specs import pi_circuit, tx_circuit
+from zkevm_specs.bytecode_circuit import UnrolledBytecode
+from zkevm_specs.evm_circuit import (
+    Block,
+    Bytecode,
+    CopyCircuit,
+    CopyDataTypeTag,
+    ExecutionState,
+    ExpCircuit,
+    Opcode,
+    RWDictionary,
+    StepState,
+    Tables,
+)
+from zkevm_specs.state_circuit import MemoryOp, Operation, RW, StackOp, StartOp
+from zkevm_specs.util import FQ, U8, U64, U160, U256, IntOrFQ, Word
+
+MAX_U256 = 2**256 - 1
+
+# Stack opcodes of the synthetic EVM blocks: execution state, number of popped
+# values and the pushed result (if any) from the popped values, top first.
+STACK_OPS: Dict[Opcode, Tuple[ExecutionState, int, Optional[Callable[..., int]]]] = {
+    Opcode.ADD: (ExecutionState.ADD, 2, lambda a, b: (a + b) & MAX_U256),
+    Opcode.SUB: (ExecutionState.ADD, 2, lambda a, b: (a - b) & MAX_U256),
+    Opcode.MUL: (ExecutionState.MUL, 2, lambda a, b: (a * b) & MAX_U256),
+    Opcode.ISZERO: (ExecutionState.ISZERO, 1, lambda a: int(a == 0)),
+    Opcode.NOT: (ExecutionState.NOT, 1, lambda a: a ^ MAX_U256),
+    Opcode.POP: (ExecutionState.POP, 1, None),
+}
+
+
+def evm_block(n_steps: int, seed: int = 0) -> Tuple[Tables, List[StepState]]:
+    """
+    A single call running `n_steps` random PUSH32 and stack opcodes, followed
+    by STOP, with the matching bytecode and rw tables.
+    """
+    rng = Random(seed)
+    bytecode = Bytecode()
+    rws = RWDictionary(1)
+    stack: List[int] = []
+    # (execution state, program counter, stack pointer, rw_counter, gas cost)
+    trace: List[Tuple[ExecutionState, int, int, int, int]] = []
+    opcodes = list(STACK_OPS)
+    for _ in range(n_steps):
+        opcode = rng.choice(opcodes)
+        pc, sp, rw_counter = len(bytecode.code), 1024 - len(stack), rws.rw_counter
+        state, n_pops, result = STACK_OPS[opcode]
+        if len(stack) < n_pops or (len(stack) < 1000 and rng.random() < 0.4):
+            value = rng.randrange(2**256)
+            bytecode.push(value, n_bytes=32)
+            rws.stack_write(1, sp - 1, Word(value))
+            stack.append(value)
+            trace.append(
+                (ExecutionState.PUSH, pc, sp, rw_counter, Opcode.PUSH32.constant_gas_cost())
+            )
+            continue
+        args = [stack.pop() for _ in range(n_pops)]
+        for i, arg in enumerate(args):
+            rws.stack_read(1, sp + i, Word(arg))
+        if result is not None:
+            stack.append(result(*args))
+            rws.stack_write(1, sp + n_pops - 1, Word(stack[-1]))
+        getattr(bytecode, opcode.name.lower())()
+        trace.append((state, pc, sp, rw_counter, opcode.constant_gas_cost()))
+    stop_pc, stop_sp = len(bytecode.code), 1024 - len(stack)
+    bytecode.stop()
+
+    code_hash = Word(bytecode.hash())
+    gas_left = sum(cost for *_, cost in trace)
+    steps = []
+    for state, pc, sp, rw_counter, cost in trace:
+        steps.append(
+            StepState(
+                execution_state=state,
+                rw_counter=rw_counter,
+                call_id=1,
+                is_root=True,
+                code_hash=code_hash,
+                program_counter=pc,
+                stack_pointer=sp,
+                gas_left=gas_left,
+            )
+        )
+        gas_left -= cost
+    steps.append(
+        StepState(
+            execution_state=ExecutionState.STOP,
+            rw_counter=rws.rw_counter,
+            call_id=1,
+            is_root=True,
+            code_hash=code_hash,
+            program_counter=stop_pc,
+            stack_pointer=stop_sp,
+            gas_left=0,
+        )
+    )
+    tables = Tables(
+        block_table=set(Block().table_assignments()),
+        tx_table=set(),
+        bytecode_table=set(bytecode.table_assignments()),
+        rw_table=rws.table,
+    )
+    return tables, steps
+
+
+def state_ops(n_ops: int, seed: int = 0) -> List[Operation]:
+    """Sorted memory and stack writes, with a new call every 1024 stack writes"""
+    rng = Random(seed)
+    ops: List[Operation] = [StartOp(rw_counter=1, rw=RW.Read, lexicographic_ordering_selector=0)]
+    n_memory = n_ops // 2
+    for i in range(n_memory):
+        ops.append(
+            MemoryOp(
+                rw_counter=i + 1,
+                rw=RW.Write,
+                call_id=1,
+                mem_addr=U160(i),
+                value=U8(rng.randrange(256)),
+            )
+        )
+    for i in range(n_ops - n_memory):
+        ops.append(
+            StackOp(
+                rw_counter=n_memory + i + 1,
+                rw=RW.Write,
+                call_id=1 + i // 1024,
+                stack_ptr=i % 1024,
+                value=Word(rng.randrange(2**256)),
+            )
+        )
+    return ops
+
+
+def memory_copy(length: int, seed: int = 0) -> Tuple[CopyCircuit, Tables, FQ]:
+    """A memory to memory copy of `length` bytes between two calls"""
+    rng = Random(seed)
+    r = FQ(rng.randrange(FQ.field_modulus))
+    src_data: Mapping[IntOrFQ, IntOrFQ] = dict((i, rng.randrange(256)) for i in range(length))
+    rws = RWDictionary(1)
+    copy_circuit = CopyCircuit().copy(
+        r,
+        rws,
+        1,
+        CopyDataTypeTag.Memory,
+        2,
+        CopyDataTypeTag.Memory,
+        0,
+        length,
+        0,
+        length,
+        src_data,
+    )
+    tables = Tables(
+        block_table=set(),
+        tx_table=set(),
+        bytecode_table=set(),
+        rw_table=rws.table,
+        copy_circuit=copy_circuit.rows,
+    )
+    return copy_circuit, tables, r
+
+
+def exp_events(n_events: int, seed: int = 0) -> ExpCircuit:
+    """An exp circuit with `n_events` random 256 bit exponentiations"""
+    rng = Random(seed)
+    exp_circuit = ExpCircuit()
+    for i in range(n_events):
+        exp_circuit.add_event(rng.randrange(2**256), rng.randrange(2**256), i + 1)
+    return exp_circuit.fill_dummy_events()
+
+
+def bytecodes(n_bytes: int, seed: int = 0) -> List[UnrolledBytecode]:
+    """Random bytecodes of up to 256 bytes, `n_bytes` bytes in total"""
+    rng = Random(seed)
+    result = []
+    while n_bytes > 0:
+        code = bytes(rng.randrange(256) for _ in range(min(n_bytes, rng.randrange(1, 257))))
+        n_bytes -= len(code)
+        rows = list(Bytecode(bytearray(code)).table_assignments())
+        result.append(UnrolledBytecode(code, rows))
+    return result
+
+
+def public_data(n_txs: int, max_calldata_bytes: int, seed: int = 0) -> pi_circuit.PublicData:
+    rng = Random(seed)
+
+    def u256() -> U256:
+        return U256(rng.randrange(2**256))
+
+    block = pi_circuit.Block(
+        hash=u256(),
+        parent_hash=u256(),
+        uncle_hash=u256(),
+        coinbase=U160(rng.randrange(2**160)),
+        state_root=u256(),
+        tx_hash=u256(),
+        receipt_hash=u256(),
+        bloom=rng.randbytes(256),
+        difficulty=u256(),
+        number=U64(rng.randrange(2**64)),
+        gas_limit=U64(rng.randrange(2**64)),
+        gas_used=U64(rng.randrange(2**64)),
+        time=U64(rng.randrange(2**64)),
+        extra=bytes([]),
+        mix_digest=u256(),
+        nonce=U64(rng.randrange(2**64)),
+        base_fee=U256(0),
+    )
+    txs = [
+        pi_circuit.Transaction(
+            nonce=U64(rng.randrange(2**64)),
+            gas_price=u256(),
+            gas=U64(rng.randrange(2**64)),
+            from_addr=U160(rng.randrange(2**160)),
+            to_addr=U160(rng.randrange(2**160)),
+            value=u256(),
+            data=rng.randbytes(max_calldata_bytes // n_txs),
+            tx_sign_hash=u256(),
+        )
+        for _ in range(n_txs)
+    ]
+    block_hashes = [u256() for _ in range(256)]
+    return pi_circuit.PublicData(U64(rng.randrange(1, 128)), block, u256(), block_hashes, txs)
+
+
+def signed_txs(n_txs: int, chain_id: int, seed: int = 0) -> List[tx_circuit.Transaction]:
+    """`n_txs` transactions with calldata, each signed by a different key"""
+    rng = Random(seed)
+    txs = []
+    for i in range(n_txs):
+        sk = keys.PrivateKey(rng.randbytes(31) + bytes([i + 1]))
+        tx = tx_circuit.Transaction(
+            U64(rng.randrange(2**32)),
+            U256(rng.randrange(2**64)),
+            U64(rng.randrange(21000, 2**32)),
+            U160(rng.randrange(2**160)),
+            U256(rng.randrange(2**128)),
+            rng.randbytes(i % 32),
+            U64(0),
+            U256(0),
+            U256(0),
+        )
+        sign_data = rlp.encode(
+            [tx.nonce, tx.gas_price, tx.gas, tx.encode_to(), tx.value, tx.data, chain_id, 0, 0]
+        )
+        sig = sk.sign_msg_hash(keccak(sign_data))
+        txs.append(tx._replace(sig_v=sig.v + chain_id * 2 + 35, sig_r=sig.r, sig_s=sig.s))
+    return txs
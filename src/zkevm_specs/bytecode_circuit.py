@@ -1,8 +1,14 @@
+import os
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Sequence, Tuple, Set, List
-from .util import EMPTY_HASH, FQ, Word, is_circuit_code
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+from typing import Collection, Dict, Iterable, Optional, Sequence, Tuple, Set, List, Union, overload
+from .util import EMPTY_HASH, FQ, U256, Word, is_circuit_code, linear_combine_bytes
 from .evm_circuit import (
     get_push_size,
+    code_hash,
+    code_is_code,
     BytecodeFieldTag,
     BytecodeTableRow,
     KeccakTableRow,
@@ -37,9 +43,9 @@ class UnrolledBytecode:
 def check_bytecode_row(
     cur: Row,
     next: Row,
-    push_table: Set[Tuple[int, int]],
-    keccak_table: Set[Tuple[int, int, int]],
-    keccak_randomness: int,
+    push_table: Collection[Tuple[FQ, FQ]],
+    keccak_table: Set[KeccakTableRow],
+    keccak_randomness: FQ,
 ):
     if cur.q_first == 1:
         assert cur.tag == BytecodeFieldTag.Header
@@ -83,7 +89,7 @@ def check_bytecode_row_header_to_header(cur: Row):
 
 
 @is_circuit_code
-def check_bytecode_row_byte_to_byte(cur: Row, next: Row, r: int):
+def check_bytecode_row_byte_to_byte(cur: Row, next: Row, r: FQ):
     assert next.length == cur.length
     assert next.index == cur.index + 1
     assert next.hash == cur.hash
@@ -100,16 +106,104 @@ def check_bytecode_row_byte_to_header(cur: Row, keccak_table: Set[KeccakTableRow
     assert KeccakTableRow(FQ(2), cur.value_rlc, cur.length, cur.hash) in keccak_table
 
 
+def padding_row(q_first: bool, q_last: bool) -> Row:
+    return Row(
+        q_first=FQ(q_first),
+        q_last=FQ(q_last),
+        hash=Word(EMPTY_HASH),
+        tag=FQ(BytecodeFieldTag.Header),
+        index=FQ(0),
+        value=FQ(0),
+        is_code=FQ(False),
+        push_data_left=FQ(0),
+        value_rlc=FQ(0),
+        length=FQ(0),
+        push_data_size=FQ(0),
+    )
+
+
+class BytecodeCircuitRows(Sequence[Row]):
+    """
+    Rows of the bytecode circuit: the rows of the bytecodes, followed by a run
+    of `n_padding` empty-hash padding rows that are only built when read.  A
+    padding row is built again on every read, so changing it in place doesn't
+    change the circuit.
+    Assigning a padding row turns the padding up to it into regular rows.
+    """
+
+    rows: List[Row]
+    n_padding: int
+
+    def __init__(self, rows: List[Row], n_padding: int = 0) -> None:
+        self.rows = rows
+        self.n_padding = n_padding
+
+    def __len__(self) -> int:
+        return len(self.rows) + self.n_padding
+
+    @overload
+    def __getitem__(self, idx: int) -> Row:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Row]:
+        ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        idx = self._index(idx)
+        if idx < len(self.rows):
+            return self.rows[idx]
+        return padding_row(idx == 0, idx == len(self) - 1)
+
+    def __setitem__(self, idx: int, row: Row):
+        idx = self._index(idx)
+        if idx >= len(self.rows):
+            n_rows = len(self)
+            self.rows.extend(self[len(self.rows) : idx + 1])
+            self.n_padding = n_rows - len(self.rows)
+        self.rows[idx] = row
+
+    def _index(self, idx: int) -> int:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("bytecode circuit row index out of range")
+        return idx
+
+
 # Populate the circuit matrix
 def assign_bytecode_circuit(
-    k: int, bytecodes: Sequence[UnrolledBytecode], keccak_randomness: FQ
-) -> List[Row]:
+    k: int,
+    bytecodes: Sequence[UnrolledBytecode],
+    keccak_randomness: FQ,
+    store: Optional["BytecodeStore"] = None,
+) -> BytecodeCircuitRows:
+    """
+    With a `store`, the push_data_size, push_data_left and value_rlc of the
+    bytecodes are read from it instead of being computed again, which requires
+    the rows of each bytecode to hold its bytes.
+    """
     # All rows are usable in this emulation
     last_row_offset = 2**k - 1
 
     rows = []
     offset = 0
     for bytecode in bytecodes:
+        stored_code: Sequence[int] = ()
+        stored_push_data_size: Sequence[int] = ()
+        stored_push_data_left: Sequence[int] = ()
+        stored_value_rlcs: Optional[List[FQ]] = None
+        if store is not None:
+            stored = store.get(bytecode.bytes)
+            assert (
+                len(bytecode.rows) == len(stored.code) + 1
+            ), "The rows of a stored bytecode don't match its bytes"
+            stored_code = stored.code
+            stored_push_data_size = stored.push_data_size
+            stored_push_data_left = stored.push_data_left
+            stored_value_rlcs = stored.value_rlcs(keccak_randomness)
         next_push_data_left = 0
         value_rlc = FQ(0)
         for idx, row in enumerate(bytecode.rows):
@@ -118,7 +212,14 @@ def assign_bytecode_circuit(
             push_data_left = next_push_data_left
             is_code = push_data_left == 0
             push_data_size = 0
-            if idx > 0:
+            if idx > 0 and stored_value_rlcs is not None:
+                assert (
+                    row.value.expr().n == stored_code[idx - 1]
+                ), "The rows of a stored bytecode don't match its bytes"
+                push_data_left = stored_push_data_left[idx - 1]
+                push_data_size = stored_push_data_size[idx - 1]
+                value_rlc = stored_value_rlcs[idx - 1]
+            elif idx > 0:
                 push_data_size = get_push_size(row.value)
                 next_push_data_left = push_data_size if is_code else push_data_left - 1
                 # Add the byte to the accumulator
@@ -144,27 +245,246 @@ def assign_bytecode_circuit(
             offset += 1
             # return when the circuit is full
             if offset == 2**k:
-                return rows
+                return BytecodeCircuitRows(rows)
 
     # Padding
-    for idx in range(offset, 2**k):
-        rows.append(
-            Row(
-                q_first=FQ(idx == 0),
-                q_last=FQ(idx == last_row_offset),
-                hash=Word(EMPTY_HASH),
-                tag=FQ(BytecodeFieldTag.Header),
-                index=FQ(0),
-                value=FQ(0),
-                is_code=FQ(False),
-                push_data_left=FQ(0),
-                value_rlc=FQ(0),
-                length=FQ(0),
-                push_data_size=FQ(0),
-            )
+    return BytecodeCircuitRows(rows, 2**k - offset)
+
+
+def verify_bytecode_circuit(
+    rows: Sequence[Row],
+    push_table: Collection[Tuple[FQ, FQ]],
+    keccak_table: Set[KeccakTableRow],
+    keccak_randomness: FQ,
+):
+    """
+    Check every row of the bytecode circuit with its next one.  In the padding
+    run of a BytecodeCircuitRows all the rows between the first and the last
+    two are the same row followed by the same row, so only one of them is
+    checked.
+    """
+    offsets: Sequence[int] = range(len(rows))
+    if isinstance(rows, BytecodeCircuitRows) and rows.n_padding > 0:
+        start, last = len(rows.rows), len(rows) - 1
+        padding = sorted({start, min(start + 1, last), max(start, last - 1), last})
+        offsets = [*range(start), *padding]
+    for offset in offsets:
+        check_bytecode_row(
+            rows[offset],
+            rows[(offset + 1) % len(rows)],
+            push_table,
+            keccak_table,
+            keccak_randomness,
+        )
+
+
+# Bytecode store format
+#
+# Each bytecode is a file `<code hash>.bytecode` holding a header (magic, format
+# version, code length n) and four n byte columns: the code, is_code,
+# push_data_size and push_data_left of each byte.
+#
+# The value_rlc of the bytes with a keccak randomness are in another file,
+# `<code hash>.<randomness>.rlc`, holding the same header and the value_rlc of
+# each byte as a 32 byte little-endian field element.  There's one such file
+# per randomness used with the bytecode.
+#
+# Files are checked against the code when they're read (the code column, and
+# the value_rlc of the last byte), and written again when they don't match.
+
+BYTECODE_STORE_MAGIC = b"ZKBYTECO"
+BYTECODE_STORE_VERSION = 1
+N_BYTES_RLC = 32
+
+# magic, version, code length
+_STORE_HEADER = Struct("<8sHQ")
+
+
+class StoredBytecode:
+    """
+    Unrolled bytecode read from the memory mapped files of a BytecodeStore.
+    Its columns can't be read anymore once it's closed, which the store does
+    when it's evicted.
+    """
+
+    hash: U256
+    path: str
+    buffer: mmap
+    code: memoryview
+    is_code: memoryview
+    push_data_size: memoryview
+    push_data_left: memoryview
+    rows: Optional[List[BytecodeTableRow]]
+    rlcs: Dict[int, List[FQ]]
+
+    def __init__(self, hash: U256, path: str) -> None:
+        self.hash = hash
+        self.path = path
+        self.buffer, n = _read_store_file(path + ".bytecode", 4)
+        self.code, self.is_code, self.push_data_size, self.push_data_left = (
+            memoryview(self.buffer)[_STORE_HEADER.size + i * n : _STORE_HEADER.size + (i + 1) * n]
+            for i in range(4)
         )
+        self.rows = None
+        self.rlcs = dict()
+
+    def close(self) -> None:
+        """Unmap the file, keeping the table rows and value_rlcs already built"""
+        for column in (self.code, self.is_code, self.push_data_size, self.push_data_left):
+            column.release()
+        self.buffer.close()
+
+    def table_rows(self) -> List[BytecodeTableRow]:
+        """Rows of the bytecode in the bytecode table, built on the first call"""
+        if self.rows is None:
+            hash = Word(self.hash)
+            self.rows = [
+                BytecodeTableRow(
+                    hash, FQ(BytecodeFieldTag.Header), FQ(0), FQ(0), FQ(len(self.code))
+                )
+            ]
+            byte_tag = FQ(BytecodeFieldTag.Byte)
+            self.rows.extend(
+                BytecodeTableRow(hash, byte_tag, FQ(idx), FQ(is_code), FQ(byte))
+                for idx, (byte, is_code) in enumerate(zip(self.code, self.is_code))
+            )
+        return self.rows
+
+    def value_rlcs(self, keccak_randomness: FQ) -> List[FQ]:
+        """
+        value_rlc of each byte with the randomness, read from its file, which is
+        written on the first call, or again when it doesn't hold the value_rlcs
+        of this code
+        """
+        randomness = keccak_randomness.n
+        if randomness not in self.rlcs:
+            path = f"{self.path}.{randomness:064x}.rlc"
+            rlcs = self._read_value_rlcs(path, keccak_randomness)
+            if rlcs is None:
+                rlcs = []
+                acc = 0
+                for byte in self.code:
+                    acc = (acc * randomness + byte) % FQ.field_modulus
+                    rlcs.append(FQ(acc))
+                _write_store_file(
+                    path, len(rlcs), b"".join(rlc.n.to_bytes(N_BYTES_RLC, "little") for rlc in rlcs)
+                )
+            self.rlcs[randomness] = rlcs
+        return self.rlcs[randomness]
+
+    def _read_value_rlcs(self, path: str, keccak_randomness: FQ) -> Optional[List[FQ]]:
+        if not os.path.exists(path):
+            return None
+        buffer, n = _read_store_file(path, N_BYTES_RLC)
+        with buffer:
+            rlcs = [
+                FQ(int.from_bytes(buffer[pos : pos + N_BYTES_RLC], "little"))
+                for pos in range(
+                    _STORE_HEADER.size, _STORE_HEADER.size + n * N_BYTES_RLC, N_BYTES_RLC
+                )
+            ]
+        # The last value_rlc is the rlc of the whole code, which tells apart
+        # (but for a negligible probability) a file left by another code
+        if n != len(self.code) or (
+            n > 0 and rlcs[-1] != linear_combine_bytes(bytes(self.code[::-1]), keccak_randomness)
+        ):
+            return None
+        return rlcs
+
+
+class BytecodeStore:
+    """
+    On-disk store of unrolled bytecodes, content addressed by code hash, so
+    that the bytecodes used by many blocks are only unrolled once.  The last
+    `max_size` bytecodes read are kept in memory, with their table rows and
+    value_rlcs once they've been built.
+    """
+
+    path: str
+    max_size: int
+    entries: "OrderedDict[U256, StoredBytecode]"
+    hits: int
+    misses: int
 
-    return rows
+    def __init__(self, path: str, max_size: int = 1024) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, code: Union[bytes, bytearray]) -> StoredBytecode:
+        """The stored bytecode of the code, which is written on the first call"""
+        code = bytes(code)
+        hash = code_hash(code)
+        stored = self.entries.get(hash)
+        if stored is not None:
+            self.hits += 1
+            self.entries.move_to_end(hash)
+            return stored
+        self.misses += 1
+
+        path = os.path.join(self.path, f"{hash:064x}")
+        if not os.path.exists(path + ".bytecode"):
+            _write_bytecode_file(path + ".bytecode", code)
+        stored = StoredBytecode(hash, path)
+        if stored.code != code:
+            # a stale file, or another code with the same hash
+            stored.close()
+            _write_bytecode_file(path + ".bytecode", code)
+            stored = StoredBytecode(hash, path)
+        self.entries[hash] = stored
+        while len(self.entries) > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            evicted.close()
+        return stored
+
+    def unrolled(self, code: Union[bytes, bytearray]) -> UnrolledBytecode:
+        return UnrolledBytecode(bytes(code), self.get(code).table_rows())
+
+    def bytecode_table(self, codes: Iterable[Union[bytes, bytearray]]) -> Set[BytecodeTableRow]:
+        """Bytecode table of the codes, to be passed to `Tables`"""
+        table: Set[BytecodeTableRow] = set()
+        for code in codes:
+            table.update(self.get(code).table_rows())
+        return table
+
+
+def _write_bytecode_file(path: str, code: bytes):
+    push_data_size = bytes(get_push_size(byte) for byte in code)
+    push_data_left = bytearray()
+    next_push_data_left = 0
+    for size, is_code in zip(push_data_size, code_is_code(code)):
+        push_data_left.append(next_push_data_left)
+        next_push_data_left = size if is_code else next_push_data_left - 1
+    columns = code + bytes(code_is_code(code)) + push_data_size + push_data_left
+    _write_store_file(path, len(code), columns)
+
+
+def _write_store_file(path: str, n: int, data: Union[bytes, bytearray]):
+    # written to a temporary file first, so that a store shared between
+    # processes never has partial files
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_STORE_HEADER.pack(BYTECODE_STORE_MAGIC, BYTECODE_STORE_VERSION, n))
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_store_file(path: str, n_bytes: int) -> Tuple[mmap, int]:
+    """Memory mapped store file with n_bytes per byte of code, and the code length"""
+    with open(path, "rb") as file:
+        buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+    magic, version, n = _STORE_HEADER.unpack_from(buffer)
+    if magic != BYTECODE_STORE_MAGIC or version != BYTECODE_STORE_VERSION:
+        raise ValueError(f"{path} is not a version {BYTECODE_STORE_VERSION} bytecode store file")
+    if len(buffer) < _STORE_HEADER.size + n * n_bytes:
+        raise ValueError(f"{path} is truncated")
+    return buffer, n
 
 
 # Generate the push table: BYTE -> NUM_PUSHED:
@@ -180,7 +500,4 @@ def assign_push_table() -> List[Tuple[FQ, FQ]]:
 
 # Generate keccak table with row = [input_rlc, input_len, output]
 def assign_keccak_table(bytecodes: Sequence[bytes], keccak_randomness: FQ) -> Set[KeccakTableRow]:
-    keccak_circuit = KeccakCircuit()
-    for bytecode in bytecodes:
-        keccak_circuit.add(bytecode, keccak_randomness)
-    return set(keccak_circuit.rows)
+    return set(KeccakCircuit().extend(bytecodes, keccak_randomness).rows)
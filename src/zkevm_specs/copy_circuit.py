@@ -1,8 +1,21 @@
-from typing import Sequence
+from collections import deque
+from itertools import chain, islice
+from typing import Dict, Sequence
 
-from .util import FQ, Expression, ConstraintSystem, cast_expr, MAX_N_BYTES, N_BYTES_MEMORY_ADDRESS
+from .util import (
+    FQ,
+    Expression,
+    ConstraintSystem,
+    cast_expr,
+    MAX_N_BYTES,
+    N_BYTES_MEMORY_ADDRESS,
+)
 from .evm_circuit import (
+    BatchLookup,
+    BytecodeTableRow,
+    RWTableRow,
     Tables,
+    TxTableRow,
     CopyDataTypeTag,
     CopyCircuitRow,
     RW,
@@ -89,21 +102,61 @@ def verify_step(cs: ConstraintSystem, rows: Sequence[CopyCircuitRow], r: FQ):
         cs.constrain_equal(rows[2].value, rows[0].value * r + rows[1].value)
 
 
-def verify_copy_table(copy_circuit: CopyCircuit, tables: Tables, r: FQ):
+# Columns of the lookups of the copy rows into the rw, bytecode and tx tables,
+# whose matched row must have the value of the copy row
+RW_LOOKUP_COLUMNS = ("rw_counter", "rw", "key0", "id", "address")
+BYTECODE_LOOKUP_COLUMNS = ("bytecode_hash", "field_tag", "index", "is_code")
+TX_LOOKUP_COLUMNS = ("tx_id", "field_tag", "call_data_index_or_zero")
+
+
+def verify_copy_table(copy_circuit: CopyCircuit, tables: Tables, r: FQ, batch_lookups: bool = True):
+    """
+    Verify the copy table and its lookups into the other tables.  With
+    `batch_lookups`, the lookups are collected by target table and each table is
+    joined with its lookups once, otherwise they're done row by row.  Both
+    fail the same way, but a batched lookup that's unsatisfied or ambiguous
+    reports the indices of the copy rows.
+    """
     cs = ConstraintSystem()
     copy_table = copy_circuit.table()
     n = len(copy_table)
-    for i, row in enumerate(copy_table):
-        rows = [
-            row,
-            copy_table[(i + 1) % n],
-            copy_table[(i + 2) % n],
-        ]
+    rw_lookups = BatchLookup(RWTableRow, RW_LOOKUP_COLUMNS)
+    bytecode_lookups = BatchLookup(BytecodeTableRow, BYTECODE_LOOKUP_COLUMNS)
+    tx_lookups = BatchLookup(TxTableRow, TX_LOOKUP_COLUMNS)
+    # values of the copy rows, for the rows matched by the batched lookups
+    values: Dict[int, FQ] = dict()
+    # build each row once, and slide a window of 3 rows over the table
+    following = chain(copy_table, [copy_table[i % n] for i in range(2)] if n else [])
+    window = deque(islice(following, 2), maxlen=3)
+    for i in range(n):
+        window.append(next(following))
+        rows = list(window)
+        row = rows[0]
         # constrain on each row and step
         verify_row(cs, rows)
         verify_step(cs, rows, r)
 
         # lookup into tables
+        if batch_lookups:
+            if row.is_memory == 1 and row.is_pad == 0:
+                rw_lookups.add(
+                    i, row.rw_counter, 1 - row.q_step, FQ(Target.Memory), row.id.value(), row.addr
+                )
+            if row.is_bytecode == 1 and row.is_pad == 0:
+                bytecode_lookups.add(i, row.id, FQ(BytecodeFieldTag.Byte), row.addr, row.is_code)
+            if row.is_tx_calldata == 1 and row.is_pad == 0:
+                tx_lookups.add(i, row.id.value(), FQ(TxContextFieldTag.CallData), row.addr)
+            if row.is_tx_log == 1:
+                rw_lookups.add(
+                    i,
+                    row.rw_counter,
+                    FQ(RW.Write),
+                    FQ(Target.TxLog),
+                    row.id.value(),  # tx_id
+                    row.addr,
+                )
+            values[i] = row.value
+            continue
         if row.is_memory == 1 and row.is_pad == 0:
             val = tables.rw_lookup(
                 row.rw_counter, 1 - row.q_step, FQ(Target.Memory), row.id.value(), row.addr
@@ -128,3 +181,10 @@ def verify_copy_table(copy_circuit: CopyCircuit, tables: Tables, r: FQ):
                 row.addr,
             ).value.value()
             cs.constrain_equal(val, row.value)
+
+    for i, rw_row in rw_lookups.verify(tables.rw_table).items():
+        cs.constrain_equal(rw_row.value.value(), values[i])
+    for i, bytecode_row in bytecode_lookups.verify(tables.bytecode_table).items():
+        cs.constrain_equal(cast_expr(bytecode_row.value, FQ), values[i])
+    for i, tx_row in tx_lookups.verify(tables.tx_table).items():
+        cs.constrain_equal(tx_row.value.value(), values[i])
@@ -3,7 +3,9 @@ from .execution_state import *
 from .main import *
 from .opcode import *
 from .precompile import *
+from .profiler import *
 from .step import *
 from .table import *
 from .typing import *
 from .util import *
+from .witness import *
@@ -7,7 +7,7 @@ from ..table import (
     BlockContextFieldTag,
     TxReceiptFieldTag,
 )
-from typing import Set
+from typing import Iterable
 
 # EndBlock is an execution state that constraints the following:
 # A. Once the EndBlock state is reached, there's no other execution states
@@ -55,7 +55,7 @@ from typing import Set
 
 # Count the max number of txs that the TxTable can hold by counting rows of
 # type CallerAddress.
-def get_tx_table_max_txs(table: Set[TxTableRow]) -> int:
+def get_tx_table_max_txs(table: Iterable[TxTableRow]) -> int:
     return len([row for row in table if row.field_tag == TxContextFieldTag.CallerAddress])
 
 
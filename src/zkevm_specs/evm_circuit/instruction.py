@@ -128,6 +128,9 @@ class Instruction:
     stack_pointer_offset: int = 0
     log_index_offset: int = 0
 
+    # number of constrain_* checks evaluated, read by StepProfiler
+    constraint_count: int = 0
+
     def __init__(
         self,
         tables: Tables,
@@ -143,42 +146,51 @@ class Instruction:
         self.is_last_step = is_last_step
 
     def constrain_zero(self, value: Expression):
+        self.constraint_count += 1
         assert value.expr() == 0, ConstraintUnsatFailure(f"Expected value to be 0, but got {value}")
 
     def constrain_not_zero(self, value: Expression):
+        self.constraint_count += 1
         assert value.expr() != 0, ConstraintUnsatFailure(
             f"Expected value to be != 0, but got {value}"
         )
 
     def constrain_zero_word(self, value: Word):
+        self.constraint_count += 1
         assert value.lo.expr() == 0 and value.hi.expr() == 0, ConstraintUnsatFailure(
             f"Expected word to be 0, but got {value}"
         )
 
     def constrain_not_zero_word(self, value: Word):
+        self.constraint_count += 1
         assert value.lo.expr() != 0 or value.hi.expr() != 0, ConstraintUnsatFailure(
             f"Expected word to be != 0, but got {value}"
         )
 
     def constrain_equal(self, lhs: Expression, rhs: Expression):
+        self.constraint_count += 1
         assert lhs.expr() == rhs.expr(), ConstraintUnsatFailure(
             f"Expected values to be equal, but got {lhs} and {rhs}"
         )
 
     def constrain_equal_word(self, lhs: Word, rhs: Word):
+        self.constraint_count += 1
         assert (
             lhs.lo.expr() == rhs.lo.expr() and lhs.hi.expr() == rhs.hi.expr()
         ), ConstraintUnsatFailure(f"Expected words to be equal, but got {lhs} and {rhs}")
 
     def constrain_in(self, lhs: Expression, rhs: List[FQ]):
+        self.constraint_count += 1
         assert lhs.expr() in rhs, ConstraintUnsatFailure(
             f"Expected value to be in {rhs}, but got {lhs}"
         )
 
     def constrain_in_word(self, lhs: Word, rhs: List[Word]):
+        self.constraint_count += 1
         assert lhs in rhs, ConstraintUnsatFailure(f"Expected word to be in {rhs}, but got {lhs}")
 
     def constrain_bool(self, num: Expression):
+        self.constraint_count += 1
         assert num.expr() in [0, 1], ConstraintUnsatFailure(
             f"Expected value to be a bool, but got {num}"
         )
@@ -245,7 +257,7 @@ class Instruction:
                 curr, next = cast(FQ, curr), cast(FQ, next)
                 value = cast(FQ, transition.value)
                 assert next.expr() == curr.expr() + value.expr(), ConstraintUnsatFailure(
-                    f"State {key} should transit to {curr} + {transition.value} ({curr + transition.value}), but got {next}"
+                    f"State {key} should transit to {curr} + {transition.value} ({curr + value}), but got {next}"
                 )
             elif transition.kind == TransitionKind.To:
                 curr, next = cast(FQ, curr), cast(FQ, next)
@@ -789,6 +801,12 @@ class Instruction:
     def opcode_lookup_at(self, index: FQ, is_code: bool) -> FQ:
         return self.bytecode_lookup(self.curr.code_hash, index, FQ(is_code)).expr()
 
+    def next_rw_counter(self) -> FQ:
+        """rw_counter of the next rw lookup of the step"""
+        rw_counter = self.curr.rw_counter + self.rw_counter_offset
+        self.rw_counter_offset += 1
+        return rw_counter
+
     def rw_lookup(
         self,
         rw: RW,
@@ -803,8 +821,7 @@ class Instruction:
         rw_counter: Optional[Expression] = None,
     ) -> RWTableRow:
         if rw_counter is None:
-            rw_counter = self.curr.rw_counter + self.rw_counter_offset
-            self.rw_counter_offset += 1
+            rw_counter = self.next_rw_counter()
         if value is not None:
             value = WordOrValue(value)
         if value_prev is not None:
@@ -1,9 +1,11 @@
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 
 from ..util import FQ
 from .execution import EXECUTION_STATE_IMPL
 from .execution_state import ExecutionState
 from .instruction import Instruction
+from .profiler import StepProfiler
 from .step import StepState
 from .table import Tables
 
@@ -17,34 +19,123 @@ def verify_steps(
     begin_with_first_step: bool = False,
     end_with_last_step: bool = False,
     success: bool = True,
+    workers: int = 1,
+    profiler: Optional[StepProfiler] = None,
 ):
+    """
+    Verify every pair of consecutive steps. With `workers > 1` the pairs are
+    sharded across a process pool; tables and steps are sent once to each
+    worker, and the failure reported is always the one of the lowest step
+    index, same as the sequential run.  Steps are always verified in this
+    process when a `profiler` is given.
+    """
     if end_with_last_step:
         steps.append(DUMMY_STEP_STATE)
 
+    flags = (begin_with_first_step, end_with_last_step)
+    if workers > 1 and len(steps) > 2 and profiler is None:
+        failure = _verify_steps_parallel(tables, steps, flags, workers)
+    else:
+        failure = _verify_step_range(tables, steps, flags, 0, len(steps) - 1, profiler)
+
     exception = None
-    for idx, (curr, next) in enumerate(zip(steps, steps[1:])):
+    if failure is not None:
+        _, exception = failure
+        if not isinstance(exception, AssertionError):
+            raise exception
+    if success:
+        if exception:
+            raise exception
+        assert exception is None
+    else:
+        assert exception is not None
+
+
+def _verify_step_range(
+    tables: Tables,
+    steps: List[StepState],
+    flags: Tuple[bool, bool],
+    begin: int,
+    end: int,
+    profiler: Optional[StepProfiler] = None,
+) -> Optional[Tuple[int, Exception]]:
+    """Verify step pairs [begin, end) and return the first failure with its index"""
+    begin_with_first_step, end_with_last_step = flags
+    for idx in range(begin, end):
         try:
             verify_step(
                 Instruction(
                     tables=tables,
-                    curr=curr,
-                    next=next,
+                    curr=steps[idx],
+                    next=steps[idx + 1],
                     is_first_step=begin_with_first_step and idx == 0,
                     is_last_step=end_with_last_step and idx == len(steps) - 2,
-                )
+                ),
+                profiler,
             )
-        except AssertionError as e:
-            exception = e
-            break
-    if success:
-        if exception:
-            raise exception
-        assert exception is None
+        except Exception as e:
+            # Other errors are re-raised by verify_steps, but only once it
+            # knows no earlier step has failed
+            return idx, e
+    return None
+
+
+# Per-process state of the verify_steps pool, set once by _init_worker
+_worker_args: Tuple[Tables, List[StepState], Tuple[bool, bool]]
+
+
+def _init_worker(tables: Tables, steps: List[StepState], flags: Tuple[bool, bool]):
+    global _worker_args
+    _worker_args = (tables, steps, flags)
+
+
+def _verify_chunk(begin: int, end: int) -> Optional[Tuple[int, Exception]]:
+    tables, steps, flags = _worker_args
+    return _verify_step_range(tables, steps, flags, begin, end)
+
+
+def _verify_steps_parallel(
+    tables: Tables,
+    steps: List[StepState],
+    flags: Tuple[bool, bool],
+    workers: int,
+) -> Optional[Tuple[int, Exception]]:
+    n_pairs = len(steps) - 1
+    # a few chunks per worker to keep the pool balanced
+    chunk_size = max(1, -(-n_pairs // (workers * 4)))
+
+    first_failure: Optional[Tuple[int, Exception]] = None
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(tables, steps, flags)
+    ) as executor:
+        pending: Dict[Future, int] = {
+            executor.submit(_verify_chunk, begin, min(begin + chunk_size, n_pairs)): begin
+            for begin in range(0, n_pairs, chunk_size)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                failure = future.result()
+                if failure is not None and (first_failure is None or failure[0] < first_failure[0]):
+                    first_failure = failure
+            if first_failure is not None:
+                # chunks entirely after the failing step can't change the outcome
+                for future, begin in list(pending.items()):
+                    if begin > first_failure[0] and future.cancel():
+                        del pending[future]
+    return first_failure
+
+
+def verify_step(instruction: Instruction, profiler: Optional[StepProfiler] = None):
+    if profiler is not None:
+        with profiler.profile(instruction):
+            _verify_step(instruction)
     else:
-        assert exception is not None
+        _verify_step(instruction)
 
 
-def verify_step(instruction: Instruction):
+def _verify_step(instruction: Instruction):
     if instruction.is_first_step:
         instruction.constrain_in(
             instruction.curr.execution_state,
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Counter, Dict, Iterator, List, Optional
+
+from ..util import FQAllocationCounter
+from .execution_state import ExecutionState
+from .instruction import Instruction
+
+
+@dataclass
+class StepProfile:
+    """Cost of verifying a single step"""
+
+    execution_state: ExecutionState
+    time: float
+    constraints: int
+    fq_allocations: int
+    lookups: Counter[str]
+    success: bool
+
+
+@dataclass
+class StepStats:
+    """Cost of verifying all the steps of an ExecutionState"""
+
+    steps: int = 0
+    time: float = 0.0
+    constraints: int = 0
+    fq_allocations: int = 0
+    lookups: Counter[str] = field(default_factory=Counter)
+
+    def add(self, profile: StepProfile):
+        self.steps += 1
+        self.time += profile.time
+        self.constraints += profile.constraints
+        self.fq_allocations += profile.fq_allocations
+        self.lookups.update(profile.lookups)
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "steps": self.steps,
+            "time": self.time,
+            "constraints": self.constraints,
+            "fq_allocations": self.fq_allocations,
+            "lookups": dict(self.lookups),
+        }
+
+
+class StepProfiler:
+    """
+    Opt-in instrumentation of `verify_step`.  For each verified step it records
+    the wall time, the lookups done in each table, the constraints evaluated
+    and the FQ objects built, and aggregates them per ExecutionState.  An
+    optional `callback` receives every StepProfile as it's recorded.
+
+    Pass it to `verify_steps(..., profiler=profiler)` or
+    `verify_step(instruction, profiler)`, then read `stats`, `report()` or
+    `to_json()`.
+    """
+
+    stats: Dict[ExecutionState, StepStats]
+    callback: Optional[Callable[[StepProfile], None]]
+
+    def __init__(self, callback: Optional[Callable[[StepProfile], None]] = None) -> None:
+        self.stats = dict()
+        self.callback = callback
+
+    @contextmanager
+    def profile(self, instruction: Instruction) -> Iterator[None]:
+        tables = instruction.tables
+        lookup_counts_prev = tables.lookup_counts
+        tables.lookup_counts = Counter()
+        success = False
+        with FQAllocationCounter() as fq_counter:
+            start = time.perf_counter()
+            try:
+                yield
+                success = True
+            finally:
+                elapsed = time.perf_counter() - start
+                lookups, tables.lookup_counts = tables.lookup_counts, lookup_counts_prev
+                self.record(
+                    StepProfile(
+                        ExecutionState(instruction.curr.execution_state),
+                        elapsed,
+                        instruction.constraint_count,
+                        fq_counter.count,
+                        lookups,
+                        success,
+                    )
+                )
+
+    def record(self, profile: StepProfile):
+        self.stats.setdefault(profile.execution_state, StepStats()).add(profile)
+        if self.callback is not None:
+            self.callback(profile)
+
+    def to_json(self) -> Dict[str, Dict[str, object]]:
+        return {state.name: stats.to_json() for state, stats in self.stats.items()}
+
+    def report(self) -> str:
+        """Per ExecutionState costs, slowest first"""
+        lines: List[str] = [
+            f"{'execution state':<32} {'steps':>7} {'time (s)':>10} {'per step (ms)':>14} "
+            f"{'constraints':>12} {'fq allocs':>10}  lookups"
+        ]
+        for state, stats in sorted(self.stats.items(), key=lambda item: -item[1].time):
+            lookups = ", ".join(f"{name}={n}" for name, n in stats.lookups.most_common())
+            lines.append(
+                f"{state.name:<32} {stats.steps:>7} {stats.time:>10.4f} "
+                f"{1000 * stats.time / stats.steps:>14.3f} {stats.constraints:>12} "
+                f"{stats.fq_allocations:>10}  {lookups}"
+            )
+        return "\n".join(lines)
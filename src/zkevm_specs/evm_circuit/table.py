@@ -1,8 +1,33 @@
 from __future__ import annotations
-from typing import Any, List, Mapping, Optional, Sequence, Set, Tuple, Type, TypeVar, Union
+from typing import (
+    Any,
+    Collection,
+    Counter,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    runtime_checkable,
+)
+from array import array
 from enum import IntEnum, auto
 from itertools import chain, product
 from dataclasses import dataclass, field, fields
+from functools import lru_cache
 
 from .opcode import constant_gas_cost_pairs
 from .precompile import precompile_info_pairs
@@ -102,6 +127,52 @@ class FixedTableTag(IntEnum):
         else:
             raise ValueError("Unreacheable")
 
+    def contains(self, value0: int, value1: int, value2: int) -> bool:
+        """
+        Whether the row (tag, value0, value1, value2) is in the table
+        assignments of this tag, decided without materializing them.
+        """
+        if self.is_range():
+            return value0 < self.range_size() and value1 == 0 and value2 == 0
+        elif self == FixedTableTag.SignByte:
+            return value0 < 256 and value1 == (value0 >> 7) * 0xFF and value2 == 0
+        elif self == FixedTableTag.BitwiseAnd:
+            return value0 < 256 and value1 < 256 and value2 == value0 & value1
+        elif self == FixedTableTag.BitwiseOr:
+            return value0 < 256 and value1 < 256 and value2 == value0 | value1
+        elif self == FixedTableTag.BitwiseXor:
+            return value0 < 256 and value1 < 256 and value2 == value0 ^ value1
+        elif self == FixedTableTag.Pow2:
+            return (
+                value0 < 256
+                and value1 == (1 << value0 if value0 < 128 else 0)
+                and value2 == (0 if value0 < 128 else 1 << (value0 - 128))
+            )
+        elif self in [
+            FixedTableTag.ResponsibleOpcode,
+            FixedTableTag.OpcodeConstantGas,
+            FixedTableTag.PrecompileInfo,
+        ]:
+            return (value0, value1, value2) in _small_table_values(self)
+        else:
+            raise ValueError("Unreacheable")
+
+    def is_range(self) -> bool:
+        return FixedTableTag.Range5 <= self <= FixedTableTag.Range24_576
+
+    def range_size(self) -> int:
+        assert self.is_range()
+        return {
+            FixedTableTag.Range5: 5,
+            FixedTableTag.Range16: 16,
+            FixedTableTag.Range32: 32,
+            FixedTableTag.Range64: 64,
+            FixedTableTag.Range256: 256,
+            FixedTableTag.Range512: 512,
+            FixedTableTag.Range1024: 1024,
+            FixedTableTag.Range24_576: 24576,
+        }[self]
+
     def range_table_tag(range: int) -> FixedTableTag:
         if range == 5:
             return FixedTableTag.Range5
@@ -125,6 +196,39 @@ class FixedTableTag(IntEnum):
             )
 
 
+@lru_cache(maxsize=None)
+def _small_table_values(tag: FixedTableTag) -> Set[Tuple[int, int, int]]:
+    # Tables derived from opcode and precompile information are small enough
+    # to be kept materialized as plain integers once they are first looked up.
+    return set(
+        (row.value0.expr().n, row.value1.expr().n, row.value2.expr().n)
+        for row in tag.table_assignments()
+    )
+
+
+class FixedTable:
+    """
+    The fixed table with the assignments of every FixedTableTag.  Lookups are
+    answered by `FixedTableTag.contains` from the queried values, the rows are
+    only materialized when the table is iterated.
+    """
+
+    def __contains__(self, row: object) -> bool:
+        if not isinstance(row, FixedTableRow):
+            return False
+        try:
+            tag = FixedTableTag(row.tag.expr().n)
+        except ValueError:
+            return False
+        return tag.contains(row.value0.expr().n, row.value1.expr().n, row.value2.expr().n)
+
+    def __iter__(self) -> Iterator[FixedTableRow]:
+        return chain(*[tag.table_assignments() for tag in list(FixedTableTag)])
+
+    def __len__(self) -> int:
+        return sum(len(tag.table_assignments()) for tag in list(FixedTableTag))
+
+
 class BlockContextFieldTag(IntEnum):
     """
     Tag for BlockTable lookup, where the BlockTable is an instance-column table
@@ -365,11 +469,20 @@ class LookupAmbiguousFailure(Exception):
         self.message = f"Lookup {table_name} is ambiguous on inputs {inputs}, ${len(matched_rows)} matched rows found: {matched_rows}"
 
 
+_FIELD_NAMES: Dict[type, Set[str]] = dict()
+
+
+def _field_names(cls: type) -> Set[str]:
+    if cls not in _FIELD_NAMES:
+        _FIELD_NAMES[cls] = set([field.name for field in fields(cls)])
+    return _FIELD_NAMES[cls]
+
+
 @dataclass(frozen=True)
 class TableRow:
     @classmethod
     def validate_query(cls, table_name: str, query: Mapping[str, Any]):
-        names = set([field.name for field in fields(cls)])
+        names = _field_names(cls)
         queried = set(query.keys())
         if not queried.issubset(names):
             raise WrongQueryKey(table_name, queried - names)
@@ -437,6 +550,169 @@ class RWTableRow(TableRow):
     aux0: Word = field(default=Word(0))  # TODO: Rename this to initial_value
 
 
+class RWTable:
+    """
+    RW table stored column by column.  Narrow columns are kept in typed arrays
+    (switched to a list of ints if a value doesn't fit), wide ones in lists of
+    ints, and Words in separate lo/hi columns.  `RWTableRow`s are only built
+    when a row is read, and lookups are answered from an index of row positions
+    built from the columns.
+    """
+
+    # Column typecodes for the narrow columns
+    NARROW_COLUMNS = {"rw_counter": "Q", "rw": "B", "key0": "B", "id": "Q", "field_tag": "Q"}
+    WORD_COLUMNS = ("storage_key", "value", "value_prev", "aux0")
+    # WordOrValue columns, which also record whether they hold a Word
+    WORD_OR_VALUE_COLUMNS = ("value", "value_prev")
+
+    # rw_counters are a contiguous range, so rows are also addressed by
+    # rw_counter: position + 1 of the first row of each rw_counter (0 when
+    # there's none), and the positions of the other rows sharing an rw_counter
+    # or of rw_counters too far past the end of the table to be kept dense.
+    DENSE_SLACK = 1 << 16
+
+    columns: Dict[str, MutableSequence[int]]
+    _dense_positions: MutableSequence[int]
+    _sparse_positions: Dict[int, List[int]]
+
+    def __init__(self, rows: Iterable[RWTableRow] = ()) -> None:
+        self._dense_positions = array("Q")
+        self._sparse_positions = dict()
+        self.columns = {name: array(code) for name, code in self.NARROW_COLUMNS.items()}
+        self.columns["address"] = []
+        for name in self.WORD_COLUMNS:
+            self.columns[f"{name}_lo"] = []
+            self.columns[f"{name}_hi"] = []
+        for name in self.WORD_OR_VALUE_COLUMNS:
+            self.columns[f"{name}_is_word"] = array("B")
+        self.extend(rows)
+
+    def append(
+        self,
+        rw_counter: Expression,
+        rw: Expression,
+        key0: Expression,
+        id: Expression = FQ(0),
+        address: Expression = FQ(0),
+        field_tag: Expression = FQ(0),
+        storage_key: Word = Word(0),
+        value: Union[Word, Expression] = WordOrValue(FQ(0)),
+        value_prev: Union[Word, Expression] = WordOrValue(FQ(0)),
+        aux0: Word = Word(0),
+    ) -> None:
+        self._index_rw_counter(cell_int(rw_counter))
+        self._push("rw_counter", rw_counter)
+        self._push("rw", rw)
+        self._push("key0", key0)
+        self._push("id", id)
+        self._push("address", address)
+        self._push("field_tag", field_tag)
+        for name, word in [
+            ("storage_key", storage_key),
+            ("value", value),
+            ("value_prev", value_prev),
+            ("aux0", aux0),
+        ]:
+            if isinstance(word, Word):
+                self._push(f"{name}_lo", word.lo)
+                self._push(f"{name}_hi", word.hi)
+            else:
+                self._push(f"{name}_lo", word)
+                self._push(f"{name}_hi", FQ(0))
+        for name, word in [("value", value), ("value_prev", value_prev)]:
+            is_word = word.is_word if isinstance(word, WordOrValue) else isinstance(word, Word)
+            self.columns[f"{name}_is_word"].append(is_word)
+
+    def append_row(self, row: RWTableRow) -> None:
+        self.append(
+            row.rw_counter,
+            row.rw,
+            row.key0,
+            row.id,
+            row.address,
+            row.field_tag,
+            row.storage_key,
+            row.value,
+            row.value_prev,
+            row.aux0,
+        )
+
+    def extend(self, rows: Iterable[RWTableRow]) -> None:
+        for row in rows:
+            self.append_row(row)
+
+    def _index_rw_counter(self, rw_counter: int) -> None:
+        dense = self._dense_positions
+        position = len(self)
+        if rw_counter >= len(dense) and rw_counter < 2 * position + self.DENSE_SLACK:
+            dense.extend([0] * (rw_counter + 1 - len(dense)))
+        if rw_counter < len(dense) and dense[rw_counter] == 0:
+            dense[rw_counter] = position + 1
+        else:
+            self._sparse_positions.setdefault(rw_counter, []).append(position)
+
+    def rw_counter_positions(self, rw_counter: int) -> List[int]:
+        """Positions of the rows of `rw_counter`"""
+        positions = self._sparse_positions.get(rw_counter, [])
+        dense = self._dense_positions
+        if rw_counter < len(dense) and dense[rw_counter] != 0:
+            return [dense[rw_counter] - 1] + positions
+        return positions
+
+    def _push(self, name: str, value: Union[Expression, int]) -> None:
+        n = cell_int(value)
+        column = self.columns[name]
+        try:
+            column.append(n)
+        except OverflowError:
+            self.columns[name] = column = list(column)
+            column.append(n)
+
+    def __len__(self) -> int:
+        return len(self.columns["rw_counter"])
+
+    def __getitem__(self, idx: int) -> RWTableRow:
+        columns = self.columns
+
+        def word(name: str) -> Word:
+            return Word(
+                (FQ(columns[f"{name}_lo"][idx]), FQ(columns[f"{name}_hi"][idx])), check=False
+            )
+
+        def word_or_value(name: str) -> WordOrValue:
+            if columns[f"{name}_is_word"][idx]:
+                return WordOrValue(word(name))
+            return WordOrValue(FQ(columns[f"{name}_lo"][idx]))
+
+        return RWTableRow(
+            FQ(columns["rw_counter"][idx]),
+            FQ(columns["rw"][idx]),
+            FQ(columns["key0"][idx]),
+            FQ(columns["id"][idx]),
+            FQ(columns["address"][idx]),
+            FQ(columns["field_tag"][idx]),
+            word("storage_key"),
+            word_or_value("value"),
+            word_or_value("value_prev"),
+            word("aux0"),
+        )
+
+    def __iter__(self) -> Iterator[RWTableRow]:
+        return (self[idx] for idx in range(len(self)))
+
+    def column_keys(self, name: str) -> Sequence[Hashable]:
+        """Lookup keys of a column, same as `lookup_key` of its cells"""
+        if name in self.WORD_COLUMNS:
+            return list(zip(self.columns[f"{name}_lo"], self.columns[f"{name}_hi"]))
+        return self.columns[name]
+
+    def cell_key(self, name: str, idx: int) -> Hashable:
+        """Lookup key of a single cell"""
+        if name in self.WORD_COLUMNS:
+            return (self.columns[f"{name}_lo"][idx], self.columns[f"{name}_hi"][idx])
+        return self.columns[name][idx]
+
+
 @dataclass(frozen=True)
 class MPTTableRow(TableRow):
     address: Expression
@@ -533,38 +809,65 @@ class Tables:
     A collection of lookup tables used in EVM circuit.
     """
 
-    fixed_table = set(chain(*[tag.table_assignments() for tag in list(FixedTableTag)]))
-    block_table: Set[BlockTableRow]
-    tx_table: Set[TxTableRow]
-    bytecode_table: Set[BytecodeTableRow]
-    rw_table: Set[RWTableRow]
-    copy_table: Set[CopyTableRow]
-    keccak_table: Set[KeccakTableRow]
-    exp_table: Set[ExpTableRow]
+    fixed_table = FixedTable()
+    block_table: FrozenSet[BlockTableRow]
+    tx_table: Union[FrozenSet[TxTableRow], ColumnarTable[TxTableRow]]
+    bytecode_table: Union[FrozenSet[BytecodeTableRow], ColumnarTable[BytecodeTableRow]]
+    rw_table: ColumnarTable[RWTableRow]
+    copy_table: FrozenSet[CopyTableRow]
+    keccak_table: Union[FrozenSet[KeccakTableRow], ColumnarTable[KeccakTableRow]]
+    exp_table: FrozenSet[ExpTableRow]
+
+    # Hash indexes built on demand, one per queried table and set of queried
+    # columns.  The tables given as sets are copied to frozensets, so that an
+    # index can't get out of date with its table.
+    _indexes: Dict[Tuple[Type[TableRow], Tuple[str, ...]], LookupIndex]
+
+    # When set, the number of lookups done in each table, keyed by row type
+    # name.  Used by StepProfiler.
+    lookup_counts: Optional[Counter[str]] = None
 
     def __init__(
         self,
         block_table: Set[BlockTableRow],
-        tx_table: Set[TxTableRow],
-        bytecode_table: Set[BytecodeTableRow],
-        rw_table: Union[Set[Sequence[Expression]], Set[RWTableRow]],
+        tx_table: Union[Set[TxTableRow], ColumnarTable[TxTableRow]],
+        bytecode_table: Union[Set[BytecodeTableRow], ColumnarTable[BytecodeTableRow]],
+        rw_table: Union[
+            ColumnarTable[RWTableRow], Iterable[Sequence[Expression]], Iterable[RWTableRow]
+        ],
         copy_circuit: Optional[Sequence[CopyCircuitRow]] = None,
         keccak_table: Optional[Sequence[KeccakTableRow]] = None,
         exp_circuit: Optional[Sequence[ExpCircuitRow]] = None,
     ) -> None:
-        self.block_table = block_table
-        self.tx_table = tx_table
-        self.bytecode_table = bytecode_table
-        self.rw_table = set(
-            row if isinstance(row, RWTableRow) else RWTableRow(*row)  # type: ignore  # (RWTableRow input args)
-            for row in rw_table
+        # copied when it's a set or list of rows
+        self.block_table = (
+            frozenset(block_table) if isinstance(block_table, (set, list)) else block_table
+        )
+        self.tx_table = tx_table if isinstance(tx_table, ColumnarTable) else frozenset(tx_table)
+        self.bytecode_table = (
+            bytecode_table
+            if isinstance(bytecode_table, ColumnarTable)
+            else frozenset(bytecode_table)
         )
+        if isinstance(rw_table, ColumnarTable):
+            self.rw_table = rw_table
+        else:
+            # deduplicated like the set of rows it used to be stored in
+            self.rw_table = RWTable(
+                dict.fromkeys(
+                    row if isinstance(row, RWTableRow) else RWTableRow(*row)  # type: ignore  # (RWTableRow input args)
+                    for row in rw_table
+                )
+            )
         if copy_circuit is not None:
             self.copy_table = self._convert_copy_circuit_to_table(copy_circuit)
         if keccak_table is not None:
-            self.keccak_table = set(keccak_table)
+            self.keccak_table = (
+                keccak_table if isinstance(keccak_table, ColumnarTable) else frozenset(keccak_table)
+            )
         if exp_circuit is not None:
             self.exp_table = self._convert_exp_circuit_to_table(exp_circuit)
+        self._indexes = dict()
 
     def _convert_copy_circuit_to_table(self, copy_circuit: Sequence[CopyCircuitRow]):
         rows: List[CopyTableRow] = []
@@ -591,7 +894,7 @@ class Tables:
                         rwc_inc=first_row.rwc_inc_left,
                     )
                 )
-        return set(rows)
+        return frozenset(rows)
 
     def _convert_exp_circuit_to_table(self, exp_circuit: Sequence[ExpCircuitRow]):
         rows: List[ExpTableRow] = []
@@ -610,7 +913,7 @@ class Tables:
                     exponentiation=row.exponentiation,
                 )
             )
-        return set(rows)
+        return frozenset(rows)
 
     def fixed_lookup(
         self,
@@ -626,6 +929,8 @@ class Tables:
             "value2": value2,
         }
         row = FixedTableRow(tag, value0, value1, value2)
+        if self.lookup_counts is not None:
+            self.lookup_counts[FixedTableRow.__name__] += 1
         if row not in self.fixed_table:
             raise LookupUnsatFailure(FixedTableRow.__name__, query)
         return row
@@ -634,7 +939,7 @@ class Tables:
         self, field_tag: Expression, block_number: Expression = FQ(0)
     ) -> BlockTableRow:
         query = {"field_tag": field_tag, "block_number_or_zero": block_number}
-        return lookup(BlockTableRow, self.block_table, query)
+        return self._lookup(BlockTableRow, self.block_table, query)
 
     def tx_lookup(
         self, tx_id: Expression, field_tag: Expression, call_data_index: Expression = FQ(0)
@@ -644,7 +949,7 @@ class Tables:
             "field_tag": field_tag,
             "call_data_index_or_zero": call_data_index,
         }
-        return lookup(TxTableRow, self.tx_table, query)
+        return self._lookup(TxTableRow, self.tx_table, query)
 
     def bytecode_lookup(
         self,
@@ -659,7 +964,7 @@ class Tables:
             "index": index,
             "is_code": is_code,
         }
-        return lookup(BytecodeTableRow, self.bytecode_table, query)
+        return self._lookup(BytecodeTableRow, self.bytecode_table, query)
 
     def rw_lookup(
         self,
@@ -686,7 +991,7 @@ class Tables:
             "value_prev": value_prev,
             "aux0": aux0,
         }
-        return lookup(RWTableRow, self.rw_table, query)
+        return self._lookup(RWTableRow, self.rw_table, query)
 
     def copy_lookup(
         self,
@@ -715,7 +1020,7 @@ class Tables:
             "length": length,
             "rw_counter": rw_counter,
         }
-        return lookup(CopyTableRow, self.copy_table, query)
+        return self._lookup(CopyTableRow, self.copy_table, query)
 
     def keccak_lookup(self, length: Expression, value_rlc: Expression):
         query = {
@@ -723,7 +1028,7 @@ class Tables:
             "input_len": length,
             "input_rlc": value_rlc,
         }
-        return lookup(KeccakTableRow, self.keccak_table, query)
+        return self._lookup(KeccakTableRow, self.keccak_table, query)
 
     def exp_lookup(
         self,
@@ -742,26 +1047,185 @@ class Tables:
             "base_limb3": base_limbs[3].expr(),
             "exponent": exponent,
         }
-        return lookup(ExpTableRow, self.exp_table, query)
+        return self._lookup(ExpTableRow, self.exp_table, query)
+
+    def _lookup(
+        self,
+        table_cls: Type[T],
+        table: Union[Collection[T], ColumnarTable[T]],
+        query: Mapping[str, Optional[Union[FQ, Expression, Word]]],
+    ) -> T:
+        if self.lookup_counts is not None:
+            self.lookup_counts[table_cls.__name__] += 1
+        columns = tuple(key for key, value in query.items() if value is not None)
+        # every lookup by rw_counter in an RWTable goes through its rw_counter index
+        by_rw_counter = isinstance(table, RWTable) and "rw_counter" in columns
+        index_key = (table_cls, ("rw_counter",) if by_rw_counter else columns)
+        index = self._indexes.get(index_key)
+        if index is None or not index.is_built_from(table):
+            table_cls.validate_query(table_cls.__name__, query)
+            if by_rw_counter:
+                index = RWCounterIndex(table)  # type: ignore
+            elif isinstance(table, ColumnarTable):
+                index = PositionLookupIndex(table, columns)
+            else:
+                index = LookupIndex(table, columns)
+            self._indexes[index_key] = index
+        return lookup(table_cls, table, query, index)
 
 
 T = TypeVar("T", bound=TableRow)
+T_co = TypeVar("T_co", bound=TableRow, covariant=True)
+
+
+def lookup_key(value: Union[Expression, Word]) -> Hashable:
+    """
+    Hashable form of a table cell, equal for two cells exactly when
+    `TableRow.match` considers them equal.
+    """
+    if isinstance(value, Word):
+        return (value.lo.expr().n, value.hi.expr().n)
+    return value.expr().n
+
+
+def cell_int(value: Union[Expression, int]) -> int:
+    """Field element of a table cell as a reduced int"""
+    if isinstance(value, FQ):
+        return value.n
+    if isinstance(value, int):
+        return FQ(value).n
+    return value.expr().n
+
+
+class LookupIndex(Generic[T]):
+    """
+    Hash index of a table on a fixed set of columns.  A lookup that queries
+    exactly these columns only needs to fetch the rows in the bucket of the
+    queried values instead of matching every row of the table.
+    """
+
+    table: Union[Collection[T], ColumnarTable[T]]
+    size: int
+    columns: Tuple[str, ...]
+    buckets: Dict[Tuple[Hashable, ...], List[T]]
+
+    def __init__(self, table: Collection[T], columns: Tuple[str, ...]) -> None:
+        self.table = table
+        self.size = len(table)
+        self.columns = columns
+        self.buckets = dict()
+        for row in table:
+            key = tuple(lookup_key(getattr(row, column)) for column in columns)
+            self.buckets.setdefault(key, []).append(row)
+
+    def is_built_from(self, table: Union[Collection[T], ColumnarTable[T]]) -> bool:
+        if self.table is not table:
+            return False
+        # Columnar tables are append-only, other tables are only reused when
+        # they're immutable, as a set or list can change without changing size
+        if isinstance(table, ColumnarTable):
+            return self.size == len(table)
+        return isinstance(table, (frozenset, tuple))
+
+    def matched_rows(self, query: Mapping[str, Union[Expression, Word]]) -> List[T]:
+        assert set(query.keys()) == set(self.columns)
+        return self.buckets.get(tuple(lookup_key(query[column]) for column in self.columns), [])
+
+
+@runtime_checkable
+class ColumnarTable(Protocol[T_co]):
+    """
+    Table that can list the lookup keys of a column without building its rows,
+    like `RWTable` or a `WitnessTable` read from disk.
+    """
+
+    def __len__(self) -> int:
+        ...
+
+    def __getitem__(self, idx: int) -> T_co:
+        ...
+
+    def __iter__(self) -> Iterator[T_co]:
+        ...
+
+    def column_keys(self, name: str) -> Sequence[Hashable]:
+        ...
+
+
+class PositionLookupIndex(LookupIndex[T]):
+    """
+    Hash index of a `ColumnarTable`, built from its columns and holding row
+    positions, so that only the matched rows are materialized.
+    """
+
+    positions: Dict[Tuple[Hashable, ...], List[int]]
+
+    def __init__(self, table: ColumnarTable[T], columns: Tuple[str, ...]) -> None:
+        self.table = table
+        self.size = len(table)
+        self.columns = columns
+        self.positions = dict()
+        keys: Iterable[Tuple[Hashable, ...]] = zip(
+            *[table.column_keys(column) for column in columns]
+        )
+        if len(columns) == 0:
+            keys = [()] * len(table)
+        for idx, key in enumerate(keys):
+            self.positions.setdefault(key, []).append(idx)
+
+    def matched_rows(self, query: Mapping[str, Union[Expression, Word]]) -> List[T]:
+        assert set(query.keys()) == set(self.columns)
+        key = tuple(lookup_key(query[column]) for column in self.columns)
+        return [self.table[idx] for idx in self.positions.get(key, [])]  # type: ignore
+
+
+class RWCounterIndex(LookupIndex[RWTableRow]):
+    """
+    Index of an `RWTable` on rw_counter, for queries on rw_counter and any other
+    columns.  It reads the positions of the queried rw_counter from the table,
+    and checks the other queried columns on the cells of those rows, so it's
+    never rebuilt as rows are appended.
+    """
+
+    table: RWTable
+
+    def __init__(self, table: RWTable) -> None:
+        self.table = table
+        self.size = len(table)
+        self.columns = ("rw_counter",)
+
+    def is_built_from(self, table: Union[Collection[T], ColumnarTable[T]]) -> bool:
+        # it holds nothing read from the table, which is append-only, so it's
+        # never out of date
+        return self.table is table
+
+    def matched_rows(self, query: Mapping[str, Union[Expression, Word]]) -> List[RWTableRow]:
+        table = self.table
+        keys = [
+            (column, lookup_key(value)) for column, value in query.items() if column != "rw_counter"
+        ]
+        return [
+            table[idx]
+            for idx in table.rw_counter_positions(cell_int(cast(Expression, query["rw_counter"])))
+            if all(table.cell_key(column, idx) == key for column, key in keys)
+        ]
 
 
 def lookup(
     table_cls: Type[T],
-    table: Set[T],
+    table: Iterable[T],
     query: Mapping[str, Optional[Union[FQ, Expression, Word]]],
+    index: Optional[LookupIndex[T]] = None,
 ) -> T:
     table_name = table_cls.__name__
     table_cls.validate_query(table_name, query)
 
-    matched_rows = [
-        row
-        for row in table
-        # Filter out None values
-        if row.match({key: value for key, value in query.items() if value is not None})
-    ]
+    # Filter out None values
+    filtered_query = {key: value for key, value in query.items() if value is not None}
+    if index is None:
+        matched_rows = [row for row in table if row.match(filtered_query)]
+    else:
+        matched_rows = index.matched_rows(filtered_query)
 
     if len(matched_rows) == 0:
         raise LookupUnsatFailure(table_name, query)
@@ -769,3 +1233,75 @@ def lookup(
         raise LookupAmbiguousFailure(table_name, query, matched_rows)
 
     return matched_rows[0]
+
+
+def table_keys(
+    table: Union[Iterable[T], ColumnarTable[T]], columns: Tuple[str, ...]
+) -> Iterable[Tuple[Hashable, ...]]:
+    """Lookup keys of every row of a table on `columns`, in a single pass"""
+    if isinstance(table, ColumnarTable):
+        return zip(*[table.column_keys(column) for column in columns])
+    return (tuple(lookup_key(getattr(row, column)) for column in columns) for row in table)
+
+
+class BatchLookup(Generic[T]):
+    """
+    Lookups into a table collected to be checked together.  `verify` joins
+    all the queries with a single pass over the table and, like `lookup`,
+    requires each query to match exactly one row, reporting the unsatisfied
+    or ambiguous queries by the positions they were added for.
+    """
+
+    table_cls: Type[T]
+    columns: Tuple[str, ...]
+    queries: Dict[Tuple[Hashable, ...], List[int]]
+
+    def __init__(self, table_cls: Type[T], columns: Tuple[str, ...]) -> None:
+        self.table_cls = table_cls
+        self.columns = columns
+        self.queries = dict()
+
+    def __len__(self) -> int:
+        return sum(len(positions) for positions in self.queries.values())
+
+    def add(self, position: int, *values: Union[Expression, Word]):
+        key = tuple(lookup_key(value) for value in values)
+        self.queries.setdefault(key, []).append(position)
+
+    def verify(self, table: Union[Iterable[T], ColumnarTable[T]]) -> Dict[int, T]:
+        """The row matched by the query of each position"""
+        if not self.queries:
+            return dict()
+        rows: Union[Sequence[T], ColumnarTable[T]] = (
+            table if isinstance(table, ColumnarTable) else list(table)
+        )
+        matches: Dict[Tuple[Hashable, ...], List[int]] = dict()
+        for idx, key in enumerate(table_keys(rows, self.columns)):
+            if key in self.queries:
+                matches.setdefault(key, []).append(idx)
+
+        def failed_queries(keys: Iterable[Tuple[Hashable, ...]]) -> Dict[int, Dict[str, Hashable]]:
+            failed = [
+                (position, dict(zip(self.columns, key)))
+                for key in keys
+                for position in self.queries[key]
+            ]
+            failed.sort(key=lambda item: item[0])
+            return dict(failed)
+
+        table_name = self.table_cls.__name__
+        unsat = [key for key in self.queries if key not in matches]
+        if unsat:
+            raise LookupUnsatFailure(table_name, failed_queries(unsat))
+        ambiguous = [key for key, idxs in matches.items() if len(idxs) > 1]
+        if ambiguous:
+            raise LookupAmbiguousFailure(
+                table_name,
+                failed_queries(ambiguous),
+                [rows[idx] for key in ambiguous for idx in matches[key]],
+            )
+        return {
+            position: rows[matches[key][0]]
+            for key, positions in self.queries.items()
+            for position in positions
+        }
@@ -1,8 +1,8 @@
 from __future__ import annotations
-import dataclasses
 from typing import (
     cast,
     Dict,
+    Iterable,
     Iterator,
     List,
     MutableSequence,
@@ -13,9 +13,11 @@ from typing import (
     Union,
     Mapping,
     Tuple,
+    overload,
 )
-from functools import reduce
-from itertools import chain
+from array import array
+from functools import lru_cache, reduce
+from itertools import chain, islice
 
 from ..util import (
     U64,
@@ -27,7 +29,9 @@ from ..util import (
     WordOrValue,
     Word,
     Expression,
+    KeccakTable,
     keccak256,
+    linear_combine_bytes,
     GAS_COST_ACCESS_LIST_ADDRESS,
     GAS_COST_ACCESS_LIST_STORAGE,
     GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE,
@@ -42,6 +46,7 @@ from .table import (
     BytecodeFieldTag,
     BytecodeTableRow,
     CallContextFieldTag,
+    RWTable,
     RWTableRow,
     Target,
     TxContextFieldTag,
@@ -271,25 +276,47 @@ class Transaction:
         )
 
 
-def init_is_code(code: bytearray) -> MutableSequence[bool]:
+@lru_cache(maxsize=4096)
+def code_is_code(code: bytes) -> Tuple[bool, ...]:
+    """Whether each byte of the code is an opcode (and not push data)"""
     is_codes = []
     push_data_left = 0
     for idx in range(0, len(code)):
         is_code = push_data_left == 0
         push_data_left = get_push_size(code[idx]) if is_code else push_data_left - 1
         is_codes.append(is_code)
-    return is_codes
+    return tuple(is_codes)
+
+
+def init_is_code(code: bytearray) -> MutableSequence[bool]:
+    return list(code_is_code(bytes(code)))
+
+
+@lru_cache(maxsize=4096)
+def code_hash(code: bytes) -> U256:
+    """Hash of the code, shared by all the Bytecodes with the same code"""
+    return U256(int.from_bytes(keccak256(code), "big"))
 
 
 class Bytecode:
+    """
+    Bytecode builder.  Its hash is cached along with the code it was computed
+    from: the builder methods drop it, and a direct mutation of `code` is
+    caught by comparing the code with the hashed one.
+    """
+
     code: bytearray
     is_code: MutableSequence[bool]
+    # code of the cached hash
+    hashed_code: Optional[bytes]
+    cached_hash: U256
 
     def __init__(
         self, code: Optional[bytearray] = None, is_code: Optional[MutableSequence[bool]] = None
     ) -> None:
         self.code = bytearray() if code is None else code
         self.is_code = init_is_code(self.code) if is_code is None else is_code
+        self.hashed_code = None
 
     def __getattr__(self, name: str):
         def method(*args) -> Bytecode:
@@ -299,6 +326,7 @@ class Bytecode:
             except KeyError:
                 raise ValueError(f"Invalid opcode {name}")
 
+            self.hashed_code = None
             if opcode.is_push():
                 assert len(args) == 1
                 self.push(args[0], opcode - Opcode.PUSH1 + 1)
@@ -334,6 +362,7 @@ class Bytecode:
         assert 0 < len(value) <= n_bytes, ValueError("Too many bytes as data portion of PUSH*")
 
         opcode = Opcode.PUSH1 + n_bytes - 1
+        self.hashed_code = None
         self.code.append(opcode)
         self.is_code.append(True)
         self.code.extend(value.rjust(n_bytes, b"\x00"))
@@ -342,7 +371,13 @@ class Bytecode:
         return self
 
     def hash(self) -> U256:
-        return U256(int.from_bytes(keccak256(self.code), "big"))
+        if self.hashed_code is None or self.code != self.hashed_code:
+            self.hashed_code = bytes(self.code)
+            self.cached_hash = code_hash(self.hashed_code)
+        return self.cached_hash
+
+    def freeze(self) -> FrozenBytecode:
+        return FrozenBytecode(self.code, self.is_code)
 
     def table_assignments(self) -> Iterator[BytecodeTableRow]:
         class BytecodeIterator:
@@ -384,6 +419,34 @@ class Bytecode:
         return BytecodeIterator(Word(self.hash()), self.code, self.is_code)
 
 
+class FrozenBytecode(Bytecode):
+    """
+    Immutable Bytecode.  Its hash and is_code are looked up by code, so the
+    accounts with the same contract share them.
+    """
+
+    code: bytes  # type: ignore
+    is_code: Sequence[bool]  # type: ignore
+
+    def __init__(
+        self, code: Union[bytes, bytearray] = b"", is_code: Optional[Sequence[bool]] = None
+    ) -> None:
+        self.code = bytes(code)
+        self.is_code = code_is_code(self.code) if is_code is None else tuple(is_code)
+
+    def __getattr__(self, name: str):
+        def method(*args) -> Bytecode:
+            raise TypeError(f"Cannot append {name} to a FrozenBytecode")
+
+        return method
+
+    def push(self, value: Union[int, str, bytes, bytearray, RLC], n_bytes: int = 32) -> Bytecode:
+        raise TypeError("Cannot push to a FrozenBytecode")
+
+    def hash(self) -> U256:
+        return code_hash(self.code)
+
+
 Storage = NewType("Storage", Dict[U256, U256])
 
 
@@ -420,11 +483,24 @@ class Account:
 
 class RWDictionary:
     rw_counter: int
-    rws: List[RWTableRow]
+    table: RWTable
+    _rws: Tuple[RWTableRow, ...]
 
     def __init__(self, rw_counter: int) -> None:
         self.rw_counter = rw_counter
-        self.rws = list()
+        self.table = RWTable()
+        self._rws = ()
+
+    @property
+    def rws(self) -> Tuple[RWTableRow, ...]:
+        """
+        Rows of the table as a tuple, which is shared between reads until the
+        next append (the table is append-only, so only the new rows are built)
+        """
+        n = len(self._rws)
+        if n != len(self.table):
+            self._rws += tuple(self.table[idx] for idx in range(n, len(self.table)))
+        return self._rws
 
     def stack_read(self, call_id: IntOrFQ, stack_pointer: IntOrFQ, value: Word) -> RWDictionary:
         return self._append(
@@ -768,193 +844,293 @@ class RWDictionary:
             rw_counter = self.rw_counter
             self.rw_counter += 1
 
-        self.rws.append(
-            RWTableRow(
-                FQ(rw_counter),
-                FQ(rw),
-                FQ(tag),
-                id,
-                address,
-                field_tag,
-                storage_key,
-                WordOrValue(value),
-                WordOrValue(value_prev),
-                aux0,
-            )
+        self.table.append(
+            FQ(rw_counter),
+            FQ(rw),
+            FQ(tag),
+            id,
+            address,
+            field_tag,
+            storage_key,
+            WordOrValue(value),
+            WordOrValue(value_prev),
+            aux0,
         )
 
         return self
 
 
 class KeccakCircuit:
-    rows: List[KeccakTableRow]
-
-    def __init__(self) -> None:
-        self.rows = []
+    """
+    Keccak table rows of the EVM circuit, one per distinct input and keccak
+    randomness of `keccak_table`, which can be shared with the other circuits of
+    the block.
+    """
+
+    keccak_table: KeccakTable
+    _rows: List[KeccakTableRow]
+
+    def __init__(self, keccak_table: Optional[KeccakTable] = None) -> None:
+        self.keccak_table = KeccakTable() if keccak_table is None else keccak_table
+        self._rows = []
+
+    @property
+    def rows(self) -> List[KeccakTableRow]:
+        for input_rlc, input_len, digest in islice(
+            self.keccak_table.entries.values(), len(self._rows), None
+        ):
+            self._rows.append(
+                KeccakTableRow(
+                    state_tag=FQ(2),  # Finalize
+                    input_rlc=input_rlc,
+                    input_len=input_len,
+                    output=Word(int.from_bytes(digest, "big")),
+                )
+            )
+        return self._rows
 
     def add(self, data: bytes, r: FQ) -> KeccakCircuit:
-        output = Word(int.from_bytes(keccak256(data), "big"))
-        acc_input = RLC(bytes(reversed(data)), r, n_bytes=len(data))
-        self.rows.append(
-            KeccakTableRow(
-                state_tag=FQ(2),  # Finalize
-                input_rlc=acc_input.expr(),
-                input_len=FQ(len(data)),
-                output=output,
-            )
-        )
+        self.keccak_table.add(data, r)
+        return self
+
+    def extend(self, datas: Iterable[bytes], r: FQ) -> KeccakCircuit:
+        self.keccak_table.extend(datas, r)
         return self
 
 
 class ExpCircuit:
-    rows: List[ExpCircuitRow]
+    """
+    Exponentiation traces, one step row per multiplication.  The trace of a
+    (base, exponent) pair is computed once (see `exp_trace`) and every event
+    of that pair reuses it with its own identifier.  The padding rows added by
+    `fill_dummy_events` are only counted: `rows` and `table()` are views
+    returning the same padding row at every padded position.
+    """
+
+    steps: List[ExpCircuitRow]
+    n_padding: int
     max_exp_steps: int
     OFFSET_INCREMENT = 7
 
     def __init__(self, max_exp_steps: int = 100) -> None:
-        self.rows = []
+        self.steps = []
+        self.n_padding = 0
         self.max_exp_steps = max_exp_steps
 
+    @property
+    def rows(self) -> ExpCircuitRows:
+        return ExpCircuitRows(self.steps, self.n_padding)
+
     def table(self) -> Sequence[ExpCircuitRow]:
         return self.rows
 
     def add_event(self, base: int, exponent: int, identifier: IntOrFQ):
-        steps: List[Tuple[int, int, int]] = []
-        exponentiation = self._exp_by_squaring(base, exponent, steps)
-        steps.reverse()
-        self._append_steps(base, exponent, exponentiation, steps, identifier)
-        return self
-
-    def _exp_by_squaring(self, base: int, exponent: int, steps: List[Tuple[int, int, int]]):
-        # we assume that base and exponent are both < 2**256
-        if exponent == 0:
-            return 1
-        if exponent == 1:
-            return base
-
-        exp1 = self._exp_by_squaring(base, exponent // 2, steps)
-        exp2 = (exp1 * exp1) % POW2
-        steps.append((exp1, exp1, exp2))
-        if exponent % 2 == 0:
-            # exponent is even
-            return exp2
-        else:
-            # exponent is odd
-            exp = (base * exp2) % POW2
-            steps.append((exp2, base, exp))
-            return exp
-
-    def _append_steps(
-        self,
-        base: int,
-        exponent: int,
-        exponentiation: int,
-        steps: List[Tuple[int, int, int]],
-        identifier: IntOrFQ,
-    ):
-        base_word = Word(base)
-        for i, step in enumerate(steps):
-            # multiplication gadget
-            a, b, d = step[0], step[1], step[2]
-            # exp table
-            quotient, is_odd = divmod(exponent, 2)
-            exponent_word = Word(exponent)
-            self._append_step(
-                identifier,
-                FQ(1 if i == len(steps) - 1 else 0),
-                base_word,
-                exponent_word,
-                Word(d),
-                Word(a),
-                Word(b),
-                Word(0),
-                Word(d),
-                Word(quotient),
-                FQ(is_odd),
+        identifier = FQ(identifier)
+        one, zero = FQ.one(), Word(0)
+        for is_last, base_word, exponent_word, a, b, d, quotient, is_odd in exp_trace(
+            base, exponent
+        ):
+            self.steps.append(
+                ExpCircuitRow(
+                    q_usable=one,
+                    is_step=one,
+                    identifier=identifier,
+                    is_last=is_last,
+                    base=base_word,
+                    exponent=exponent_word,
+                    exponentiation=d,
+                    a=a,
+                    b=b,
+                    c=zero,
+                    d=d,
+                    q=quotient,
+                    r=is_odd,
+                )
             )
-            if is_odd == 0:
-                # exponent is even
-                exponent = exponent // 2
-            else:
-                # exponent is odd
-                exponent = exponent - 1
+        return self
 
     def fill_dummy_events(self):
         max_exp_rows = self.max_exp_steps * self.OFFSET_INCREMENT
-        rows_left = max_exp_rows - len(self.rows)
-        for i in range(rows_left):
-            self.rows.append(
-                ExpCircuitRow(
-                    q_usable=FQ.one(),
-                    is_step=FQ.zero(),
-                    identifier=FQ.zero(),
-                    is_last=FQ.zero(),
-                    base=Word(1),
-                    exponent=Word(1),
-                    exponentiation=Word(1),
-                    a=Word(1),
-                    b=Word(1),
-                    c=Word(0),
-                    d=Word(1),
-                    q=Word(0),
-                    r=FQ(1),
-                )
-            )
+        self.n_padding += max(0, max_exp_rows - len(self.rows))
         return self
 
-    def _append_step(
-        self,
-        identifier: IntOrFQ,
-        is_last: IntOrFQ,
-        base: Word,
-        exponent: Word,
-        exponentiation: Word,
-        a: Word,
-        b: Word,
-        c: Word,
-        d: Word,
-        quotient: Word,
-        remainder: FQ,
-    ):
-        self.rows.append(
-            ExpCircuitRow(
-                q_usable=FQ.one(),
-                is_step=FQ.one(),
-                identifier=FQ(identifier),
-                is_last=FQ(is_last),
-                base=base,
-                exponent=exponent,
-                exponentiation=exponentiation,
-                a=a,
-                b=b,
-                c=c,
-                d=d,
-                q=quotient,
-                r=remainder,
+
+# A step of an exponentiation trace: is_last, base, exponent, the
+# multiplication a * b == d and the parity check exponent == 2 * q + r
+ExpStep = Tuple[FQ, Word, Word, Word, Word, Word, Word, FQ]
+
+
+@lru_cache(maxsize=4096)
+def exp_trace(base: int, exponent: int) -> Tuple[ExpStep, ...]:
+    """
+    Steps of the exponentiation of base by exponent (both < 2**256) by
+    squaring, from the last multiplication to the first one.  Each step
+    halves the exponent if it's even, or decrements it if it's odd.
+    """
+    # square-and-multiply over the bits of the exponent after the top one,
+    # as (a, b, d) multiplications
+    multiplications: List[Tuple[int, int, int]] = []
+    acc = base
+    for bit in bin(exponent)[3:]:
+        square = acc * acc % POW2
+        multiplications.append((acc, acc, square))
+        acc = square
+        if bit == "1":
+            product = acc * base % POW2
+            multiplications.append((acc, base, product))
+            acc = product
+
+    # steps share the Words of equal values
+    words: Dict[int, Word] = dict()
+
+    def word(value: int) -> Word:
+        if value not in words:
+            words[value] = Word(value)
+        return words[value]
+
+    steps: List[ExpStep] = []
+    for i, (a, b, d) in enumerate(reversed(multiplications)):
+        quotient, is_odd = divmod(exponent, 2)
+        steps.append(
+            (
+                FQ(i == len(multiplications) - 1),
+                word(base),
+                word(exponent),
+                word(a),
+                word(b),
+                word(d),
+                word(quotient),
+                FQ(is_odd),
             )
         )
+        exponent = exponent - 1 if is_odd else quotient
+    return tuple(steps)
+
+
+class ExpCircuitRows(Sequence[ExpCircuitRow]):
+    """`ExpCircuitRow` view of the steps of an ExpCircuit, followed by padding rows"""
+
+    PADDING_ROW = ExpCircuitRow(
+        q_usable=FQ.one(),
+        is_step=FQ.zero(),
+        identifier=FQ.zero(),
+        is_last=FQ.zero(),
+        base=Word(1),
+        exponent=Word(1),
+        exponentiation=Word(1),
+        a=Word(1),
+        b=Word(1),
+        c=Word(0),
+        d=Word(1),
+        q=Word(0),
+        r=FQ(1),
+    )
+
+    steps: Sequence[ExpCircuitRow]
+    n_padding: int
+
+    def __init__(self, steps: Sequence[ExpCircuitRow], n_padding: int) -> None:
+        self.steps = steps
+        self.n_padding = n_padding
+
+    def __len__(self) -> int:
+        return len(self.steps) + self.n_padding
+
+    @overload
+    def __getitem__(self, idx: int) -> ExpCircuitRow:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[ExpCircuitRow]:
+        ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("exp circuit row index out of range")
+        if idx < len(self.steps):
+            return self.steps[idx]
+        return self.PADDING_ROW
 
 
 class CopyCircuit:
-    rows: List[CopyCircuitRow]
+    """
+    Copy circuit rows stored column by column.  `copy` fills the columns of a
+    copy event in a single pass, and `rows` and `table()` are views that only
+    build the CopyCircuitRows as they're read.
+    """
+
+    # Column typecodes for the narrow columns, the other ones are lists of ints
+    NARROW_COLUMNS = {
+        "q_step": "B",
+        "is_first": "B",
+        "is_last": "B",
+        "tag": "B",
+        "is_code": "B",
+        "is_pad": "B",
+        "rw_counter": "Q",
+        "rwc_inc_left": "Q",
+    }
+    WIDE_COLUMNS = ("addr", "src_addr_end", "bytes_left", "value", "rlc_acc")
+
+    columns: Dict[str, MutableSequence[int]]
+    ids: List[WordOrValue]
     pad_rows: List[CopyCircuitRow]
 
     def __init__(self, pad_rows: Optional[List[CopyCircuitRow]] = None) -> None:
-        self.rows = []
+        self.columns = {name: array(code) for name, code in self.NARROW_COLUMNS.items()}
+        for name in self.WIDE_COLUMNS:
+            self.columns[name] = []
+        self.ids = []
         self.pad_rows = []
         if pad_rows is not None:
             self.pad_rows = pad_rows
 
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def rows(self) -> CopyCircuitRows:
+        return CopyCircuitRows(self)
+
     def table(self) -> Sequence[CopyCircuitRow]:
-        return self.rows + self.pad_rows
+        return CopyCircuitRows(self, self.pad_rows)
+
+    def row(self, idx: int) -> CopyCircuitRow:
+        columns = self.columns
+        tag = columns["tag"][idx]
+        return CopyCircuitRow(
+            q_step=FQ(columns["q_step"][idx]),
+            is_first=FQ(columns["is_first"][idx]),
+            is_last=FQ(columns["is_last"][idx]),
+            id=self.ids[idx],
+            tag=FQ(tag),
+            addr=FQ(columns["addr"][idx]),
+            src_addr_end=FQ(columns["src_addr_end"][idx]),
+            bytes_left=FQ(columns["bytes_left"][idx]),
+            value=FQ(columns["value"][idx]),
+            rlc_acc=FQ(columns["rlc_acc"][idx]),
+            is_code=FQ(columns["is_code"][idx]),
+            is_pad=FQ(columns["is_pad"][idx]),
+            rw_counter=FQ(columns["rw_counter"][idx]),
+            rwc_inc_left=FQ(columns["rwc_inc_left"][idx]),
+            is_memory=FQ(tag == CopyDataTypeTag.Memory),
+            is_bytecode=FQ(tag == CopyDataTypeTag.Bytecode),
+            is_tx_calldata=FQ(tag == CopyDataTypeTag.TxCalldata),
+            is_tx_log=FQ(tag == CopyDataTypeTag.TxLog),
+            is_rlc_acc=FQ(tag == CopyDataTypeTag.RlcAcc),
+        )
 
     def copy(
         self,
         r: FQ,
         rw_dict: RWDictionary,
-        src_id: IntOrFQ,
+        src_id: Union[IntOrFQ, Word],
         src_tag: CopyDataTypeTag,
-        dst_id: IntOrFQ,
+        dst_id: Union[IntOrFQ, Word],
         dst_tag: CopyDataTypeTag,
         src_addr: IntOrFQ,
         src_addr_end: IntOrFQ,
@@ -963,130 +1139,125 @@ class CopyCircuit:
         src_data: Mapping[IntOrFQ, Union[IntOrFQ, Tuple[IntOrFQ, IntOrFQ]]],
         log_id: int = 0,
     ):
-        new_rows: List[CopyCircuitRow] = []
-        rlc_acc = FQ.zero()
-        for i in range(int(copy_length)):
-            if int(src_addr + i) < int(src_addr_end):
-                is_pad = False
-                assert src_addr + i in src_data, f"Cannot find data at the offset {src_addr+i}"
-                value = src_data[src_addr + i]
-                if src_tag == CopyDataTypeTag.Bytecode or dst_tag == CopyDataTypeTag.Bytecode:
-                    value = cast(Tuple[IntOrFQ, IntOrFQ], value)
-                    value, is_code = value
-                else:
-                    value = cast(IntOrFQ, value)
-                    is_code = FQ(0)
-                value = FQ(value)
-                is_code = FQ(is_code)
-            else:
-                is_pad = True
-                value = FQ(0)
-                is_code = FQ(0)
-
-            # read row, because TxLog is write-only, no need to feed log_id in the read row
-            self._append_row(
-                new_rows,
-                rw_dict,
-                False,
-                i == 0,
-                False,
-                src_id,
-                src_tag,
-                src_addr + i,
-                value,
-                FQ.zero(),  # rlc_acc will be updated later
-                is_code,
-                is_pad,
-                src_addr_end=src_addr_end,
-                bytes_left=copy_length - i,
-            )
+        # TxLog is write-only, so log_id is only used by the write rows
+        assert src_tag != CopyDataTypeTag.TxLog, "Cannot copy from TxLog"
+        src_id = WordOrValue(src_id if isinstance(src_id, Word) else FQ(src_id))
+        dst_id = WordOrValue(dst_id if isinstance(dst_id, Word) else FQ(dst_id))
+        src_addr, src_addr_end, dst_addr = int(src_addr), int(src_addr_end), int(dst_addr)
+        length = int(copy_length)
+        # bytes past src_addr_end are padding
+        n_reads = max(0, min(length, src_addr_end - src_addr))
+
+        values = [0] * length
+        is_code = bytearray(length)
+        with_is_code = src_tag == CopyDataTypeTag.Bytecode or dst_tag == CopyDataTypeTag.Bytecode
+        for i in range(n_reads):
+            assert src_addr + i in src_data, f"Cannot find data at the offset {src_addr+i}"
+            value = src_data[src_addr + i]
+            if with_is_code:
+                value, code = cast(Tuple[IntOrFQ, IntOrFQ], value)
+                is_code[i] = int(code)
+            values[i] = FQ(cast(IntOrFQ, value)).n
+
+        # The rw_counter at the end of the copy and the final rlc_acc are known
+        # in advance, so the rows are filled in a single pass
+        rw_counter = rw_dict.rw_counter
+        rw_counter_end = rw_counter
+        if src_tag == CopyDataTypeTag.Memory:
+            rw_counter_end += n_reads
+        if dst_tag in (CopyDataTypeTag.Memory, CopyDataTypeTag.TxLog):
+            rw_counter_end += length
+        is_rlc_acc = dst_tag == CopyDataTypeTag.RlcAcc
+        rlc_acc = linear_combine_bytes(values[::-1], r, range_check=False).n if is_rlc_acc else 0
+        addr_offset = 0
+        if dst_tag == CopyDataTypeTag.TxLog:
+            addr_offset = (int(TxLogFieldTag.Data) << 32) + (log_id << 48)
+
+        start = len(self)
+        end = start + 2 * length
+        for column in self.columns.values():
+            column.extend([0] * (2 * length))
+        columns = self.columns
+        self.ids.extend([src_id, dst_id] * length)
+        columns["q_step"][start:end:2] = array("B", [1] * length)
+        columns["tag"][start:end:2] = array("B", [src_tag] * length)
+        columns["tag"][start + 1 : end : 2] = array("B", [dst_tag] * length)
+        columns["is_code"][start:end:2] = array("B", is_code)
+        columns["is_code"][start + 1 : end : 2] = array("B", is_code)
+        columns["is_pad"][start + 2 * n_reads : end : 2] = array("B", [1] * (length - n_reads))
+        columns["rlc_acc"][start:end] = [rlc_acc] * (2 * length)
+        columns["src_addr_end"][start:end:2] = [src_addr_end] * length
+        columns["bytes_left"][start:end:2] = range(length, 0, -1)
+        columns["addr"][start:end:2] = range(src_addr, src_addr + length)
+        columns["addr"][start + 1 : end : 2] = range(
+            dst_addr + addr_offset, dst_addr + addr_offset + length
+        )
+        if length > 0:
+            columns["is_first"][start] = 1
+            columns["is_last"][end - 1] = 1
+
+        column_value = columns["value"]
+        column_rw_counter = columns["rw_counter"]
+        column_rwc_inc_left = columns["rwc_inc_left"]
+        acc = 0
+        for i, value in enumerate(values):
+            # read row
+            read = start + 2 * i
+            column_value[read] = value
+            column_rw_counter[read] = rw_counter
+            column_rwc_inc_left[read] = rw_counter_end - rw_counter
+            if src_tag == CopyDataTypeTag.Memory and i < n_reads:
+                rw_dict.memory_read(src_id.value().expr(), src_addr + i, value)
+                rw_counter += 1
 
             # write row
-            if dst_tag == CopyDataTypeTag.RlcAcc:
-                rlc_acc = rlc_acc * r + value
-            self._append_row(
-                new_rows,
-                rw_dict,
-                True,
-                False,
-                i == copy_length - 1,
-                dst_id,
-                dst_tag,
-                dst_addr + i,
-                rlc_acc if dst_tag == CopyDataTypeTag.RlcAcc else value,
-                FQ.zero(),
-                is_code,
-                False,
-                log_id=log_id,
-            )
-
-        # update the rwc_inc_left column
-        rw_counter = rw_dict.rw_counter
-        new_rows = [
-            dataclasses.replace(row, rwc_inc_left=rw_counter - row.rw_counter, rlc_acc=rlc_acc)
-            if dst_tag == CopyDataTypeTag.RlcAcc
-            else dataclasses.replace(row, rwc_inc_left=rw_counter - row.rw_counter)
-            for row in new_rows
-        ]
-        self.rows.extend(new_rows)
+            if is_rlc_acc:
+                acc = (acc * r.n + value) % FQ.field_modulus
+            column_value[read + 1] = acc if is_rlc_acc else value
+            column_rw_counter[read + 1] = rw_counter
+            column_rwc_inc_left[read + 1] = rw_counter_end - rw_counter
+            if dst_tag == CopyDataTypeTag.Memory:
+                rw_dict.memory_write(dst_id.value().expr(), dst_addr + i, value)
+                rw_counter += 1
+            elif dst_tag == CopyDataTypeTag.TxLog:
+                rw_dict.tx_log_write(
+                    dst_id.value().expr(), log_id, TxLogFieldTag.Data, dst_addr + i, value
+                )
+                rw_counter += 1
         return self
 
-    def _append_row(
-        self,
-        rows: MutableSequence[CopyCircuitRow],
-        rw_dict: RWDictionary,
-        is_write: bool,
-        is_first: bool,
-        is_last: bool,
-        id: Union[int, FQ, Word],
-        tag: CopyDataTypeTag,
-        addr: IntOrFQ,
-        value: IntOrFQ,
-        rlc_acc: IntOrFQ,
-        is_code: IntOrFQ,
-        is_pad: bool,
-        src_addr_end: IntOrFQ = FQ(0),
-        bytes_left: IntOrFQ = FQ(0),
-        log_id: int = 0,
-    ):
-        if isinstance(id, int):
-            id = FQ(id)
-        id = WordOrValue(id)
-        is_memory = tag == CopyDataTypeTag.Memory
-        is_bytecode = tag == CopyDataTypeTag.Bytecode
-        is_tx_calldata = tag == CopyDataTypeTag.TxCalldata
-        is_tx_log = tag == CopyDataTypeTag.TxLog
-        is_rlc_acc = tag == CopyDataTypeTag.RlcAcc
-        rw_counter = rw_dict.rw_counter
-        if is_memory:
-            if is_write:
-                rw_dict.memory_write(id.value().expr(), addr, value)
-            elif is_pad is False:
-                rw_dict.memory_read(id.value().expr(), addr, value)
-        elif is_tx_log:
-            assert is_write
-            rw_dict.tx_log_write(id.value().expr(), log_id, TxLogFieldTag.Data, addr, value)
-            addr += (int(TxLogFieldTag.Data) << 32) + (log_id << 48)
-        rows.append(
-            CopyCircuitRow(
-                q_step=FQ(not is_write),
-                is_first=FQ(is_first),
-                is_last=FQ(is_last),
-                id=id,
-                tag=FQ(tag),
-                addr=FQ(addr),
-                src_addr_end=FQ(src_addr_end),
-                bytes_left=FQ(bytes_left),
-                value=FQ(value),
-                rlc_acc=FQ(rlc_acc),
-                is_code=FQ(is_code),
-                is_pad=FQ(is_pad),
-                rw_counter=FQ(rw_counter),
-                rwc_inc_left=FQ(0),  # placeholder for now
-                is_memory=FQ(is_memory),
-                is_bytecode=FQ(is_bytecode),
-                is_tx_calldata=FQ(is_tx_calldata),
-                is_tx_log=FQ(is_tx_log),
-                is_rlc_acc=FQ(is_rlc_acc),
-            )
-        )
+
+class CopyCircuitRows(Sequence[CopyCircuitRow]):
+    """`CopyCircuitRow` view of a CopyCircuit, followed by padding rows"""
+
+    circuit: CopyCircuit
+    pad_rows: Sequence[CopyCircuitRow]
+
+    def __init__(self, circuit: CopyCircuit, pad_rows: Sequence[CopyCircuitRow] = ()) -> None:
+        self.circuit = circuit
+        self.pad_rows = pad_rows
+
+    def __len__(self) -> int:
+        return len(self.circuit) + len(self.pad_rows)
+
+    @overload
+    def __getitem__(self, idx: int) -> CopyCircuitRow:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[CopyCircuitRow]:
+        ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("copy circuit row index out of range")
+        if idx < len(self.circuit):
+            return self.circuit.row(idx)
+        return self.pad_rows[idx - len(self.circuit)]
+
+    def __add__(self, other: Sequence[CopyCircuitRow]) -> List[CopyCircuitRow]:
+        return list(self) + list(other)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+from dataclasses import fields
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ..util import FQ, Expression, Word, WordOrValue
+from .table import (
+    BlockTableRow,
+    BytecodeTableRow,
+    CopyCircuitRow,
+    ExpCircuitRow,
+    KeccakTableRow,
+    MPTTableRow,
+    RWTableRow,
+    TableRow,
+    TxTableRow,
+    T,
+    cell_int,
+)
+
+# Binary witness format
+#
+# A witness file holds the rows of a single TableRow type:
+# - header: magic, format version, table name, record size and row count
+# - one fixed size little-endian record per row, the cells in field order:
+#   - Expression / FQ: 32 bytes
+#   - Word: lo and hi, 32 bytes each
+#   - WordOrValue: 1 byte set when it holds a Word, then lo and hi
+#
+# Fixed size records let `WitnessTable` read any row, or the cells of a column,
+# straight from the memory mapped file.
+
+WITNESS_MAGIC = b"ZKWITNES"
+WITNESS_VERSION = 1
+N_BYTES_CELL = 32
+
+# magic, version, record size, row count, table name
+_HEADER = Struct("<8sHIQ32s")
+
+WITNESS_ROW_TYPES: Dict[str, Type[TableRow]] = {
+    cls.__name__: cls
+    for cls in [
+        BlockTableRow,
+        TxTableRow,
+        BytecodeTableRow,
+        RWTableRow,
+        MPTTableRow,
+        CopyCircuitRow,
+        KeccakTableRow,
+        ExpCircuitRow,
+    ]
+}
+
+
+class WitnessSchema:
+    """Layout of the records of a TableRow type"""
+
+    table_cls: Type[TableRow]
+    # (field name, field kind, offset in the record) for each field
+    cells: List[Tuple[str, str, int]]
+    record_size: int
+
+    def __init__(self, table_cls: Type[TableRow]) -> None:
+        self.table_cls = table_cls
+        self.cells = []
+        offset = 0
+        for field in fields(table_cls):
+            kind = field.type if isinstance(field.type, str) else field.type.__name__
+            self.cells.append((field.name, kind, offset))
+            if kind in ("Expression", "FQ"):
+                offset += N_BYTES_CELL
+            elif kind == "Word":
+                offset += 2 * N_BYTES_CELL
+            elif kind == "WordOrValue":
+                offset += 1 + 2 * N_BYTES_CELL
+            else:
+                raise TypeError(f"{table_cls.__name__}.{field.name} of type {kind} can't be stored")
+        self.record_size = offset
+
+    def encode(self, row: TableRow) -> bytes:
+        record = bytearray()
+        for name, kind, _ in self.cells:
+            value = getattr(row, name)
+            if kind == "WordOrValue":
+                record.append(int(value.is_word))
+            if kind in ("Word", "WordOrValue"):
+                record += _encode_cell(value.lo) + _encode_cell(value.hi)
+            else:
+                record += _encode_cell(value)
+        return bytes(record)
+
+    def decode(self, buffer: Sequence[int], offset: int) -> TableRow:
+        values: List[Any] = []
+        for _, kind, cell_offset in self.cells:
+            pos = offset + cell_offset
+            if kind == "WordOrValue":
+                is_word = buffer[pos]
+                lo, hi = _decode_cell(buffer, pos + 1), _decode_cell(buffer, pos + 1 + N_BYTES_CELL)
+                values.append(
+                    WordOrValue(Word((lo, hi), check=False)) if is_word else WordOrValue(lo)
+                )
+            elif kind == "Word":
+                lo, hi = _decode_cell(buffer, pos), _decode_cell(buffer, pos + N_BYTES_CELL)
+                values.append(Word((lo, hi), check=False))
+            else:
+                values.append(_decode_cell(buffer, pos))
+        return self.table_cls(*values)  # type: ignore  # (TableRow input args)
+
+    def column_offset(self, name: str) -> Tuple[str, int]:
+        for cell_name, kind, offset in self.cells:
+            if cell_name == name:
+                return kind, offset
+        raise KeyError(f"{self.table_cls.__name__} has no column {name}")
+
+
+def _encode_cell(value: Union[Expression, int]) -> bytes:
+    return cell_int(value).to_bytes(N_BYTES_CELL, "little")
+
+
+def _decode_cell(buffer: Sequence[int], pos: int) -> FQ:
+    return FQ(int.from_bytes(buffer[pos : pos + N_BYTES_CELL], "little"))  # type: ignore
+
+
+def write_witness(file: BinaryIO, table_cls: Type[TableRow], rows: Iterable[TableRow]) -> int:
+    """
+    Write the rows of `table_cls` to a binary witness file opened for writing,
+    streaming one record at a time.  Return the number of rows written.
+    """
+    schema = WitnessSchema(table_cls)
+    start = file.tell()
+    file.write(bytes(_HEADER.size))
+    count = 0
+    for row in rows:
+        assert isinstance(row, table_cls), f"Expected {table_cls.__name__}, got {type(row)}"
+        file.write(schema.encode(row))
+        count += 1
+    end = file.tell()
+    file.seek(start)
+    file.write(
+        _HEADER.pack(
+            WITNESS_MAGIC,
+            WITNESS_VERSION,
+            schema.record_size,
+            count,
+            table_cls.__name__.encode(),
+        )
+    )
+    file.seek(end)
+    return count
+
+
+class WitnessTable(Sequence[T]):
+    """
+    Table backed by a memory mapped binary witness file.  Rows are decoded when
+    they are read, and lookup indexes are built from the raw column cells, so
+    the file is never deserialized as a whole.  It can be passed to `Tables`
+    in place of an in-memory table.
+    """
+
+    schema: WitnessSchema
+    size: int
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+        magic, version, record_size, self.size, name = _HEADER.unpack_from(self._mmap)
+        if magic != WITNESS_MAGIC or version != WITNESS_VERSION:
+            raise ValueError(f"{path} is not a version {WITNESS_VERSION} witness file")
+        name = name.rstrip(b"\x00").decode()
+        if name not in WITNESS_ROW_TYPES:
+            raise ValueError(f"{path} holds unknown rows {name}")
+        self.schema = WitnessSchema(WITNESS_ROW_TYPES[name])
+        if self.schema.record_size != record_size:
+            raise ValueError(
+                f"{path} has {record_size} bytes records, expected {self.schema.record_size}"
+            )
+        if len(self._mmap) < _HEADER.size + self.size * record_size:
+            raise ValueError(f"{path} is truncated")
+
+    @property
+    def table_cls(self) -> Type[TableRow]:
+        return self.schema.table_cls
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, idx):  # type: ignore
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.size))]
+        if idx < 0:
+            idx += self.size
+        if not 0 <= idx < self.size:
+            raise IndexError("witness row index out of range")
+        return self.schema.decode(self._mmap, _HEADER.size + idx * self.schema.record_size)
+
+    def __iter__(self) -> Iterator[T]:
+        return (self[idx] for idx in range(self.size))
+
+    def column_keys(self, name: str) -> Sequence[Hashable]:
+        """Lookup keys of a column, read from the records without decoding the rows"""
+        kind, offset = self.schema.column_offset(name)
+        if kind == "WordOrValue":
+            offset += 1
+        mm = self._mmap
+        positions = range(
+            _HEADER.size + offset,
+            _HEADER.size + self.size * self.schema.record_size,
+            self.schema.record_size,
+        )
+        if kind in ("Word", "WordOrValue"):
+            return [
+                (
+                    int.from_bytes(mm[pos : pos + N_BYTES_CELL], "little"),
+                    int.from_bytes(mm[pos + N_BYTES_CELL : pos + 2 * N_BYTES_CELL], "little"),
+                )
+                for pos in positions
+            ]
+        return [int.from_bytes(mm[pos : pos + N_BYTES_CELL], "little") for pos in positions]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> WitnessTable[T]:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
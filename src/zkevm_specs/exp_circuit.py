@@ -1,10 +1,11 @@
-from typing import List
+from typing import Dict, List, Sequence, Tuple
 from .evm_circuit import (
     ExpCircuit,
     ExpCircuitRow,
 )
 from .util import (
     ConstraintSystem,
+    ConstraintUnsatFailure,
     FQ,
     Word,
     mul_add_words,
@@ -85,9 +86,12 @@ def verify_step(cs: ConstraintSystem, rows: List[ExpCircuitRow]):
         cs.constrain_equal_word(rows[0].base, rows[0].b)
 
 
-def verify_exp_circuit(exp_circuit: ExpCircuit):
-    cs = ConstraintSystem()
+def verify_exp_circuit(exp_circuit: ExpCircuit, batch: bool = True):
     exp_table = exp_circuit.table()
+    if batch:
+        verify_exp_table(exp_table)
+        return
+    cs = ConstraintSystem()
     n = len(exp_table)
     for i, row in enumerate(exp_table):
         rows = [
@@ -95,3 +99,193 @@ def verify_exp_circuit(exp_circuit: ExpCircuit):
             exp_table[(i + 1) % n],
         ]
         verify_step(cs, rows)
+
+
+class ExpCircuitUnsatFailure(ConstraintUnsatFailure, AssertionError):
+    """
+    Gates of the exp circuit that don't hold, with their failing row indices.
+    It's an AssertionError like the failures of `verify_step`.
+    """
+
+    failures: Dict[str, List[int]]
+
+    def __init__(self, failures: Dict[str, List[int]]) -> None:
+        self.failures = failures
+        super().__init__(
+            "Exp circuit gates unsatisfied: "
+            + ", ".join(f"{gate} at rows {rows}" for gate, rows in failures.items())
+        )
+
+
+MODULUS = FQ.field_modulus
+MASK_64 = (1 << 64) - 1
+POW2_128 = 1 << 128
+INV_POW2_128 = pow(POW2_128, -1, MODULUS)
+# carries are range checked to 9 bytes
+CARRY_BOUND = 1 << 72
+
+
+def _carry(value: int) -> int:
+    """`value / 2**128` in the field, as computed by mul_add_words"""
+    if value >= 0 and value & (POW2_128 - 1) == 0:
+        return value >> 128
+    return value * INV_POW2_128 % MODULUS
+
+
+def verify_exp_table(exp_table: Sequence[ExpCircuitRow]):
+    """
+    Batch version of `verify_step` over every row of the exp table.  The cells
+    are read once into columns of native ints, and each gate is then checked
+    over whole columns, with the 256-bit multiplications split into 64-bit
+    limbs the same way as `mul_add_words`.  Raises an ExpCircuitUnsatFailure
+    with the failing row indices of every gate that doesn't hold.
+    """
+    n = len(exp_table)
+    if n == 0:
+        return
+
+    # Rows and words are shared between steps (and padding rows are all the
+    # same row), so each one is only read once
+    words: Dict[int, Tuple[int, int]] = dict()
+    cells: Dict[int, Tuple] = dict()
+
+    def word(value: Word) -> Tuple[int, int]:
+        key = id(value)
+        if key not in words:
+            words[key] = (value.lo.expr().n, value.hi.expr().n)
+        return words[key]
+
+    columns = []
+    for row in exp_table:
+        key = id(row)
+        if key not in cells:
+            cells[key] = (
+                row.is_step.expr().n,
+                row.is_last.expr().n,
+                row.identifier.expr().n,
+                row.r.expr().n,
+                *word(row.base),
+                *word(row.exponent),
+                *word(row.exponentiation),
+                *word(row.a),
+                *word(row.b),
+                *word(row.c),
+                *word(row.d),
+                *word(row.q),
+            )
+        columns.append(cells[key])
+    (
+        is_step,
+        is_last,
+        identifier,
+        r,
+        base_lo,
+        base_hi,
+        exponent_lo,
+        exponent_hi,
+        exponentiation_lo,
+        exponentiation_hi,
+        a_lo,
+        a_hi,
+        b_lo,
+        b_hi,
+        c_lo,
+        c_hi,
+        d_lo,
+        d_hi,
+        q_lo,
+        q_hi,
+    ) = map(list, zip(*columns))
+    rows = range(n)
+    nexts = [*range(1, n), 0]
+
+    # Multiplied words must split into 64-bit limbs
+    limbs_fit = [max(a_lo[i], a_hi[i], b_lo[i], b_hi[i], q_lo[i], q_hi[i]) < POW2_128 for i in rows]
+    # a * b + c == d
+    mul_carry_fits = [False] * n
+    # 2 * q + r == exponent
+    parity_carry_fits = [False] * n
+    for i in rows:
+        if not limbs_fit[i]:
+            continue
+        a0, a1, a2, a3 = a_lo[i] & MASK_64, a_lo[i] >> 64, a_hi[i] & MASK_64, a_hi[i] >> 64
+        b0, b1, b2, b3 = b_lo[i] & MASK_64, b_lo[i] >> 64, b_hi[i] & MASK_64, b_hi[i] >> 64
+        t0 = a0 * b0
+        t1 = a0 * b1 + a1 * b0
+        t2 = a0 * b2 + a1 * b1 + a2 * b0
+        t3 = a0 * b3 + a1 * b2 + a2 * b1 + a3 * b0
+        carry_lo = _carry(t0 + (t1 << 64) + c_lo[i] - d_lo[i])
+        carry_hi = _carry(t2 + (t3 << 64) + c_hi[i] + carry_lo - d_hi[i])
+        mul_carry_fits[i] = carry_lo < CARRY_BOUND and carry_hi < CARRY_BOUND
+        # with a == 2, t0 + t1 * 2**64 == 2 * q.lo and t2 + t3 * 2**64 == 2 * q.hi
+        carry_lo = _carry(2 * q_lo[i] + r[i] - exponent_lo[i])
+        carry_hi = _carry(2 * q_hi[i] + carry_lo - exponent_hi[i])
+        parity_carry_fits[i] = carry_lo < CARRY_BOUND and carry_hi < CARRY_BOUND
+
+    # The gate conditions are products of field elements, so they're non-zero
+    # iff all their factors are
+    step = [is_step[i] != 0 for i in rows]
+    not_last = [step[i] and is_last[i] != 1 for i in rows]
+    odd = [not_last[i] and r[i] != 0 for i in rows]
+    even = [not_last[i] and r[i] != 1 for i in rows]
+    last = [is_last[i] != 0 for i in rows]
+
+    gates = {
+        # for every step except the last
+        "base is the same across rows": [
+            not not_last[i] or (base_lo[i], base_hi[i]) == (base_lo[j], base_hi[j])
+            for i, j in zip(rows, nexts)
+        ],
+        "a is the next d": [
+            not not_last[i] or (a_lo[i], a_hi[i]) == (d_lo[j], d_hi[j]) for i, j in zip(rows, nexts)
+        ],
+        "identifier is the same across rows": [
+            not not_last[i] or identifier[i] == identifier[j] for i, j in zip(rows, nexts)
+        ],
+        # for every step
+        "is_last is boolean": [is_step[i] * is_last[i] % MODULUS in (0, 1) for i in rows],
+        "r is boolean": [is_step[i] * r[i] % MODULUS in (0, 1) for i in rows],
+        "64-bit limbs": limbs_fit,
+        "a * b + c == d carries": mul_carry_fits,
+        "2 * q + r == exponent carries": parity_carry_fits,
+        "exponentiation == d": [
+            not step[i] or (exponentiation_lo[i], exponentiation_hi[i]) == (d_lo[i], d_hi[i])
+            for i in rows
+        ],
+        "c == 0": [not step[i] or c_lo[i] == c_hi[i] == 0 for i in rows],
+        # for every step except the last, where exponent is odd
+        "exponent::next == exponent::cur - 1": [
+            not odd[i]
+            or (
+                exponent_lo[j] == (exponent_lo[i] - 1) % MODULUS
+                and exponent_hi[j] == exponent_hi[i]
+            )
+            for i, j in zip(rows, nexts)
+        ],
+        "b == base on odd exponent": [
+            not odd[i] or (b_lo[i], b_hi[i]) == (base_lo[i], base_hi[i]) for i in rows
+        ],
+        # for every step except the last, where exponent is even
+        "exponent::next == exponent::cur / 2": [
+            not even[i] or (exponent_lo[j], exponent_hi[j]) == (q_lo[i], q_hi[i])
+            for i, j in zip(rows, nexts)
+        ],
+        "a == b on even exponent": [
+            not even[i] or (a_lo[i], a_hi[i]) == (b_lo[i], b_hi[i]) for i in rows
+        ],
+        # for the last step
+        "exponent == 2 on last step": [
+            not last[i] or (exponent_lo[i], exponent_hi[i]) == (2, 0) for i in rows
+        ],
+        "a == b == base on last step": [
+            not last[i] or (a_lo[i], a_hi[i]) == (b_lo[i], b_hi[i]) == (base_lo[i], base_hi[i])
+            for i in rows
+        ],
+    }
+    failures = {
+        gate: [i for i, holds in enumerate(column) if not holds]
+        for gate, column in gates.items()
+        if not all(column)
+    }
+    if failures:
+        raise ExpCircuitUnsatFailure(failures)
@@ -1,17 +1,15 @@
 from dataclasses import dataclass
-from typing import List, Set, Tuple, Union
+from typing import List, Optional, Sequence, Set, Tuple, Union, overload
 
-from eth_utils import keccak
+from zkevm_specs.util.param import MAX_N_BYTES, N_BYTES_WORD
 
-from zkevm_specs.util.arithmetic import bytes_to_fq
-from zkevm_specs.util.param import N_BYTES_WORD
-
-from .evm_circuit.table import TableRow, lookup
+from .evm_circuit.table import LookupIndex, LookupUnsatFailure, TableRow, lookup
 from .tx_circuit import Tag as TxTag
 from .util import FQ, GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE, GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE
 from .util import PUBLIC_INPUTS_BLOCK_LEN as BLOCK_LEN
 from .util import PUBLIC_INPUTS_TX_LEN as TX_LEN
-from .util import RLC, U8, U64, U160, U256, Expression, Word, WordOrValue, is_circuit_code
+from .util import U8, U64, U160, U256, Expression, KeccakTable, Word, WordOrValue, batch_inv
+from .util import is_circuit_code
 
 
 @dataclass
@@ -56,35 +54,27 @@ class FixedU16Row(TableRow):
     value: FQ
 
 
-class KeccakTable:
-    # The columns are: (is_enabled, input_rlc, input_len, output)
-    table: Set[Tuple[FQ, FQ, FQ, Word]]
+class FixedU16Table:
+    """
+    Fixed table of the values in [0, 2**16).  A lookup is a range check of the
+    value, so the table never needs to be built.
+    """
 
-    def __init__(self):
-        self.table = set()
-        self.table.add((FQ.zero(), FQ.zero(), FQ.zero(), Word(0)))  # Add all 0s row
-
-    def add(self, input: bytes, keccak_randomness: FQ):
-        output = keccak(input)
-        self.table.add(
-            (
-                FQ.one(),
-                RLC(bytes(reversed(input)), keccak_randomness, n_bytes=len(input)).expr(),
-                FQ(len(input)),
-                Word(output),
-            )
-        )
+    def lookup(self, value: Expression) -> FixedU16Row:
+        if not 0 <= value.expr().n < 1 << 16:
+            raise LookupUnsatFailure(FixedU16Row.__name__, {"value": value})
+        return FixedU16Row(value.expr())
 
-    def lookup(self, is_enabled: FQ, input_rlc: FQ, input_len: FQ, output: Word, assert_msg: str):
-        assert (is_enabled, input_rlc, input_len, output) in self.table, (
-            f"{assert_msg}: {(is_enabled, input_rlc, input_len, output)} "
-            + "not found in the lookup table"
-        )
 
+FIXED_U16_TABLE = FixedU16Table()
 
-@dataclass
+
+@dataclass(frozen=True)
 class Row:
-    """PublicInputs circuit row"""
+    """
+    PublicInputs circuit row.  Rows are built from the witness columns on
+    read, so they're frozen: the witness is changed through its columns.
+    """
 
     q_bytes_last: FQ
     q_tx_table: FQ
@@ -111,6 +101,102 @@ class Row:
     tx_table: TxTableRow
 
 
+@dataclass
+class WitnessColumns:
+    """
+    PublicInputs circuit witness stored column by column: selectors as 0/1
+    bytes, and field elements as reduced ints.  The tx table columns cover
+    the tx table and calldata rows, the rows after them are 0.
+    """
+
+    q_bytes_last: bytearray
+    q_tx_table: bytearray
+    q_tx_calldata: bytearray
+    q_tx_calldata_start: bytearray
+    q_rpi_keccak_lookup: bytearray
+    q_rpi_value_start: bytearray
+
+    tx_id_inv: List[int]
+    tx_value_lo_inv: List[int]
+    tx_id_diff_inv: List[int]
+    calldata_gas_cost: List[int]
+    is_final: List[int]
+
+    rpi_bytes: bytes
+    rpi_bytes_keccakrlc: List[int]
+    rpi_value_lc: List[int]
+    rpi_digest_word: Word  # on the first row, 0 on the others
+
+    q_rpi_byte_enable: bytearray
+
+    tx_id: List[int]
+    tx_tag: List[int]
+    tx_index: List[int]
+    tx_value: List[WordOrValue]
+
+    def __len__(self) -> int:
+        return len(self.rpi_bytes)
+
+    def row(self, i: int, keccak_table: KeccakTable) -> Row:
+        if i < len(self.tx_id):
+            tx_row = TxTableRow(
+                FQ(self.tx_id[i]), FQ(self.tx_tag[i]), FQ(self.tx_index[i]), self.tx_value[i]
+            )
+        else:
+            tx_row = TxTableRow(FQ.zero(), FQ.zero(), FQ.zero(), WordOrValue(FQ.zero()))
+        return Row(
+            FQ(self.q_bytes_last[i]),
+            FQ(self.q_tx_table[i]),
+            FQ(self.q_tx_calldata[i]),
+            FQ(self.q_tx_calldata_start[i]),
+            FQ(self.q_rpi_keccak_lookup[i]),
+            FQ(self.q_rpi_value_start[i]),
+            FQ(self.tx_id_inv[i]),
+            FQ(self.tx_value_lo_inv[i]),
+            FQ(self.tx_id_diff_inv[i]),
+            FQ(self.calldata_gas_cost[i]),
+            FQ(self.is_final[i]),
+            FQ(self.rpi_bytes[i]),
+            FQ(self.rpi_bytes_keccakrlc[i]),
+            FQ(self.rpi_value_lc[i]),
+            self.rpi_digest_word if i == 0 else Word(0),
+            FQ(self.q_rpi_byte_enable[i]),
+            keccak_table,
+            tx_row,
+        )
+
+
+class WitnessRows(Sequence[Row]):
+    """
+    `Row` view of WitnessColumns, building each (frozen) row when it's read.
+    Assigning to a row's cell raises, write to `columns` instead.
+    """
+
+    def __init__(self, columns: WitnessColumns, keccak_table: KeccakTable) -> None:
+        self.columns = columns
+        self.keccak_table = keccak_table
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @overload
+    def __getitem__(self, idx: int) -> Row:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Row]:
+        ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("witness row index out of range")
+        return self.columns.row(idx, self.keccak_table)
+
+
 @dataclass
 class PublicInputs:
     """Public Inputs of the PublicInputs circuit"""
@@ -128,8 +214,8 @@ class PublicInputs:
 def check_row(
     row: Row,
     row_next: Row,
-    calldata_gas_cost_table: Set[TxCallDataGasCostAccRow],
-    fixed_u16_table: Set[FixedU16Row],
+    calldata_gas_cost_index: LookupIndex[TxCallDataGasCostAccRow],
+    fixed_u16_table: FixedU16Table,
     keccak_table: KeccakTable,
     circuit_len: FQ,
 ):
@@ -226,10 +312,9 @@ def check_row(
         )
 
         tx_id_diff_minus_one = row_next.tx_table.tx_id - row.tx_table.tx_id - one
-        tx_id_diff_minus_one_query = {
-            "value": tx_id_not_equal_to_next * is_tx_id_next_nonzero * tx_id_diff_minus_one
-        }
-        lookup(FixedU16Row, fixed_u16_table, tx_id_diff_minus_one_query)
+        fixed_u16_table.lookup(
+            tx_id_not_equal_to_next * is_tx_id_next_nonzero * tx_id_diff_minus_one
+        )
 
         idx_of_same_tx_constraint = tx_id_equal_to_next * (
             row_next.tx_table.index - row.tx_table.index - one
@@ -291,19 +376,76 @@ def check_row(
             "is_final": one * query_condition,
             "gas_cost_acc": calldata_cost * query_condition,
         }
-        lookup(TxCallDataGasCostAccRow, calldata_gas_cost_table, query)
+        lookup(
+            TxCallDataGasCostAccRow,
+            calldata_gas_cost_index.table,
+            query,
+            calldata_gas_cost_index,
+        )
+
+
+class RawPublicInputs:
+    """
+    Raw public inputs copied into the circuit: the big-endian byte chunks of
+    the block table, extra fields, tx table and calldata, in one buffer with
+    the offset of each chunk.  It's never modified, cursors walk the chunks.
+    """
+
+    data: bytes
+    # start of each chunk, followed by the end of the last one
+    offsets: List[int]
+
+    def __init__(self, chunks: Sequence[bytes]) -> None:
+        self.data = b"".join(chunks)
+        self.offsets = [0]
+        for chunk in chunks:
+            self.offsets.append(self.offsets[-1] + len(chunk))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def chunk(self, idx: int) -> memoryview:
+        return memoryview(self.data)[self.offsets[idx] : self.offsets[idx + 1]]
+
+    def cursor(self) -> "RawPublicInputsCursor":
+        return RawPublicInputsCursor(self)
+
+
+class RawPublicInputsCursor:
+    """Reads the chunks of RawPublicInputs in order, as views of its buffer"""
+
+    def __init__(self, raw_public_inputs: RawPublicInputs) -> None:
+        self.raw_public_inputs = raw_public_inputs
+        self.view = memoryview(raw_public_inputs.data)
+        self.idx = 0
+
+    def next(self) -> memoryview:
+        offsets = self.raw_public_inputs.offsets
+        assert self.idx < len(offsets) - 1, "Raw public inputs are exhausted"
+        self.idx += 1
+        return self.view[offsets[self.idx - 1] : offsets[self.idx]]
+
+    def next_fq(self) -> FQ:
+        """Next chunk as a field element"""
+        chunk = self.next()
+        assert len(chunk) <= MAX_N_BYTES
+        return FQ(int.from_bytes(chunk, "big"))
 
 
 @dataclass
 class Witness:
-    rows: List[Row]  # PublicInputs rows
+    columns: WitnessColumns  # PublicInputs rows
     public_inputs: PublicInputs  # Public Inputs of the PublicInputs circuit
     calldata_gas_cost_table: Set[TxCallDataGasCostAccRow]
     keccak_table: KeccakTable
     block_table: BlockTable
     tx_table: TxTable
     circuit_len: int
-    copy_constrains: List[bytes]
+    raw_public_inputs: RawPublicInputs
+
+    @property
+    def rows(self) -> WitnessRows:
+        return WitnessRows(self.columns, self.keccak_table)
 
 
 @is_circuit_code
@@ -322,9 +464,12 @@ def verify_circuit(
     keccak_table = witness.keccak_table
     block_table = witness.block_table
     tx_table = witness.tx_table
-    copy_constrains = witness.copy_constrains
+    # the raw public inputs are read in order by the copy constraints below
+    raw_public_inputs = witness.raw_public_inputs.cursor()
 
-    fixed_u16_table = set([FixedU16Row(FQ(i)) for i in range(1 << 16)])
+    calldata_gas_cost_index = LookupIndex(
+        calldata_gas_cost_table, ("tx_id", "is_final", "gas_cost_acc")
+    )
 
     # copy constraint from public input to advice column
     # must copy constrain `hi` part to zero for non_word value, otherwise `hi` can be anything
@@ -336,74 +481,57 @@ def verify_circuit(
     for i in range(BLOCK_LEN // 2 + 1):
         block_row = block_table.table[i]
 
-        lo_le = copy_constrains.pop(0)[::-1]
-        if block_row.is_word:
-            hi_le = copy_constrains.pop(0)[::-1]
-        else:
-            hi_le = bytes(0)[::-1]
+        lo = raw_public_inputs.next_fq()
+        hi = raw_public_inputs.next_fq() if block_row.is_word else FQ.zero()
         (lo_expr, hi_expr) = block_row.to_lo_hi()
-        assert lo_expr == bytes_to_fq(lo_le)
-        assert hi_expr == bytes_to_fq(hi_le)
+        assert lo_expr == lo
+        assert hi_expr == hi
 
     # constrain block_hash and state_root lo/hi.
     # TODO layout block_hash in proper table
-    lo_le = copy_constrains.pop(0)[::-1]
-    hi_le = copy_constrains.pop(0)[::-1]
-    assert public_inputs.block_hash.lo.expr() == bytes_to_fq(lo_le)
-    assert public_inputs.block_hash.hi.expr() == bytes_to_fq(hi_le)
+    assert public_inputs.block_hash.lo.expr() == raw_public_inputs.next_fq()
+    assert public_inputs.block_hash.hi.expr() == raw_public_inputs.next_fq()
 
     # TODO layout state_root in proper table
-    lo_le = copy_constrains.pop(0)[::-1]
-    hi_le = copy_constrains.pop(0)[::-1]
-    assert public_inputs.state_root.lo.expr() == bytes_to_fq(lo_le)
-    assert public_inputs.state_root.hi.expr() == bytes_to_fq(hi_le)
+    assert public_inputs.state_root.lo.expr() == raw_public_inputs.next_fq()
+    assert public_inputs.state_root.hi.expr() == raw_public_inputs.next_fq()
 
     # TODO layout state_root_prev in proper table
-    lo_le = copy_constrains.pop(0)[::-1]
-    hi_le = copy_constrains.pop(0)[::-1]
-    assert public_inputs.state_root_prev.lo.expr() == bytes_to_fq(lo_le)
-    assert public_inputs.state_root_prev.hi.expr() == bytes_to_fq(hi_le)
+    assert public_inputs.state_root_prev.lo.expr() == raw_public_inputs.next_fq()
+    assert public_inputs.state_root_prev.hi.expr() == raw_public_inputs.next_fq()
 
     # constrain tx table `id``, `index`, value lo/hi per row, and all rows equals witness rpi bytes in vertical order
     tx_len = TX_LEN * MAX_TXS + 1
     for i in range(tx_len):
         tx_row: TxTableRow = tx_table.table[i]
         tx_id, index, value = tx_row.tx_id, tx_row.index, tx_row.value
-        lo_le = copy_constrains.pop(0)[::-1]
-        assert tx_id == bytes_to_fq(lo_le)
-        lo_le = copy_constrains.pop(0)[::-1]
-        assert index == bytes_to_fq(lo_le)
-
-        lo_le = copy_constrains.pop(0)[::-1]
-        if value.is_word:
-            hi_le = copy_constrains.pop(0)[::-1]
-        else:
-            hi_le = bytes(0)
-        assert value.lo.expr() == bytes_to_fq(lo_le)
-        assert value.hi.expr() == bytes_to_fq(hi_le)
+        assert tx_id == raw_public_inputs.next_fq()
+        assert index == raw_public_inputs.next_fq()
+
+        lo = raw_public_inputs.next_fq()
+        hi = raw_public_inputs.next_fq() if value.is_word else FQ.zero()
+        assert value.lo.expr() == lo
+        assert value.hi.expr() == hi
 
     # constrain tx calldata value lo/hi euqal to equals witness rpi bytes in vertical order
     calldata_len = MAX_CALLDATA_BYTES
     for i in range(calldata_len):
         value = tx_table.table[tx_len + i].value
 
-        lo_le = copy_constrains.pop(0)[::-1]
-        if value.is_word:
-            hi_le = copy_constrains.pop(0)[::-1]
-        else:
-            hi_le = bytes(0)
-        assert value.lo.expr() == bytes_to_fq(lo_le)
-        assert value.hi.expr() == bytes_to_fq(hi_le)
+        lo = raw_public_inputs.next_fq()
+        hi = raw_public_inputs.next_fq() if value.is_word else FQ.zero()
+        assert value.lo.expr() == lo
+        assert value.hi.expr() == hi
 
     # check gates constrains
+    row_next = rows[0]
     for i in range(len(rows)):
-        row: Row = rows[i]
-        row_next = rows[(i + 1) % len(rows)]
+        row, row_next = row_next, rows[(i + 1) % len(rows)]
         check_row(
             row,
             row_next,
-            calldata_gas_cost_table,
-            fixed_u16_table,
+            calldata_gas_cost_index,
+            FIXED_U16_TABLE,
             keccak_table,
             witness.circuit_len,
         )
@@ -718,8 +846,17 @@ keccak_rand = FQ(255)
 
 
 def public_data2witness(
-    public_data: PublicData, MAX_TXS: int, MAX_CALLDATA_BYTES: int, rand_rpi: FQ
+    public_data: PublicData,
+    MAX_TXS: int,
+    MAX_CALLDATA_BYTES: int,
+    rand_rpi: FQ,
+    keccak_table: Optional[KeccakTable] = None,
 ) -> Witness:
+    """
+    Generate the witness of the public data.  The PI digest is added to
+    `keccak_table` when given, so that it can be shared with the other circuits
+    of the block.
+    """
     # Layout of raw_public_inputs:
     #   # Block Table. `value.hi` is optional dependes on the original value bits size.
     #   [0] + [block_table.value.lo, (block_table.value.hi)]...
@@ -758,9 +895,6 @@ def public_data2witness(
     tx_table_raw_bytes = public_data.tx_table_raw_bytes(MAX_TXS)
     rpi_byte_values.extend(tx_table_raw_bytes)
 
-    keccak_table = KeccakTable()
-    block_table = BlockTable()
-    tx_table = TxTable()
     assert flatten_len(rpi_byte_values) == (
         N_BYTES_ONE  # empty block row
         + N_BYTES_BLOCK  # block
@@ -791,120 +925,117 @@ def public_data2witness(
     )
     assert flatten_len(rpi_byte_values) == circuit_len
 
-    rows: List[Row] = []
-    calldata_gas_cost_table = [TxCallDataGasCostAccRow(FQ.zero(), FQ.zero(), FQ.zero())]
-    i = circuit_len - 1
-    rpi_bytes_keccakrlc = []
-    rpi_value_lc = []
-    rpi_bytes = []
-
-    for value in reversed(rpi_byte_values):  # acc from big endian
-        for byte_index, byte in enumerate(value):
-            rpi_bytes.append(byte)
-
-            q_rpi_byte_enable = FQ.one()
-            q_bytes_last = FQ.one() if len(rpi_bytes) == 1 else FQ.zero()
-            q_rpi_keccak_lookup = (
-                FQ.one() if i == 0 else FQ.zero()
-            )  # keccak lookup happened in first row
-            q_rpi_value_start = FQ.zero()
-
-            if i == circuit_len - 1:
-                rpi_bytes_keccakrlc = [FQ(byte)]
-            else:
-                rpi_bytes_keccakrlc.append(FQ(rpi_bytes_keccakrlc[-1] * keccak_rand + byte))
-
-            if byte_index == 0:
-                q_rpi_value_start = FQ.one()
-                rpi_value_lc.append(FQ(byte))
-            else:
-                rpi_value_lc.append(FQ(rpi_value_lc[-1] * byte_pow_base + byte))
-
-            if i < BLOCK_LEN // 2 + 1:
-                assert i < len(block_table_value_col)
-                block_table.add(block_table_value_col[i])
-
-            # FIXME: extra value not used in any place. Here add 2 copy constraint in block table just for aligment
-            if i == BLOCK_LEN // 2 + 1:
-                block_table.add(WordOrValue(Word(public_data.block.state_root)))
-            if i == BLOCK_LEN // 2 + 2:
-                block_table.add(WordOrValue(Word(public_data.state_root_prev)))
-
-            q_tx_table = FQ.zero()
-            q_tx_calldata = FQ.zero()
-            q_tx_calldata_start = FQ.zero()
-
-            tx_id_inv = FQ.zero()
-            tx_value_lo_inv = FQ.zero()
-            tx_id_diff_inv = FQ.zero()
-            calldata_gas_cost = FQ.zero()
-            is_final = FQ.zero()
-            tx_row = TxTableRow(FQ.zero(), FQ.zero(), FQ.zero(), WordOrValue(FQ.zero()))
-            tx_table_len = TX_LEN * MAX_TXS + 1
-            if i < tx_table_len + MAX_CALLDATA_BYTES:
-                tx_id = tx_table_cols[0][i]
-                index = tx_table_cols[1][i]
-                value = tx_table_cols[2][i]
-                tag = FQ(TxTag.CallData)
-                if i == 0:
-                    tag = FQ.zero()
-                elif i < tx_table_len:
-                    # Iterate over TxTag values (until TxTag.TxSignHash) in a cycle
-                    tag = FQ((i % TX_LEN))
-                    if i % TX_LEN == 0:
-                        tag = FQ(TX_LEN)
-                if i < tx_table_len:
-                    q_tx_table = FQ.one()
-                    tx_id_inv = (tag - FQ(TxTag.CallDataLength)).inv()
-                    tx_value_lo_inv = value.lo.expr().inv()
-
-                if i >= tx_table_len:
-                    q_tx_calldata = FQ.one()
-                    tx_id_inv = tx_id.inv()
-                    tx_value_lo_inv = value.lo.expr().inv()
-                    tx_id_next = FQ.zero()
-                    if i < tx_table_len + MAX_CALLDATA_BYTES - 1:
-                        tx_id_next = tx_table_cols[0][i + 1]
-                    tx_id_diff_inv = (tx_id_next - tx_id).inv()
-                    calldata_gas_cost = tx_table_tx_calldata[3][i - tx_table_len]
-                    is_final = tx_table_tx_calldata[4][i - tx_table_len]
-                    calldata_gas_cost_table.append(
-                        TxCallDataGasCostAccRow(tx_id, is_final, calldata_gas_cost)
-                    )
-
-                if i == tx_table_len:
-                    q_tx_calldata_start = FQ.one()
-                tx_row = TxTableRow(tx_id, tag, index, value)
-                tx_table.add(tx_id, tag, index, value)
-
-            row = Row(
-                q_bytes_last,
-                q_tx_table,
-                q_tx_calldata,
-                q_tx_calldata_start,
-                q_rpi_keccak_lookup,
-                q_rpi_value_start,
-                tx_id_inv,
-                tx_value_lo_inv,
-                tx_id_diff_inv,
-                calldata_gas_cost,
-                is_final,
-                FQ(rpi_bytes[-1]),
-                rpi_bytes_keccakrlc[-1],
-                rpi_value_lc[-1],
-                Word(0),  # rpi_digest_word will be set below
-                q_rpi_byte_enable,
-                keccak_table,
-                tx_row,
-            )
-            rows.append(row)
-            i -= 1
-    rows.reverse()
-    output_digest = keccak(bytes(rpi_bytes))
-    assert len(output_digest) == 32
+    # The rows hold the raw public inputs byte by byte, each chunk in
+    # little-endian, and are filled from the last one, so the keccak input
+    # is the chunks read backwards.
+    rpi_bytes = b"".join(chunk[::-1] for chunk in rpi_byte_values)
+    q_rpi_value_start = bytearray(circuit_len)
+    offset = 0
+    for chunk in rpi_byte_values:
+        offset += len(chunk)
+        q_rpi_value_start[offset - 1] = 1
+
+    # 1. rpi_bytes_keccakrlc[last] = rpi_bytes[last]
+    # 2. rpi_bytes_keccakrlc[i] = keccak_rand * rpi_bytes_keccakrlc[i+1] + rpi_bytes[i]
+    # 3. rpi_value_lc[i] = rpi_value_lc[i+1] * byte_pow_base + rpi_bytes[i]
+    # 4. rpi_value_lc[i] = rpi_bytes[i] at the start of a value
+    rpi_bytes_keccakrlc = [0] * circuit_len
+    rpi_value_lc = [0] * circuit_len
+    keccakrlc, value_lc = 0, 0
+    for i in range(circuit_len - 1, -1, -1):
+        byte = rpi_bytes[i]
+        keccakrlc = (keccakrlc * keccak_rand.n + byte) % FQ.field_modulus
+        if q_rpi_value_start[i]:
+            value_lc = byte
+        else:
+            value_lc = (value_lc * byte_pow_base.n + byte) % FQ.field_modulus
+        rpi_bytes_keccakrlc[i] = keccakrlc
+        rpi_value_lc[i] = value_lc
 
-    # keccak lookup happened on 0 row
-    rows[0].rpi_digest_word = Word(output_digest)
+    block_table = BlockTable()
+    for value in block_table_value_col[: BLOCK_LEN // 2 + 1]:
+        block_table.add(value)
+    # FIXME: extra value not used in any place. Here add 2 copy constraint in block table just for aligment
+    block_table.add(WordOrValue(Word(public_data.block.state_root)))
+    block_table.add(WordOrValue(Word(public_data.state_root_prev)))
+
+    # Tx table rows, followed by the calldata rows
+    tx_table_len = TX_LEN * MAX_TXS + 1
+    tx_len = tx_table_len + MAX_CALLDATA_BYTES
+    tx_ids = [tx_id.n for tx_id in tx_table_cols[0]]
+    # Iterate over TxTag values (until TxTag.TxSignHash) in a cycle
+    tx_tags = (
+        [0]
+        + [i % TX_LEN or TX_LEN for i in range(1, tx_table_len)]
+        + [TxTag.CallData] * MAX_CALLDATA_BYTES
+    )
+    tx_values = tx_table_cols[2]
+    tx_table = TxTable()
+    for i in range(tx_len):
+        tx_table.add(tx_table_cols[0][i], FQ(tx_tags[i]), tx_table_cols[1][i], tx_values[i])
+
+    # Inverse columns, all inverted at once:
+    # - tx_id_inv: (tx_tag - CallDataLength)^(-1) in the tx table, tx_id^(-1) in calldata
+    # - tx_value_lo_inv: value.lo^(-1)
+    # - tx_id_diff_inv: (tx_id_next - tx_id)^(-1) in calldata
+    calldata_tx_ids = tx_ids[tx_table_len:]
+    inverses = batch_inv(
+        [(tag - TxTag.CallDataLength) % FQ.field_modulus for tag in tx_tags[:tx_table_len]]
+        + calldata_tx_ids
+        + [value.lo.expr().n for value in tx_values]
+        + [
+            (tx_id_next - tx_id) % FQ.field_modulus
+            for tx_id, tx_id_next in zip(calldata_tx_ids, calldata_tx_ids[1:] + [0])
+        ]
+    )
+    padding = [0] * (circuit_len - tx_len)
+    tx_id_inv = inverses[:tx_len] + padding
+    tx_value_lo_inv = inverses[tx_len : 2 * tx_len] + padding
+    tx_id_diff_inv = [0] * tx_table_len + inverses[2 * tx_len :] + padding
+
+    calldata_gas_cost_col = [0] * tx_table_len + [
+        gas_cost.n for gas_cost in tx_table_tx_calldata[3]
+    ]
+    is_final_col = [0] * tx_table_len + [is_final.n for is_final in tx_table_tx_calldata[4]]
+    calldata_gas_cost_table = set(
+        TxCallDataGasCostAccRow(tx_id, is_final, gas_cost)
+        for tx_id, gas_cost, is_final in zip(
+            tx_table_cols[0][tx_table_len:], tx_table_tx_calldata[3], tx_table_tx_calldata[4]
+        )
+    )
+    calldata_gas_cost_table.add(TxCallDataGasCostAccRow(FQ.zero(), FQ.zero(), FQ.zero()))
+
+    def selector(begin: int, end: int) -> bytearray:
+        column = bytearray(circuit_len)
+        column[begin:end] = b"\x01" * (end - begin)
+        return column
+
+    if keccak_table is None:
+        keccak_table = KeccakTable(keccak_rand)
+    output_digest = keccak_table.add(rpi_bytes[::-1], keccak_rand).digest
+
+    columns = WitnessColumns(
+        q_bytes_last=selector(circuit_len - 1, circuit_len),
+        q_tx_table=selector(0, tx_table_len),
+        q_tx_calldata=selector(tx_table_len, tx_len),
+        q_tx_calldata_start=selector(tx_table_len, min(tx_table_len + 1, tx_len)),
+        q_rpi_keccak_lookup=selector(0, 1),  # keccak lookup happened in first row
+        q_rpi_value_start=q_rpi_value_start,
+        tx_id_inv=tx_id_inv,
+        tx_value_lo_inv=tx_value_lo_inv,
+        tx_id_diff_inv=tx_id_diff_inv,
+        calldata_gas_cost=calldata_gas_cost_col + padding,
+        is_final=is_final_col + padding,
+        rpi_bytes=rpi_bytes,
+        rpi_bytes_keccakrlc=rpi_bytes_keccakrlc,
+        rpi_value_lc=rpi_value_lc,
+        rpi_digest_word=Word(output_digest),
+        q_rpi_byte_enable=selector(0, circuit_len),
+        tx_id=tx_ids,
+        tx_tag=tx_tags,
+        tx_index=[index.n for index in tx_table_cols[1]],
+        tx_value=tx_values,
+    )
 
     public_inputs = PublicInputs(
         pi_keccak=Word(output_digest),
@@ -912,19 +1043,16 @@ def public_data2witness(
         state_root=Word(public_data.block.state_root),
         state_root_prev=Word(public_data.state_root_prev),
     )
-    keccak_table.add(bytes(rpi_bytes), keccak_rand)
 
-    block_table.table.reverse()
-    tx_table.table.reverse()
     return Witness(
-        rows,
+        columns,
         public_inputs,
-        set(calldata_gas_cost_table),
+        calldata_gas_cost_table,
         keccak_table,
         block_table,
         tx_table,
         circuit_len,
-        copy_constrains=rpi_byte_values,
+        RawPublicInputs(rpi_byte_values),
     )
 
 
@@ -1,6 +1,8 @@
-from typing import NamedTuple, Tuple, List, Set, Dict, Optional, Union, Mapping
+from typing import Any, NamedTuple, Tuple, List, Set, Dict, Optional, Union, Mapping
 from enum import IntEnum
 from math import log, ceil
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 
 from zkevm_specs.evm_circuit.table import MPTProofType
 from .util import (
@@ -93,6 +95,10 @@ class Row(NamedTuple):
     # lexicographic_ordering_selector is the selector for transition checks and is set 0 for the first Row and 1 otherwise.
     lexicographic_ordering_selector: FQ
 
+    # keys and rw_counter packed into a single integer, see `pack_sort_key`.
+    # It's constrained against the row in `check_state_row`.
+    sort_key: Optional[int] = None
+
     # fmt: on
 
     def tag(self) -> FQ:
@@ -207,6 +213,36 @@ class LowerThanGadget:
         assert lt
 
 
+# Return the keys and rw_counter used for the lexicographic ordering packed
+# in a single integer of 31 limbs of 16 bits.  The field ordering is (from
+# most significant to less significant):
+# - tag
+# - id
+# - address
+# - field_tag
+# - storage_key
+# - rw_counter
+def pack_sort_key(row: Row) -> int:
+    v = row.tag().n
+    v = v * 2**ID_BITS + row.id().n  # 2 limbs
+    v = v * 2**ADDRESS_BITS + row.address().n  # + 10 limbs = 12 limbs
+    v = v * 2**16 + row.field_tag().n  # + 1 limb = 13 limbs
+    v = v * (2**32) + int.from_bytes(
+        map(lambda b: b.n, row.storage_key_bytes()), "little"
+    )  # + 16 limbs = 29 limbs
+    v = v * 2**RW_COUNTER_BITS + row.rw_counter.n  # + 2 limbs = 31 limbs
+    return v
+
+
+# Return the Little-Endian list of 16 bit limbs of a packed sort key
+def sort_key_limbs(v: int) -> List[FQ]:
+    limbs = []
+    for i in range(31):
+        limbs.append(FQ(v & 0xFFFF))
+        v = v >> 16
+    return limbs
+
+
 @is_circuit_code
 def assert_in_range(x: FQ, min_val: int, max_val: int) -> None:
     assert min_val <= x.n and x.n <= max_val
@@ -489,7 +525,14 @@ def check_tx_receipt(row: Row, row_prev: Row):
 
 
 @is_circuit_code
-def check_state_row(row: Row, row_prev: Row, row_next: Row, tables: Tables):
+def check_state_row(
+    row: Row, row_prev: Row, row_next: Row, tables: Tables, sort_key_prev: Optional[int] = None
+) -> int:
+    """
+    Check the row with its previous and next ones, and return its packed sort
+    key.  `sort_key_prev` is the key returned by the check of `row_prev`, it's
+    computed from `row_prev` when missing.
+    """
     #
     # Constraints that affect all rows, no matter which Tag they use
     #
@@ -540,34 +583,18 @@ def check_state_row(row: Row, row_prev: Row, row_next: Row, tables: Tables):
 
     assert TAG_BITS + ID_BITS == 2 * 16
 
-    # Return a list of 16 bit limbs with all the keys and rw_counter used for
-    # the lexicographic ordering.  The field ordering is (from most significant
-    # to less significant):
-    # - tag
-    # - id
-    # - address
-    # - field_tag
-    # - storage_key
-    # - rw_counter
-    def keys_rwc_to_limbs_in_order(row: Row) -> List[FQ]:
-        v = row.tag().n
-        v = v * 2**ID_BITS + row.id().n  # 2 limbs
-        v = v * 2**ADDRESS_BITS + row.address().n  # + 10 limbs = 12 limbs
-        v = v * 2**16 + row.field_tag().n  # + 1 limb = 13 limbs
-        v = v * (2**32) + int.from_bytes(
-            map(lambda b: b.n, row.storage_key_bytes()), "little"
-        )  # + 16 limbs = 29 limbs
-        v = v * 2**RW_COUNTER_BITS + row.rw_counter.n  # + 2 limbs = 31 limbs
-        limbs = []
-        for i in range(31):
-            limbs.append(FQ(v & 0xFFFF))
-            v = v >> 16
-        return limbs
-
-    limbs_prev = keys_rwc_to_limbs_in_order(row_prev)
-    limbs = keys_rwc_to_limbs_in_order(row)
-    if row.tag() != Tag.Start:
-        LowerThanGadget(limbs_prev, limbs).verify()
+    # The keys and rw_counter of each row are packed into 31 limbs of 16 bits
+    # (see `pack_sort_key`), computed from the row once, when the row is the
+    # current one, and checked against its assigned sort_key.  When the check
+    # of the previous row handed over its packed key, ordering is a single
+    # comparison.  The limb level LowerThanGadget only runs to report a
+    # failing comparison.
+    sort_key = pack_sort_key(row)
+    assert row.sort_key is None or row.sort_key == sort_key
+    if sort_key_prev is None:
+        sort_key_prev = pack_sort_key(row_prev)
+    if row.tag() != Tag.Start and not sort_key_prev < sort_key:
+        LowerThanGadget(sort_key_limbs(sort_key_prev), sort_key_limbs(sort_key)).verify()
 
     # 0.5. Read consistency
     #
@@ -612,6 +639,91 @@ def check_state_row(row: Row, row_prev: Row, row_next: Row, tables: Tables):
     else:
         raise ValueError("Unreacheable")
 
+    return sort_key
+
+
+def verify_state_circuit(
+    rows: List[Row], tables: Tables, workers: int = 1, fail_fast: bool = True
+) -> List[Tuple[int, AssertionError]]:
+    """
+    Run `check_state_row` over every row, wrapping around at the ends of the
+    table, and return the failures as (row index, error) sorted by index.
+    With `workers > 1` the rows are split in chunks that carry their previous
+    and next row, and checked in a process pool that gets the tables once.
+    With `fail_fast` only the first failing row is reported, and workers skip
+    the rows after the lowest failure seen so far.
+    """
+    n = len(rows)
+    if n == 0:
+        return []
+    if workers <= 1 or n < 2 * workers:
+        return _check_state_rows(0, [rows[-1]] + rows + [rows[0]], tables, None, fail_fast)
+
+    # a few chunks per worker to keep the pool balanced
+    chunk_size = -(-n // (workers * 4))
+    failed_at = multiprocessing.Value("q", n)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_state_worker,
+        initargs=(tables, failed_at, fail_fast),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _check_state_rows_in_worker,
+                begin,
+                [rows[begin - 1]]
+                + rows[begin : begin + chunk_size]
+                + [rows[(begin + chunk_size) % n]],
+            )
+            for begin in range(0, n, chunk_size)
+        ]
+        failures = [failure for future in futures for failure in future.result()]
+    return failures[:1] if fail_fast else failures
+
+
+# Per-process state of the verify_state_circuit pool
+_state_worker_args: Tuple[Tables, Optional[Any], bool]
+
+
+def _init_state_worker(tables: Tables, failed_at: Optional[Any], fail_fast: bool):
+    global _state_worker_args
+    _state_worker_args = (tables, failed_at, fail_fast)
+
+
+def _check_state_rows_in_worker(begin: int, window: List[Row]) -> List[Tuple[int, AssertionError]]:
+    """`_check_state_rows` with the arguments the pool worker was initialized with"""
+    return _check_state_rows(begin, window, *_state_worker_args)
+
+
+def _check_state_rows(
+    begin: int,
+    window: List[Row],
+    tables: Tables,
+    failed_at: Optional[Any],
+    fail_fast: bool,
+) -> List[Tuple[int, AssertionError]]:
+    """Check window[1:-1], the rows starting at index `begin`"""
+    failures = []
+    # the packed key of the previous row, once its check has passed
+    sort_key_prev: Optional[int] = None
+    for i in range(1, len(window) - 1):
+        idx = begin + i - 1
+        if fail_fast and failed_at is not None and failed_at.value < idx:
+            break
+        try:
+            sort_key_prev = check_state_row(
+                window[i], window[i - 1], window[i + 1], tables, sort_key_prev
+            )
+        except AssertionError as e:
+            sort_key_prev = None
+            failures.append((idx, e))
+            if fail_fast:
+                if failed_at is not None:
+                    with failed_at.get_lock():
+                        failed_at.value = min(failed_at.value, idx)
+                break
+    return failures
+
 
 # State circuit operation superclass
 class Operation(NamedTuple):
@@ -844,7 +956,7 @@ def op2row(op: Operation, root: Word) -> Row:
     initial_value = op.initial_value
     lexicographic_ordering_selector = FQ(op.lexicographic_ordering_selector)
 
-    return Row(
+    row = Row(
         rw_counter,
         is_write,
         keys,
@@ -855,6 +967,7 @@ def op2row(op: Operation, root: Word) -> Row:
         root,
         lexicographic_ordering_selector,
     )
+    return row._replace(sort_key=pack_sort_key(row))
 
 
 # Generate the advice Rows from a list of Operations
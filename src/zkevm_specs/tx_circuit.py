@@ -1,4 +1,8 @@
-from typing import NamedTuple, Tuple, List, Set, Union
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, NamedTuple, Optional, Tuple, List, Union
 from .util import (
     FQ,
     RLC,
@@ -8,6 +12,7 @@ from .util import (
     U256,
     U64,
     linear_combine_bytes,
+    KeccakTable,
     GAS_COST_TX_CALL_DATA_PER_NON_ZERO_BYTE,
     GAS_COST_TX_CALL_DATA_PER_ZERO_BYTE,
     is_circuit_code,
@@ -35,32 +40,6 @@ class Row:
         self.value = WordOrValue(value)
 
 
-class KeccakTable:
-    # The columns are: (is_enabled, input_rlc, input_len, output)
-    table: Set[Tuple[FQ, FQ, FQ, Word]]
-
-    def __init__(self):
-        self.table = set()
-        self.table.add((FQ(0), FQ(0), FQ(0), Word(0)))  # Add all 0s row
-
-    def add(self, input: bytes, keccak_randomness: FQ):
-        output = keccak(input)
-        self.table.add(
-            (
-                FQ(1),
-                RLC(bytes(reversed(input)), keccak_randomness, n_bytes=64).expr(),
-                FQ(len(input)),
-                Word(output),
-            )
-        )
-
-    def lookup(self, is_enabled: FQ, input_rlc: FQ, input_len: FQ, output: Word, assert_msg: str):
-        assert (is_enabled, input_rlc, input_len, output) in self.table, (
-            f"{assert_msg}: {(is_enabled, input_rlc, input_len, output)} "
-            + "not found in the lookup table"
-        )
-
-
 class WrongFieldInteger:
     """
     Wrong Field arithmetic Integer, representing the implementation at
@@ -144,18 +123,131 @@ class ECDSAVerifyChip:
         self_msg_hash = Secp256k1ScalarField(int.from_bytes(msg_hash, "big"))
         return cls(self_signature, self_pub_key, self_msg_hash)
 
-    def verify(self, assert_msg: str):
+    def ecdsa_inputs(self) -> Tuple[bytes, int, int, bytes]:
+        """Message hash, signature r and s, and public key checked by `ecdsa_verify`"""
         msg_hash = bytes(reversed(self.msg_hash.to_le_bytes()))
         sig_r = int.from_bytes(self.signature[0].to_le_bytes(), "little")
         sig_s = int.from_bytes(self.signature[1].to_le_bytes(), "little")
-        signature = KeyAPI.Signature(vrs=[0, sig_r, sig_s])
-        public_key = KeyAPI.PublicKey(
-            bytes(reversed(self.pub_key[0].to_le_bytes()))
-            + bytes(reversed(self.pub_key[1].to_le_bytes()))
+        public_key = bytes(reversed(self.pub_key[0].to_le_bytes())) + bytes(
+            reversed(self.pub_key[1].to_le_bytes())
         )
-        assert KeyAPI().ecdsa_verify(
-            msg_hash, signature, public_key
-        ), f"{assert_msg}: ecdsa_verify failed"
+        return msg_hash, sig_r, sig_s, public_key
+
+    def verify(self, assert_msg: str, is_valid: Optional[bool] = None):
+        """
+        Verify the signature, unless `is_valid` gives the result of
+        `ecdsa_verify` on `ecdsa_inputs()`, computed ahead of time.
+        """
+        if is_valid is None:
+            is_valid = ecdsa_verify(*self.ecdsa_inputs())
+        assert is_valid, f"{assert_msg}: ecdsa_verify failed"
+
+
+def ecdsa_verify(msg_hash: bytes, sig_r: int, sig_s: int, public_key: bytes) -> bool:
+    signature = KeyAPI.Signature(vrs=[0, sig_r, sig_s])
+    return KeyAPI().ecdsa_verify(msg_hash, signature, KeyAPI.PublicKey(public_key))
+
+
+def recover_public_key(msg_hash: bytes, sig_parity: int, sig_r: int, sig_s: int) -> bytes:
+    signature = KeyAPI.Signature(vrs=(sig_parity, sig_r, sig_s))
+    return signature.recover_public_key_from_msg_hash(msg_hash).to_bytes()
+
+
+# (tx_sign_hash, sig_v, sig_r, sig_s, chain_id)
+SignatureKey = Tuple[bytes, int, int, int, int]
+
+
+class RecoveredSender(NamedTuple):
+    public_key: bytes  # 64 bytes, x and y big-endian
+    address: bytes  # 20 bytes
+
+
+class SignatureCache:
+    """
+    Bounded LRU cache of the senders recovered from tx signatures, keyed by
+    (tx_sign_hash, sig_v, sig_r, sig_s, chain_id).  With a `path`, it's loaded
+    from that file if it exists, and `save()` writes it back.
+
+    The SignVerifyChip of a cached tx is assigned again from the cached public
+    key, which needs no ECDSA work, so chips are never shared between
+    witnesses.
+    """
+
+    max_size: int
+    path: Optional[str]
+    entries: "OrderedDict[SignatureKey, RecoveredSender]"
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = 1 << 16, path: Optional[str] = None) -> None:
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: SignatureKey) -> Optional[RecoveredSender]:
+        sender = self.entries.get(key)
+        if sender is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return sender
+
+    def put(self, key: SignatureKey, public_key: bytes) -> RecoveredSender:
+        sender = RecoveredSender(public_key, keccak(public_key)[-20:])
+        self.entries[key] = sender
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return sender
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        assert path is not None, "No file to save the signature cache to"
+        entries = [
+            [sign_hash.hex(), v, r, s, chain_id, sender.public_key.hex()]
+            for (sign_hash, v, r, s, chain_id), sender in self.entries.items()
+        ]
+        with open(path, "w") as file:
+            json.dump(entries, file)
+
+    def load(self, path: str) -> None:
+        with open(path) as file:
+            for sign_hash, v, r, s, chain_id, public_key in json.load(file):
+                self.put((bytes.fromhex(sign_hash), v, r, s, chain_id), bytes.fromhex(public_key))
+
+
+def signature_key(tx_sign_hash: bytes, tx: "Transaction", chain_id: U64) -> SignatureKey:
+    return (tx_sign_hash, int(tx.sig_v), int(tx.sig_r), int(tx.sig_s), int(chain_id))
+
+
+def _map_ecdsa(fn, args: List[Tuple], workers: int) -> List:
+    """Apply `fn` to each tuple of `args` in order, with a process pool when `workers > 1`"""
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(args) // (workers * 4))
+            return list(executor.map(fn, *zip(*args), chunksize=chunksize))
+    return [fn(*arg) for arg in args]
 
 
 class SignVerifyChip:
@@ -202,7 +294,13 @@ class SignVerifyChip:
         self_ecdsa_chip = ECDSAVerifyChip.assign(signature, pub_key, msg_hash)
         return cls(self_pub_key_hash, self_address, self_msg_hash, self_ecdsa_chip)
 
-    def verify(self, keccak_table: KeccakTable, keccak_randomness: FQ, assert_msg: str):
+    def verify(
+        self,
+        keccak_table: KeccakTable,
+        keccak_randomness: FQ,
+        assert_msg: str,
+        ecdsa_is_valid: Optional[bool] = None,
+    ):
         is_not_padding = FQ(1 - (self.address == 0))  # 1 - is_zero(self.address)
 
         # 0. Copy constraints between pub_key and msg_hash bytes of this chip
@@ -240,7 +338,7 @@ class SignVerifyChip:
         ), f"{assert_msg}: {hex(msg_hash.int_value())} != {hex(self.msg_hash.int_value())}"
 
         # 4. Verify the ECDSA signature
-        self.ecdsa_chip.verify(assert_msg)
+        self.ecdsa_chip.verify(assert_msg, ecdsa_is_valid)
 
 
 class Witness(NamedTuple):
@@ -255,14 +353,26 @@ def verify_circuit(
     MAX_TXS: int,
     MAX_CALLDATA_BYTES: int,
     keccak_randomness: FQ,
+    workers: int = 1,
 ) -> None:
     """
-    Entry level circuit verification function
+    Entry level circuit verification function.  The ECDSA signatures are
+    verified first, once per distinct signature (all the padding txs share the
+    dummy one), across a process pool with `workers > 1`.
     """
 
     rows = witness.rows
     sign_verifications = witness.sign_verifications
     keccak_table = witness.keccak_table
+
+    ecdsa_inputs = [
+        sign_verification.ecdsa_chip.ecdsa_inputs()
+        for sign_verification in sign_verifications[:MAX_TXS]
+    ]
+    distinct_inputs = list(dict.fromkeys(ecdsa_inputs))
+    ecdsa_results: Dict[Tuple[bytes, int, int, bytes], bool] = dict(
+        zip(distinct_inputs, _map_ecdsa(ecdsa_verify, distinct_inputs, workers))
+    )
     for tx_index in range(MAX_TXS):
         assert_msg = f"Constraints failed for tx_index = {tx_index}"
         tx_row_index = tx_index * Tag.TxSignHash
@@ -272,7 +382,9 @@ def verify_circuit(
         # SignVerifyChip constraint verification.  Padding txs rows contain
         # 0 in all values.  The SignVerifyChip skips the verification when
         # the caller_address == 0.
-        sign_verifications[tx_index].verify(keccak_table, keccak_randomness, assert_msg)
+        sign_verifications[tx_index].verify(
+            keccak_table, keccak_randomness, assert_msg, ecdsa_results[ecdsa_inputs[tx_index]]
+        )
 
         # 0. Copy constraints using fixed offsets between the tx rows and the SignVerifyChip
         assert rows[caller_addr_index].value.value() == sign_verifications[tx_index].address, (
@@ -329,28 +441,42 @@ def padding_tx(tx_id: int) -> List[Row]:
     ]
 
 
+def tx_sign_hash_and_signature(tx: Transaction, chain_id: U64) -> Tuple[bytes, KeyAPI.Signature]:
+    tx_sign_data = rlp.encode(
+        [tx.nonce, tx.gas_price, tx.gas, tx.encode_to(), tx.value, tx.data, chain_id, 0, 0]
+    )
+    sig_parity = tx.sig_v - 35 - chain_id * 2
+    return keccak(tx_sign_data), KeyAPI.Signature(vrs=(sig_parity, tx.sig_r, tx.sig_s))
+
+
 def tx2witness(
-    index: int, tx: Transaction, chain_id: U64, keccak_randomness: FQ, keccak_table: KeccakTable
+    index: int,
+    tx: Transaction,
+    chain_id: U64,
+    keccak_randomness: FQ,
+    keccak_table: KeccakTable,
+    public_key: Optional[bytes] = None,
+    signature_cache: Optional[SignatureCache] = None,
 ) -> Tuple[List[Row], SignVerifyChip]:
     """
     Generate the witness data for a single transaction: generate the tx table
     rows, insert the pub_key_bytes entry in the keccak_table and assign the
-    SignVerifyChip.
+    SignVerifyChip.  The sender public key is recovered from the signature,
+    unless it's given as `public_key` or found in `signature_cache`.
     """
 
-    tx_sign_data = rlp.encode(
-        [tx.nonce, tx.gas_price, tx.gas, tx.encode_to(), tx.value, tx.data, chain_id, 0, 0]
-    )
-    tx_sign_hash = keccak(tx_sign_data)
-
-    sig_parity = tx.sig_v - 35 - chain_id * 2
-    sig = KeyAPI.Signature(vrs=(sig_parity, tx.sig_r, tx.sig_s))
-
-    pk = sig.recover_public_key_from_msg_hash(tx_sign_hash)
+    tx_sign_hash, sig = tx_sign_hash_and_signature(tx, chain_id)
+    if public_key is None and signature_cache is not None:
+        key = signature_key(tx_sign_hash, tx, chain_id)
+        sender = signature_cache.get(key)
+        if sender is None:
+            sender = signature_cache.put(key, recover_public_key(tx_sign_hash, sig.v, sig.r, sig.s))
+        public_key = sender.public_key
+    if public_key is None:
+        public_key = recover_public_key(tx_sign_hash, sig.v, sig.r, sig.s)
+    pk = KeyAPI.PublicKey(public_key)
     pk_bytes = pk.to_bytes()
-    keccak_table.add(pk_bytes, keccak_randomness)
-    pk_hash = keccak(pk.to_bytes())
-    addr = pk_hash[-20:]
+    addr = keccak_table.add(pk_bytes, keccak_randomness).digest[-20:]
 
     sign_verification = SignVerifyChip.assign(sig, pk, tx_sign_hash, keccak_randomness)
 
@@ -419,20 +545,45 @@ def txs2witness(
     MAX_TXS: int,
     MAX_CALLDATA_BYTES: int,
     keccak_randomness: FQ,
+    workers: int = 1,
+    signature_cache: Optional[SignatureCache] = None,
+    keccak_table: Optional[KeccakTable] = None,
 ) -> Witness:
     """
     Generate the complete witness of the transactions for a fixed size circuit.
+    The pub key hashes are added to `keccak_table` when given, so that it can
+    be shared with the other circuits of the block.
+    The sender public keys are taken from `signature_cache` when given, and the
+    other ones are recovered across a process pool with `workers > 1`.
     """
 
     assert len(txs) <= MAX_TXS
 
-    keccak_table = KeccakTable()
+    public_keys: List[Optional[bytes]] = []
+    keys: List[SignatureKey] = []
+    recover_inputs = []
+    for tx in txs:
+        tx_sign_hash, sig = tx_sign_hash_and_signature(tx, chain_id)
+        keys.append(signature_key(tx_sign_hash, tx, chain_id))
+        sender = None if signature_cache is None else signature_cache.get(keys[-1])
+        public_keys.append(None if sender is None else sender.public_key)
+        if sender is None:
+            recover_inputs.append((tx_sign_hash, sig.v, sig.r, sig.s))
+    recovered = iter(_map_ecdsa(recover_public_key, recover_inputs, workers))
+    for index, public_key in enumerate(public_keys):
+        if public_key is None:
+            public_key = public_keys[index] = next(recovered)
+            if signature_cache is not None:
+                signature_cache.put(keys[index], public_key)
+
+    if keccak_table is None:
+        keccak_table = KeccakTable(keccak_randomness)
     sign_verifications: List[SignVerifyChip] = []
     tx_fixed_rows: List[Row] = []  # Accumulate fixed rows of each tx
     tx_dyn_rows: List[Row] = []  # Accumulate CallData rows of each tx
     for index, tx in enumerate(txs):
         tx_rows, sign_verification = tx2witness(
-            index, tx, chain_id, keccak_randomness, keccak_table
+            index, tx, chain_id, keccak_randomness, keccak_table, public_keys[index]
         )
         sign_verifications.append(sign_verification)
         for row in tx_rows:
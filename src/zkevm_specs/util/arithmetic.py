@@ -1,12 +1,28 @@
 from __future__ import annotations
-from typing import runtime_checkable, List, Protocol, Sequence, Tuple, Type, TypeVar, Union
+from functools import lru_cache
+from operator import mul
+from threading import Lock
+from typing import (
+    runtime_checkable,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from py_ecc import bn128
 from py_ecc.utils import prime_field_inv
 from .param import MAX_N_BYTES
 from .typing import U256
 
 
-def linear_combine_bytes(seq: Sequence[Union[int, FQ]], base: FQ, range_check: bool = True) -> FQ:
+def linear_combine_bytes(
+    seq: Sequence[Union[int, FQ]], base: IntOrFQ, range_check: bool = True
+) -> FQ:
     """
     Aggregate a sequence of data into a single field element.
     To use it as a commitment, the base must be a secured random number.
@@ -15,34 +31,214 @@ def linear_combine_bytes(seq: Sequence[Union[int, FQ]], base: FQ, range_check: b
     >>> r = 10
     >>> assert linear_combine_bytes([1, 2, 3], r) == 1 + 2 * r + 3 * r**2
     """
-    result = FQ.zero()
-    for limb in reversed(seq):
-        if range_check:
-            limb_int = limb.n if isinstance(limb, FQ) else limb
-            assert 0 <= limb_int < 256, "Each byte should fit in 8-bit"
-        result = result * base + limb
+    powers = _linear_combine_powers(base.n if isinstance(base, FQ) else base % _MODULUS)
+    return _from_reduced(_linear_combine(_bytes_of(seq, range_check), powers))
+
+
+def batch_linear_combine_bytes(
+    seqs: Iterable[Sequence[Union[int, FQ]]], base: IntOrFQ, range_check: bool = True
+) -> List[FQ]:
+    """
+    `linear_combine_bytes` of each sequence with the same base, which shares
+    the table of powers of the base between the sequences
+    >>> assert batch_linear_combine_bytes([b"\\x01\\x02", b""], 10) == [FQ(21), FQ(0)]
+    """
+    powers = _linear_combine_powers(base.n if isinstance(base, FQ) else base % _MODULUS)
+    return [_from_reduced(_linear_combine(_bytes_of(seq, range_check), powers)) for seq in seqs]
+
+
+def _bytes_of(seq: Sequence[Union[int, FQ]], range_check: bool) -> Sequence[int]:
+    if isinstance(seq, (bytes, bytearray)):
+        return seq
+    limbs = [limb.n if isinstance(limb, FQ) else limb for limb in seq]
+    if range_check and limbs:
+        assert 0 <= min(limbs) and max(limbs) < 256, "Each byte should fit in 8-bit"
+    return limbs
+
+
+def _linear_combine(limbs: Sequence[int], powers: Tuple[int, ...]) -> int:
+    # Horner's rule over chunks of limbs, from the most significant one, with a
+    # single reduction per chunk
+    size = LINEAR_COMBINE_CHUNK
+    result = 0
+    for start in range((len(limbs) - 1) // size * size, -1, -size):
+        chunk = limbs[start : start + size]
+        result = (result * powers[size] + sum(map(mul, chunk, powers))) % _MODULUS
     return result
 
 
-class FQ(bn128.FQ):
-    def __init__(self, value: IntOrFQ) -> None:
+class FQ:
+    """
+    Element of the BN254 scalar field, backed by a plain int in [0, field_modulus).
+
+    It's interchangeable with `py_ecc.bn128.FQ` (same operators, `n`, `one`,
+    `zero`, `field_modulus`), but results are built without re-validating the
+    operands and reductions are skipped when the value is known to be in range.
+    """
+
+    __slots__ = ("n",)
+
+    n: int
+    field_modulus: int = bn128.FQ.field_modulus
+
+    def __init__(self, value: Union[int, Expression]) -> None:
         if isinstance(value, FQ):
             self.n = value.n
         else:
-            super().__init__(value)
+            self.n = _operand(value) % _MODULUS
 
     def __hash__(self) -> int:
         return hash(self.n)
 
     def expr(self) -> FQ:
-        return FQ(self)
+        # FQ is immutable, so it can stand for itself as an expression
+        return self
 
     def inv(self) -> FQ:
-        return FQ(prime_field_inv(self.n, self.field_modulus))
+        return _from_reduced(prime_field_inv(self.n, _MODULUS))
 
     def __repr__(self) -> str:
         return f"{hex(self.n)}"
 
+    def __int__(self) -> int:
+        return self.n
+
+    def __reduce__(self):
+        return (_from_reduced, (self.n,))
+
+    def __add__(self, other: Union[int, Expression]) -> FQ:
+        if isinstance(other, FQ):
+            n = self.n + other.n
+            return _from_reduced(n - _MODULUS if n >= _MODULUS else n)
+        return _from_reduced((self.n + _operand(other)) % _MODULUS)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Union[int, Expression]) -> FQ:
+        if isinstance(other, FQ):
+            n = self.n - other.n
+            return _from_reduced(n + _MODULUS if n < 0 else n)
+        return _from_reduced((self.n - _operand(other)) % _MODULUS)
+
+    def __rsub__(self, other: Union[int, Expression]) -> FQ:
+        return _from_reduced((_operand(other) - self.n) % _MODULUS)
+
+    def __mul__(self, other: Union[int, Expression]) -> FQ:
+        on = other.n if isinstance(other, FQ) else _operand(other)
+        return _from_reduced(self.n * on % _MODULUS)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Union[int, Expression]) -> FQ:
+        on = other.n if isinstance(other, FQ) else _operand(other)
+        return _from_reduced(self.n * prime_field_inv(on, _MODULUS) % _MODULUS)
+
+    def __rtruediv__(self, other: Union[int, Expression]) -> FQ:
+        return _from_reduced(prime_field_inv(self.n, _MODULUS) * _operand(other) % _MODULUS)
+
+    def __pow__(self, other: int) -> FQ:
+        return _from_reduced(pow(self.n, other, _MODULUS))
+
+    def __neg__(self) -> FQ:
+        return _from_reduced(_MODULUS - self.n if self.n else 0)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FQ):
+            return self.n == other.n
+        return self.n == _operand(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    @classmethod
+    def one(cls) -> FQ:
+        return _from_reduced(1)
+
+    @classmethod
+    def zero(cls) -> FQ:
+        return _from_reduced(0)
+
+
+_MODULUS = FQ.field_modulus
+_new_fq = object.__new__
+
+
+def _from_reduced(n: int) -> FQ:
+    """Build an FQ from a value already known to be in [0, field_modulus)"""
+    fq = _new_fq(FQ)
+    fq.n = n
+    return fq
+
+
+def _operand(value: object) -> int:
+    """The int of an operand that isn't an FQ"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, Expression):
+        return value.expr().n
+    raise TypeError(f"Expected an int or Expression object, but got object of type {type(value)}")
+
+
+# FQ objects built while an FQAllocationCounter is open, and the number of
+# open counters.  The counting constructors are installed by the first
+# counter to open and removed by the last one to close.
+_fq_allocations = 0
+_open_fq_counters = 0
+_fq_counters_lock = Lock()
+_fq_init = FQ.__init__
+
+
+def _counted_new_fq(cls):
+    global _fq_allocations
+    _fq_allocations += 1
+    return object.__new__(cls)
+
+
+def _counted_fq_init(fq: FQ, value: Union[int, Expression]) -> None:
+    global _fq_allocations
+    _fq_allocations += 1
+    _fq_init(fq, value)
+
+
+class FQAllocationCounter:
+    """
+    Context manager counting the FQ objects built while it's open, in any
+    thread.  Both constructors (`FQ(value)` and the internal one of the
+    operators) are only wrapped while a counter is open, so FQ arithmetic is
+    unaffected otherwise.  Counters can be nested or overlap, and closed in
+    any order.
+    """
+
+    _start: int
+    _end: Optional[int]
+
+    def __init__(self) -> None:
+        self._start = 0
+        self._end = 0
+
+    @property
+    def count(self) -> int:
+        return (_fq_allocations if self._end is None else self._end) - self._start
+
+    def __enter__(self) -> FQAllocationCounter:
+        global _new_fq, _open_fq_counters
+        with _fq_counters_lock:
+            if _open_fq_counters == 0:
+                _new_fq = _counted_new_fq
+                FQ.__init__ = _counted_fq_init  # type: ignore
+            _open_fq_counters += 1
+            self._start, self._end = _fq_allocations, None
+        return self
+
+    def __exit__(self, *args) -> None:
+        global _new_fq, _open_fq_counters
+        with _fq_counters_lock:
+            self._end = _fq_allocations
+            _open_fq_counters -= 1
+            if _open_fq_counters == 0:
+                _new_fq = object.__new__
+                FQ.__init__ = _fq_init  # type: ignore
+
 
 IntOrFQ = Union[int, FQ]
 
@@ -68,7 +264,7 @@ class RLC:
         self.le_bytes = value
 
     def expr(self) -> FQ:
-        return FQ(self.rlc_value)
+        return self.rlc_value
 
     def __hash__(self) -> int:
         return hash(self.rlc_value)
@@ -207,6 +403,43 @@ def bytes_to_fq(value: bytes):
     return FQ(int.from_bytes(value, "little"))
 
 
+def batch_inv(values: Sequence[int]) -> List[int]:
+    """
+    Inverses of field elements given as reduced ints, with 0 mapped to 0 like
+    `FQ.inv`.  Uses Montgomery's trick: a single field inversion, and three
+    multiplications per value.
+    >>> assert batch_inv([2, 0, 5]) == [FQ(2).inv().n, 0, FQ(5).inv().n]
+    """
+    # product of the nonzero values before each one
+    prefix = []
+    acc = 1
+    for value in values:
+        prefix.append(acc)
+        if value:
+            acc = acc * value % _MODULUS
+    acc_inv = prime_field_inv(acc, _MODULUS)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        value = values[i]
+        if value:
+            result[i] = prefix[i] * acc_inv % _MODULUS
+            acc_inv = acc_inv * value % _MODULUS
+    return result
+
+
+# Number of limbs combined between two modular reductions by linear_combine_bytes
+LINEAR_COMBINE_CHUNK = 32
+
+
+@lru_cache(maxsize=16)
+def _linear_combine_powers(base: int) -> Tuple[int, ...]:
+    """base**i for i in [0, LINEAR_COMBINE_CHUNK], cached per randomness"""
+    powers = [1]
+    for _ in range(LINEAR_COMBINE_CHUNK):
+        powers.append(powers[-1] * base % _MODULUS)
+    return tuple(powers)
+
+
 def sum_values(values: Sequence[IntOrFQ]) -> FQ:
     return FQ(sum(values))
 
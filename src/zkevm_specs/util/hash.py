@@ -1,6 +1,7 @@
-from typing import Union
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 from Crypto.Hash import keccak
 
+from .arithmetic import FQ, Word, batch_linear_combine_bytes
 from .typing import U256
 
 
@@ -13,3 +14,91 @@ def keccak256(data: Union[str, bytes, bytearray]) -> bytes:
 EMPTY_HASH: U256 = U256(int.from_bytes(keccak256(""), "big"))
 EMPTY_CODE_HASH: U256 = EMPTY_HASH
 EMPTY_TRIE_HASH: U256 = U256(int.from_bytes(keccak256("80"), "big"))
+
+
+class KeccakEntry(NamedTuple):
+    input_rlc: FQ  # RLC of the reversed input bytes
+    input_len: FQ
+    digest: bytes
+
+
+class KeccakTable:
+    """
+    Keccak table of a block, which can be shared by all its circuits.  Each
+    distinct input is hashed once, and RLC encoded once per keccak randomness
+    it's added with, however many times it's added, and the entries are
+    indexed by (input_rlc, input_len) for the lookups.  The randomness set by
+    the constructor, or by the first `add` given one, is used for the inputs
+    added without randomness.
+
+    The columns are: (is_enabled, input_rlc, input_len, output), with an all 0s
+    row for the disabled lookups, and the output is the Word of the digest
+    bytes.
+    """
+
+    keccak_randomness: Optional[FQ]
+    entries: Dict[Tuple[bytes, FQ], KeccakEntry]
+    digests: Dict[bytes, bytes]
+    outputs: Dict[Tuple[FQ, FQ], Set[Word]]
+
+    def __init__(self, keccak_randomness: Optional[FQ] = None):
+        self.keccak_randomness = keccak_randomness
+        self.entries = dict()
+        self.digests = dict()
+        self.outputs = dict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, input: bytes, keccak_randomness: Optional[FQ] = None) -> KeccakEntry:
+        return self.extend([input], keccak_randomness)[0]
+
+    def extend(
+        self, inputs: Iterable[bytes], keccak_randomness: Optional[FQ] = None
+    ) -> List[KeccakEntry]:
+        """Add all the inputs, RLC encoding the new ones in a single batch"""
+        if self.keccak_randomness is None:
+            self.keccak_randomness = keccak_randomness
+        randomness = self.keccak_randomness if keccak_randomness is None else keccak_randomness
+        inputs = [bytes(input) for input in inputs]
+        if not inputs:
+            return []
+        assert randomness is not None, "Missing keccak randomness"
+        new_inputs = [
+            input for input in dict.fromkeys(inputs) if (input, randomness) not in self.entries
+        ]
+        if new_inputs:
+            input_rlcs = batch_linear_combine_bytes(
+                [input[::-1] for input in new_inputs], randomness
+            )
+            for input, input_rlc in zip(new_inputs, input_rlcs):
+                if input not in self.digests:
+                    self.digests[input] = keccak256(input)
+                entry = KeccakEntry(input_rlc, FQ(len(input)), self.digests[input])
+                self.entries[(input, randomness)] = entry
+                self.outputs.setdefault((input_rlc, entry.input_len), set()).add(Word(entry.digest))
+        return [self.entries[(input, randomness)] for input in inputs]
+
+    @property
+    def table(self) -> Set[Tuple[FQ, FQ, FQ, Word]]:
+        table = set(
+            (FQ.one(), input_rlc, input_len, Word(digest))
+            for input_rlc, input_len, digest in self.entries.values()
+        )
+        table.add((FQ.zero(), FQ.zero(), FQ.zero(), Word(0)))
+        return table
+
+    def lookup(self, is_enabled: FQ, input_rlc: FQ, input_len: FQ, output: Word, assert_msg: str):
+        if is_enabled == FQ.one():
+            found = output in self.outputs.get((input_rlc, input_len), ())
+        else:
+            found = (is_enabled, input_rlc, input_len, output) == (
+                FQ.zero(),
+                FQ.zero(),
+                FQ.zero(),
+                Word(0),
+            )
+        assert found, (
+            f"{assert_msg}: {(is_enabled, input_rlc, input_len, output)} "
+            + "not found in the lookup table"
+        )
@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 import pytest
 
 from zkevm_specs.evm_circuit import (
@@ -12,9 +14,10 @@ from zkevm_specs.evm_circuit import (
     Tables,
     verify_steps,
 )
-from zkevm_specs.exp_circuit import verify_exp_circuit
+from zkevm_specs.exp_circuit import ExpCircuitUnsatFailure, verify_exp_circuit, verify_exp_table
 from zkevm_specs.util import (
     byte_size,
+    FQ,
     Word,
 )
 
@@ -106,3 +109,49 @@ def test_exp(base_int: int, exponent_int: int):
             ),
         ],
     )
+
+
+def test_exp_circuit_repeated_events():
+    base, exponent = 0xCAFE, 0xBEEF
+    exp_circuit = ExpCircuit().add_event(base, exponent, 1).add_event(base, exponent, 9)
+    steps = len(exp_circuit.rows) // 2
+    first, second = exp_circuit.rows[:steps], exp_circuit.rows[steps:]
+    assert all(row.identifier == 1 for row in first)
+    assert all(row.identifier == 9 for row in second)
+    assert [row.exponentiation for row in first] == [row.exponentiation for row in second]
+    assert first[0].exponentiation == Word(pow(base, exponent, POW2))
+
+    exp_circuit.fill_dummy_events()
+    assert len(exp_circuit.rows) == exp_circuit.max_exp_steps * ExpCircuit.OFFSET_INCREMENT
+    assert exp_circuit.rows[-1].is_step == 0
+    verify_exp_circuit(exp_circuit)
+
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_verify_exp_circuit_rejects_bad_table(batch: bool):
+    exp_circuit = ExpCircuit().add_event(3, 101, 1).fill_dummy_events()
+    verify_exp_circuit(exp_circuit, batch=batch)
+    exp_circuit.steps[2] = replace(exp_circuit.steps[2], d=Word(7), exponentiation=Word(7))
+    # both paths fail with an AssertionError
+    with pytest.raises(AssertionError):
+        verify_exp_circuit(exp_circuit, batch=batch)
+
+
+def test_verify_exp_table_failing_rows():
+    exp_circuit = ExpCircuit().add_event(3, 101, 1).fill_dummy_events()
+    verify_exp_circuit(exp_circuit, batch=False)
+    table = list(exp_circuit.table())
+    verify_exp_table(table)
+
+    # a different exponentiation breaks the gate of its own row, and the
+    # multiplication with the next row
+    table[2] = replace(table[2], d=Word(7), exponentiation=Word(7))
+    # a new trace can't start before the last step
+    table[4] = replace(table[4], identifier=FQ(2))
+    with pytest.raises(ExpCircuitUnsatFailure) as excinfo:
+        verify_exp_table(table)
+    assert excinfo.value.failures == {
+        "a is the next d": [1],
+        "identifier is the same across rows": [3, 4],
+        "a * b + c == d carries": [2],
+    }
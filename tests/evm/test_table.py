@@ -0,0 +1,263 @@
+from dataclasses import replace
+from typing import List
+
+import pytest
+
+from zkevm_specs.evm_circuit import (
+    RW,
+    BatchLookup,
+    BytecodeFieldTag,
+    BytecodeTableRow,
+    CallContextFieldTag,
+    CopyCircuit,
+    CopyDataTypeTag,
+    FixedTableTag,
+    LookupAmbiguousFailure,
+    LookupUnsatFailure,
+    RWDictionary,
+    RWTable,
+    RWTableRow,
+    Tables,
+    Target,
+)
+from zkevm_specs.copy_circuit import verify_copy_table
+from zkevm_specs.util import FQ, Word, WordOrValue
+
+CALL_ID = 1
+
+
+def rw_tables() -> Tables:
+    rws = list(
+        RWDictionary(1)
+        .stack_write(CALL_ID, 1023, Word(0xFF))
+        .stack_read(CALL_ID, 1023, Word(0xFF))
+        .memory_write(CALL_ID, 0, 0xAB)
+        .rws
+    )
+    # a second write on the same rw_counter makes lookups that don't pin down
+    # the target ambiguous
+    rws.append(RWDictionary(3).memory_write(CALL_ID + 1, 0, 0xCD).rws[0])
+    return Tables(block_table=set(), tx_table=set(), bytecode_table=set(), rw_table=set(rws))
+
+
+def test_rw_lookup_indexed():
+    tables = rw_tables()
+
+    row = tables.rw_lookup(FQ(1), FQ(RW.Write), FQ(Target.Stack), FQ(CALL_ID), FQ(1023))
+    assert row.value == Word(0xFF)
+    # same query shape with a different key hits another bucket of the index
+    row = tables.rw_lookup(FQ(2), FQ(RW.Read), FQ(Target.Stack), FQ(CALL_ID), FQ(1023))
+    assert row.rw == RW.Read
+    # word values are keyed by both their lo and hi parts
+    row = tables.rw_lookup(FQ(2), FQ(RW.Read), FQ(Target.Stack), value=Word(0xFF))
+    assert row.rw_counter == FQ(2)
+    row = tables.rw_lookup(FQ(3), FQ(RW.Write), FQ(Target.Memory), FQ(CALL_ID + 1))
+    assert row.value.value() == FQ(0xCD)
+
+
+def test_rw_lookup_failures():
+    tables = rw_tables()
+
+    with pytest.raises(LookupUnsatFailure):
+        tables.rw_lookup(FQ(1), FQ(RW.Read), FQ(Target.Stack))
+    with pytest.raises(LookupUnsatFailure):
+        tables.rw_lookup(FQ(2), FQ(RW.Read), FQ(Target.Stack), value=Word(0xFF << 128))
+    with pytest.raises(LookupAmbiguousFailure):
+        tables.rw_lookup(FQ(3), FQ(RW.Write), FQ(Target.Memory))
+
+
+def test_rw_lookup_index_follows_table_updates():
+    tables = rw_tables()
+
+    with pytest.raises(LookupUnsatFailure):
+        tables.rw_lookup(FQ(4), FQ(RW.Write), FQ(Target.Stack))
+    tables.rw_table.extend(RWDictionary(4).stack_write(CALL_ID, 1022, Word(1)).rws)
+    tables.rw_lookup(FQ(4), FQ(RW.Write), FQ(Target.Stack))
+
+
+def test_lookup_index_follows_table_changes():
+    hash = Word(1)
+    rows = {BytecodeTableRow(hash, FQ(BytecodeFieldTag.Byte), FQ(0), FQ(1), FQ(0xAB))}
+    tables = Tables(block_table=set(), tx_table=set(), bytecode_table=rows, rw_table=set())
+
+    def lookup_value():
+        return tables.bytecode_lookup(hash, FQ(BytecodeFieldTag.Byte), FQ(0)).value
+
+    assert lookup_value() == FQ(0xAB)
+    # the table is a copy of the rows it was given
+    rows.clear()
+    assert lookup_value() == FQ(0xAB)
+    with pytest.raises(AttributeError):
+        tables.bytecode_table.clear()  # type: ignore
+    # a row replaced in a mutable table, without changing its size
+    rows = {BytecodeTableRow(hash, FQ(BytecodeFieldTag.Byte), FQ(0), FQ(1), FQ(0xCD))}
+    tables.bytecode_table = rows  # type: ignore
+    assert lookup_value() == FQ(0xCD)
+    rows.pop()
+    rows.add(BytecodeTableRow(hash, FQ(BytecodeFieldTag.Byte), FQ(0), FQ(1), FQ(0xEF)))
+    assert lookup_value() == FQ(0xEF)
+
+
+def test_rw_table_columns():
+    rw_dictionary = (
+        RWDictionary(1)
+        .stack_write(CALL_ID, 1023, Word(2**255))
+        .memory_read(CALL_ID, 0, 0x12)
+        .call_context_read(CALL_ID, CallContextFieldTag.CallerId, FQ(2**159))
+    )
+    table = rw_dictionary.table
+    assert len(table) == 3
+    assert table.columns["rw_counter"].typecode == "Q"
+    assert list(table.columns["value_is_word"]) == [1, 0, 0]
+
+    rows = list(table)
+    assert RWTable(rows).columns == table.columns
+    assert rows[0].value == Word(2**255) and rows[0].value.is_word
+    assert rows[1].value.value() == FQ(0x12)
+
+    # a value that doesn't fit a narrow column moves it to a list
+    table.append_row(RWTableRow(FQ(4), FQ(RW.Read), FQ(Target.Stack), id=FQ(2**64)))
+    assert table.columns["id"][-1] == 2**64
+    assert table[3].id == FQ(2**64)
+
+    # tables can use the columns as they are
+    tables = Tables(block_table=set(), tx_table=set(), bytecode_table=set(), rw_table=table)
+    assert tables.rw_table is table
+    row = tables.rw_lookup(FQ(3), FQ(RW.Read), FQ(Target.CallContext), FQ(CALL_ID))
+    assert row == rows[2]
+
+
+def test_rw_dictionary_rws():
+    rw_dictionary = RWDictionary(1).stack_write(CALL_ID, 1023, Word(7))
+    rws = rw_dictionary.rws
+    # the rows are only rebuilt after the table grows, and can't be modified
+    assert rw_dictionary.rws is rws and rws == tuple(rw_dictionary.table)
+    with pytest.raises(AttributeError):
+        rws.append(rws[0])  # type: ignore
+    rw_dictionary.stack_read(CALL_ID, 1023, Word(7))
+    assert len(rw_dictionary.rws) == 2 and rw_dictionary.rws[0] == rws[0]
+    rw_dictionary.table.append_row(RWTableRow(FQ(3), FQ(RW.Read), FQ(Target.Start)))
+    assert rw_dictionary.rws == tuple(rw_dictionary.table)
+
+
+def test_rw_table_rw_counter_index():
+    table = (
+        RWDictionary(1).stack_write(CALL_ID, 1023, Word(7)).stack_read(CALL_ID, 1023, Word(7)).table
+    )
+    # padding rows sharing rw_counters with other rows, and a far away rw_counter
+    table.append_row(RWTableRow(FQ(1), FQ(RW.Read), FQ(Target.Start)))
+    table.append_row(RWTableRow(FQ(2**40), FQ(RW.Read), FQ(Target.Start)))
+    assert table.rw_counter_positions(1) == [0, 2]
+    assert table.rw_counter_positions(2**40) == [3]
+    assert table.rw_counter_positions(5) == []
+
+    tables = Tables(block_table=set(), tx_table=set(), bytecode_table=set(), rw_table=table)
+    row = tables.rw_lookup(FQ(1), FQ(RW.Write), FQ(Target.Stack), value=WordOrValue(Word(7)))
+    assert row == table[0]
+    assert tables.rw_lookup(FQ(1), FQ(RW.Read), FQ(Target.Start)) == table[2]
+    assert tables.rw_lookup(FQ(2**40), FQ(RW.Read), FQ(Target.Start)) == table[3]
+    with pytest.raises(LookupUnsatFailure):
+        tables.rw_lookup(FQ(1), FQ(RW.Write), FQ(Target.Stack), value=WordOrValue(Word(8)))
+
+    # rows appended after the first lookup are found without rebuilding the index
+    table.append_row(RWTableRow(FQ(3), FQ(RW.Read), FQ(Target.Start)))
+    assert tables.rw_lookup(FQ(3), FQ(RW.Read), FQ(Target.Start)) == table[4]
+    table.append_row(RWTableRow(FQ(3), FQ(RW.Read), FQ(Target.Start), id=FQ(1)))
+    with pytest.raises(LookupAmbiguousFailure):
+        tables.rw_lookup(FQ(3), FQ(RW.Read), FQ(Target.Start))
+
+
+def test_batch_lookup():
+    table = RWDictionary(1).memory_write(CALL_ID, 0, 0xAB).memory_write(CALL_ID, 1, 0xCD).table
+    lookups = BatchLookup(RWTableRow, ("rw_counter", "rw", "key0", "address"))
+    for position, (rw_counter, address) in enumerate([(1, 0), (2, 1)]):
+        lookups.add(position, FQ(rw_counter), FQ(RW.Write), FQ(Target.Memory), FQ(address))
+    assert lookups.verify(table) == {0: table[0], 1: table[1]}
+    assert lookups.verify(list(table)) == {0: table[0], 1: table[1]}
+
+    lookups.add(7, FQ(2), FQ(RW.Write), FQ(Target.Memory), FQ(0))
+    with pytest.raises(LookupUnsatFailure) as failure:
+        lookups.verify(table)
+    assert list(failure.value.inputs) == [7]
+
+    # a query matching several rows is ambiguous
+    lookups = BatchLookup(RWTableRow, ("rw", "key0"))
+    lookups.add(3, FQ(RW.Write), FQ(Target.Memory))
+    with pytest.raises(LookupAmbiguousFailure) as ambiguous:
+        lookups.verify(table)
+    assert list(ambiguous.value.inputs) == [3]
+
+
+def test_copy_circuit_rows():
+    r = FQ(7)
+    rws = RWDictionary(1)
+    # 3 bytes copied from memory, the last one past src_addr_end
+    circuit = CopyCircuit().copy(
+        r, rws, 1, CopyDataTypeTag.Memory, 2, CopyDataTypeTag.Memory, 0, 2, 10, 3, {0: 5, 1: 6}
+    )
+    circuit.copy(
+        r, rws, 1, CopyDataTypeTag.TxCalldata, 2, CopyDataTypeTag.RlcAcc, 0, 2, 0, 2, {0: 5, 1: 6}
+    )
+    rows = circuit.rows
+    assert len(rows) == 10 and len(rws.rws) == 5
+    assert [row.rw_counter.n for row in rows[:6]] == [1, 2, 3, 4, 5, 5]
+    assert [row.rwc_inc_left.n for row in rows[:6]] == [5, 4, 3, 2, 1, 1]
+    assert [row.value.n for row in rows[:6]] == [5, 5, 6, 6, 0, 0]
+    assert [row.is_pad.n for row in rows[:6]] == [0, 0, 0, 0, 1, 0]
+    assert [row.value.n for row in rows[6:]] == [5, 5, 6, 5 * 7 + 6]
+    assert all(row.rlc_acc == FQ(5 * 7 + 6) for row in rows[6:])
+    assert rows[-1] == rows[9] and rows[-1].is_last == FQ(1)
+
+    pad_row = rows[0]
+    table = CopyCircuit([pad_row]).table()
+    assert len(table) == 1 and table[0] == pad_row
+    assert rows + table == list(rows) + [pad_row]
+
+
+@pytest.mark.parametrize("tag", list(FixedTableTag))
+def test_fixed_table_membership(tag: FixedTableTag):
+    tables = rw_tables()
+    rows = tag.table_assignments()
+    for row in rows:
+        assert tables.fixed_lookup(row.tag, row.value0, row.value1, row.value2) == row
+
+    values = set((row.value0.n, row.value1.n, row.value2.n) for row in rows)
+    for row in rows[:64]:
+        for delta in [(1, 0, 0), (0, 1, 0), (0, 0, 1)]:
+            shifted = (row.value0.n + delta[0], row.value1.n + delta[1], row.value2.n + delta[2])
+            if shifted not in values:
+                with pytest.raises(LookupUnsatFailure):
+                    tables.fixed_lookup(FQ(tag), *[FQ(value) for value in shifted])
+
+
+@pytest.mark.parametrize("batch_lookups", [True, False])
+def test_verify_copy_table(batch_lookups: bool):
+    r = FQ(7)
+    rws = RWDictionary(1).memory_write(CALL_ID, 0, 5).memory_write(CALL_ID, 1, 6)
+    memory = {0: 5, 1: 6}
+    circuit = CopyCircuit().copy(
+        r, rws, CALL_ID, CopyDataTypeTag.Memory, 2, CopyDataTypeTag.Memory, 0, 2, 10, 2, memory
+    )
+    rows = list(rws.rws)
+
+    def verify(rw_table: List[RWTableRow]):
+        tables = Tables(block_table=set(), tx_table=set(), bytecode_table=set(), rw_table=rw_table)
+        verify_copy_table(circuit, tables, r, batch_lookups)
+
+    verify(rows)
+
+    # the read of memory[1] holds another value
+    tampered = rows[:]
+    tampered[4] = replace(rows[4], value=WordOrValue(FQ(7)))
+    with pytest.raises(AssertionError):
+        verify(tampered)
+    # the read of memory[1] holds a word
+    tampered[4] = replace(rows[4], value=WordOrValue(Word(6)))
+    with pytest.raises(AssertionError):
+        verify(tampered)
+    # the read of memory[1] is missing
+    with pytest.raises(LookupUnsatFailure):
+        verify(rows[:4] + rows[5:])
+    # the read of memory[1] is there twice
+    with pytest.raises(LookupAmbiguousFailure):
+        verify(rows + [replace(rows[4], value=WordOrValue(FQ(7)))])
@@ -0,0 +1,129 @@
+import pytest
+
+from zkevm_specs.evm_circuit import (
+    Block,
+    Bytecode,
+    ExecutionState,
+    RWDictionary,
+    StepProfiler,
+    StepState,
+    Tables,
+    verify_steps,
+)
+from zkevm_specs.util import FQ, FQAllocationCounter, Word
+
+N_PUSHES = 24
+
+
+def push_block(corrupted=()):
+    bytecode = Bytecode()
+    rws = RWDictionary(1)
+    for i in range(N_PUSHES):
+        bytecode.push(bytes([i + 1]), n_bytes=1)
+        rws.stack_write(1, 1023 - i, Word(i + 1))
+    bytecode_hash = Word(bytecode.hash())
+
+    tables = Tables(
+        block_table=set(Block().table_assignments()),
+        tx_table=set(),
+        bytecode_table=set(bytecode.table_assignments()),
+        rw_table=set(rws.rws),
+    )
+    steps = [
+        StepState(
+            execution_state=ExecutionState.PUSH,
+            rw_counter=1 + i,
+            call_id=1,
+            is_root=True,
+            code_hash=bytecode_hash,
+            program_counter=2 * i,
+            stack_pointer=1024 - i,
+            gas_left=3 * (N_PUSHES - i) + (1 if i in corrupted else 0),
+        )
+        for i in range(N_PUSHES)
+    ]
+    steps.append(
+        StepState(
+            execution_state=ExecutionState.STOP,
+            rw_counter=1 + N_PUSHES,
+            call_id=1,
+            is_root=True,
+            code_hash=bytecode_hash,
+            program_counter=2 * N_PUSHES,
+            stack_pointer=1024 - N_PUSHES,
+            gas_left=0,
+        )
+    )
+    return tables, steps
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_verify_steps_workers(workers: int):
+    tables, steps = push_block()
+    verify_steps(tables, steps, workers=workers)
+
+    tables, steps = push_block(corrupted=[9])
+    verify_steps(tables, steps, success=False, workers=workers)
+
+
+def test_verify_steps_parallel_reports_first_failure():
+    # steps 8 and 9 both fail (gas_left of step 9 is off), steps 17 and 18 too
+    tables, steps = push_block(corrupted=[9, 18])
+    with pytest.raises(AssertionError) as sequential:
+        verify_steps(tables, steps)
+    with pytest.raises(AssertionError) as parallel:
+        verify_steps(tables, steps, workers=4)
+    assert str(parallel.value) == str(sequential.value)
+
+
+def test_step_profiler():
+    profiles = []
+    profiler = StepProfiler(callback=profiles.append)
+    tables, steps = push_block()
+    verify_steps(tables, steps, profiler=profiler, workers=4)
+
+    assert len(profiles) == N_PUSHES and all(profile.success for profile in profiles)
+    assert tables.lookup_counts is None
+    stats = profiler.stats[ExecutionState.PUSH]
+    assert stats.steps == N_PUSHES
+    assert stats.lookups["RWTableRow"] == N_PUSHES
+    assert stats.lookups["BytecodeTableRow"] > N_PUSHES
+    assert stats.constraints > 0 and stats.fq_allocations > 0 and stats.time > 0
+    assert profiler.to_json()["PUSH"]["steps"] == N_PUSHES
+    assert "PUSH" in profiler.report()
+
+    tables, steps = push_block(corrupted=[9])
+    profiler = StepProfiler()
+    verify_steps(tables, steps, success=False, profiler=profiler)
+    assert profiler.stats[ExecutionState.PUSH].steps == 9
+
+
+def test_fq_allocation_counter():
+    a = FQ(3)
+    with FQAllocationCounter() as counter:
+        b = a * a + FQ(1)
+        with FQAllocationCounter() as inner:
+            -b
+    assert b == FQ(10)
+    assert counter.count == 4 and inner.count == 1
+    FQ(1) + FQ(2)
+    assert counter.count == 4
+
+
+def test_fq_allocation_counters_overlap():
+    init = FQ.__init__
+    first, second = FQAllocationCounter(), FQAllocationCounter()
+    first.__enter__()
+    FQ(1)
+    second.__enter__()
+    FQ(2)
+    # closed out of order
+    first.__exit__(None, None, None)
+    FQ(3)
+    assert first.count == 2 and second.count == 2
+    second.__exit__(None, None, None)
+    assert first.count == 2 and second.count == 2
+    # the constructors are restored once both are closed
+    assert FQ.__init__ is init
+    FQ(4)
+    assert second.count == 2
@@ -0,0 +1,85 @@
+import pytest
+
+from zkevm_specs.evm_circuit import (
+    RW,
+    BytecodeFieldTag,
+    Bytecode,
+    BytecodeTableRow,
+    KeccakCircuit,
+    KeccakTableRow,
+    LookupUnsatFailure,
+    RWDictionary,
+    RWTableRow,
+    Tables,
+    Target,
+    WitnessTable,
+    write_witness,
+)
+from zkevm_specs.util import FQ, Word
+
+
+def write(path, table_cls, rows):
+    with open(path, "wb") as file:
+        assert write_witness(file, table_cls, rows) == len(rows)
+    return WitnessTable(str(path))
+
+
+def test_witness_round_trip(tmp_path):
+    rws = (
+        RWDictionary(1)
+        .stack_write(1, 1023, Word(2**255 + 1))
+        .memory_read(1, 0x40, 0xAB)
+        .tx_refund_write(1, 200, 100)
+        .rws
+    )
+    bytecode = Bytecode().push1(0x80).stop()
+    keccak = KeccakCircuit().add(b"\x01\x02", FQ(7)).rows
+
+    with write(tmp_path / "rw", RWTableRow, rws) as rw_table:
+        assert rw_table.table_cls is RWTableRow
+        assert tuple(rw_table) == rws
+        assert rw_table[-1] == rws[-1]
+        assert rw_table[1].value.value() == FQ(0xAB) and not rw_table[1].value.is_word
+    with write(
+        tmp_path / "bytecode", BytecodeTableRow, list(bytecode.table_assignments())
+    ) as table:
+        assert set(table) == set(bytecode.table_assignments())
+    with write(tmp_path / "keccak", KeccakTableRow, keccak) as table:
+        assert list(table) == keccak
+
+
+def test_witness_tables_lookup(tmp_path):
+    rws = RWDictionary(1).stack_write(1, 1023, Word(5)).stack_read(1, 1023, Word(5)).rws
+    bytecode = Bytecode().push1(0x80).stop()
+    rw_table = write(tmp_path / "rw", RWTableRow, rws)
+    bytecode_table = write(
+        tmp_path / "bytecode", BytecodeTableRow, list(bytecode.table_assignments())
+    )
+
+    tables = Tables(
+        block_table=set(),
+        tx_table=set(),
+        bytecode_table=bytecode_table,
+        rw_table=rw_table,
+    )
+    assert tables.rw_table is rw_table
+    row = tables.rw_lookup(FQ(2), FQ(RW.Read), FQ(Target.Stack), FQ(1), FQ(1023))
+    assert row == rws[1]
+    with pytest.raises(LookupUnsatFailure):
+        tables.rw_lookup(FQ(3), FQ(RW.Read), FQ(Target.Stack))
+
+    row = tables.bytecode_lookup(Word(bytecode.hash()), FQ(BytecodeFieldTag.Byte), FQ(1))
+    assert row.value == FQ(0x80)
+
+
+def test_witness_rejects_bad_files(tmp_path):
+    path = tmp_path / "bad"
+    path.write_bytes(b"\x00" * 128)
+    with pytest.raises(ValueError):
+        WitnessTable(str(path))
+
+    with open(path, "wb") as file:
+        write_witness(file, RWTableRow, RWDictionary(1).stack_write(1, 1023, Word(5)).rws)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        WitnessTable(str(path))
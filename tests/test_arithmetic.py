@@ -0,0 +1,79 @@
+import pickle
+from random import randrange
+
+import pytest
+from py_ecc import bn128
+
+from zkevm_specs.util import RLC, FQ, batch_inv, batch_linear_combine_bytes, linear_combine_bytes
+
+VALUES = [0, 1, 2, 255, 2**128, FQ.field_modulus - 1, -1, -(2**200), 2**300]
+
+
+@pytest.mark.parametrize("a", VALUES)
+@pytest.mark.parametrize("b", VALUES)
+def test_fq_matches_py_ecc(a: int, b: int):
+    x, y = FQ(a), FQ(b)
+    ex, ey = bn128.FQ(a), bn128.FQ(b)
+
+    assert (x + y).n == (ex + ey).n
+    assert (x - y).n == (ex - ey).n
+    assert (x * y).n == (ex * ey).n
+    assert (x / y).n == (ex / ey).n
+    assert (x + b).n == (ex + b).n
+    assert (b - x).n == (b - ex).n
+    assert (b * x).n == (b * ex).n
+    assert (b / x).n == (b / ex).n
+    assert (-x).n == (-ex).n
+    assert (x == y) == (ex == ey)
+    assert (x == b) == (ex == b)
+    assert (x != b) == (ex != b)
+
+
+def test_fq_api():
+    x = FQ(randrange(FQ.field_modulus))
+
+    assert x.expr() is x
+    assert x * x.inv() == FQ.one()
+    assert FQ.zero().inv() == FQ.zero()
+    assert x**5 == x * x * x * x * x
+    assert FQ(x) == x and hash(FQ(x)) == hash(x.n)
+    assert int(x) == x.n
+    assert pickle.loads(pickle.dumps(x)) == x
+    assert not hasattr(x, "__dict__")
+    with pytest.raises(TypeError):
+        FQ("1")
+    with pytest.raises(TypeError):
+        x == "1"
+
+
+def test_fq_expression_operands():
+    x = FQ(randrange(FQ.field_modulus))
+    y = RLC(randrange(1, 2**256), FQ(randrange(FQ.field_modulus)))
+    ey = y.expr()
+
+    assert FQ(y) == ey
+    assert x + y == x + ey and x - y == x - ey and y - x == ey - x
+    assert x * y == x * ey and x / y == x / ey and y / x == ey / x
+    assert (x == y) == (x == ey)
+
+
+def test_batch_inv():
+    values = [randrange(FQ.field_modulus) for _ in range(16)] + [0, 1, FQ.field_modulus - 1]
+    assert batch_inv(values) == [FQ(value).inv().n for value in values]
+    assert batch_inv([]) == [] and batch_inv([0, 0]) == [0, 0]
+
+
+@pytest.mark.parametrize("n_bytes", [0, 1, 31, 32, 33, 100])
+def test_linear_combine_bytes(n_bytes: int):
+    data = bytes(randrange(256) for _ in range(n_bytes))
+    base = FQ(randrange(FQ.field_modulus))
+    expected = sum((FQ(byte) * base**i for i, byte in enumerate(data)), FQ(0))
+    assert linear_combine_bytes(data, base) == expected
+    assert linear_combine_bytes([FQ(byte) for byte in data], base) == expected
+    assert batch_linear_combine_bytes([data, data[::-1]], base) == [
+        expected,
+        linear_combine_bytes(list(reversed(data)), base),
+    ]
+    with pytest.raises(AssertionError):
+        linear_combine_bytes(list(data) + [256], base)
+    assert linear_combine_bytes([256, -1], 2, range_check=False) == FQ(254)
@@ -1,8 +1,21 @@
+import os
 from copy import deepcopy
+from dataclasses import replace
+
+import pytest
 
 from zkevm_specs.bytecode_circuit import *
-from zkevm_specs.evm_circuit import Opcode, Bytecode, BytecodeFieldTag, BytecodeTableRow, is_push
-from zkevm_specs.util import U256, keccak256
+from zkevm_specs.evm_circuit import (
+    Opcode,
+    Account,
+    Bytecode,
+    BytecodeFieldTag,
+    BytecodeTableRow,
+    FrozenBytecode,
+    code_hash,
+    is_push,
+)
+from zkevm_specs.util import EMPTY_CODE_HASH, U256, keccak256
 from common import rand_fq
 
 
@@ -21,18 +34,10 @@ def verify_rows(bytecodes: Sequence[UnrolledBytecode], rows: Sequence[Row], succ
     push_table = assign_push_table()
     keccak_table = assign_keccak_table(list(map(lambda v: v.bytes, bytecodes)), randomness_keccak)
     exception = None
-    for idx, row in enumerate(rows):
-        try:
-            next_row = rows[(idx + 1) % len(rows)]
-            check_bytecode_row(row, next_row, push_table, keccak_table, randomness_keccak)
-            ok = True
-        except AssertionError as e:
-            if success:
-                print(idx)
-                print(row)
-                print(next_row)
-            exception = e
-            break
+    try:
+        verify_bytecode_circuit(rows, push_table, keccak_table, randomness_keccak)
+    except AssertionError as e:
+        exception = e
     if success:
         if exception:
             raise exception
@@ -305,3 +310,165 @@ def test_last_row():
         push_data_size=FQ(0),
     )
     verify_rows([unrolled], rows, False)
+
+
+def test_bytecode_padding_run():
+    unrolled = unroll(bytes([Opcode.PUSH1, 7, Opcode.STOP]), randomness_keccak)
+    rows = assign_bytecode_circuit(k, [unrolled], randomness_keccak)
+    assert len(rows) == 2**k
+    assert len(rows.rows) == len(unrolled.rows)
+    assert rows.n_padding == 2**k - len(unrolled.rows)
+    assert rows[len(unrolled.rows)] == padding_row(False, False)
+    assert rows[-1] == padding_row(False, True)
+    verify_rows([unrolled], rows, True)
+
+    # a padding row in the middle of the run is checked like the others
+    rows[100] = replace(rows[100], length=FQ(1))
+    assert len(rows) == 2**k
+    assert len(rows.rows) == 101
+    assert rows[101] == padding_row(False, False)
+    verify_rows([unrolled], rows, False)
+    verify_rows([unrolled], list(rows), False)
+
+    # a circuit with only padding rows
+    rows = assign_bytecode_circuit(k, [], randomness_keccak)
+    assert rows[0] == padding_row(True, False)
+    verify_rows([], rows, True)
+
+
+def test_bytecode_padding_row_mutation():
+    rows = assign_bytecode_circuit(4, [], randomness_keccak)
+    # padding rows aren't shared, between positions nor circuits
+    rows[5].length = FQ(9)
+    assert rows[5].length == 0
+    assert rows[6].length == 0
+    assert assign_bytecode_circuit(6, [], randomness_keccak)[3].length == 0
+    verify_rows([], rows, True)
+
+    # assigning a changed row changes the circuit
+    row = rows[5]
+    row.length = FQ(9)
+    rows[5] = row
+    assert rows[5].length == 9
+    assert rows[6].length == 0
+    verify_rows([], rows, False)
+
+
+def test_bytecode_hash_cache():
+    def code_hash(bytecode: Bytecode) -> U256:
+        return U256(int.from_bytes(keccak256(bytes(bytecode.code)), "big"))
+
+    bytecode = Bytecode()
+    assert bytecode.hash() == EMPTY_CODE_HASH
+    # builder methods
+    bytecode.push(1, n_bytes=1).add(2, 3)
+    assert bytecode.hash() == code_hash(bytecode)
+    bytecode.dup1()
+    assert bytecode.hash() == code_hash(bytecode)
+    # direct mutations of the code
+    bytecode.code[1] = 7
+    assert bytecode.hash() == code_hash(bytecode)
+    bytecode.code.append(Opcode.STOP)
+    bytecode.is_code.append(True)
+    assert bytecode.hash() == code_hash(bytecode)
+    bytecode.code = bytearray([Opcode.STOP])
+    assert bytecode.hash() == code_hash(bytecode)
+
+    frozen = Bytecode().push(0xCAFE).stop().freeze()
+    assert frozen.hash() == code_hash(frozen)
+    assert FrozenBytecode(bytes(frozen.code)).is_code == tuple(frozen.is_code)
+    assert Account(code=frozen).code_hash() == Account(code=frozen).code_hash()
+    assert list(frozen.table_assignments()) == list(
+        Bytecode().push(0xCAFE).stop().table_assignments()
+    )
+    with pytest.raises(TypeError):
+        frozen.stop()
+    with pytest.raises(TypeError):
+        frozen.push(1)
+
+
+def test_bytecode_store(tmp_path):
+    codes = [
+        bytes([]),
+        bytes([Opcode.PUSH2, 1, 2, Opcode.ADD, Opcode.PUSH32]),
+        bytes([Opcode.ADD, Opcode.PUSH1, Opcode.PUSH1, Opcode.SUB]),
+    ]
+    bytecodes = [unroll(code, randomness_keccak) for code in codes]
+    store = BytecodeStore(str(tmp_path), max_size=2)
+    assert [store.unrolled(code) for code in codes] == bytecodes
+    assert store.bytecode_table(codes) == set(
+        row for bytecode in bytecodes for row in bytecode.rows
+    )
+
+    rows = assign_bytecode_circuit(k, bytecodes, randomness_keccak)
+    stored_rows = assign_bytecode_circuit(k, bytecodes, randomness_keccak, store)
+    assert stored_rows.rows == rows.rows
+    verify_rows(bytecodes, stored_rows, True)
+    # only the last 2 bytecodes are kept in memory, so reading the 3 of them
+    # in turn always misses
+    assert len(store) == 2
+    assert (store.hits, store.misses) == (0, 9)
+    store.get(codes[-1])
+    assert (store.hits, store.misses) == (1, 9)
+
+    # the rows are read back from the files by another store
+    store = BytecodeStore(str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 6
+    stored_rows = assign_bytecode_circuit(k, bytecodes, randomness_keccak, store)
+    assert stored_rows.rows == rows.rows
+    assert len(list(tmp_path.iterdir())) == 6
+
+
+def test_bytecode_store_stale_files(tmp_path):
+    code, other = bytes([Opcode.PUSH1, 1, Opcode.STOP]), bytes([Opcode.ADD, Opcode.SUB, 7])
+    store = BytecodeStore(str(tmp_path))
+    store.get(other).value_rlcs(randomness_keccak)
+    store.get(code)
+    # files of another code left under the name of this one
+    for file in tmp_path.iterdir():
+        name = file.name.replace(f"{code_hash(other):064x}", f"{code_hash(code):064x}")
+        if name != file.name:
+            os.replace(file, tmp_path / name)
+
+    store = BytecodeStore(str(tmp_path))
+    assert store.unrolled(code) == unroll(code, randomness_keccak)
+    rlcs = [
+        row.value_rlc for row in assign_bytecode_circuit(k, [unroll(code, 0)], randomness_keccak)
+    ]
+    assert store.get(code).value_rlcs(randomness_keccak) == rlcs[1:4]
+    # and the files were rewritten
+    store = BytecodeStore(str(tmp_path))
+    assert bytes(store.get(code).code) == code
+    rlc_path = f"{store.get(code).path}.{randomness_keccak.n:064x}.rlc"
+    assert store.get(code)._read_value_rlcs(rlc_path, randomness_keccak) == rlcs[1:4]
+
+
+def test_bytecode_store_closes_evicted(tmp_path):
+    store = BytecodeStore(str(tmp_path), max_size=1)
+    first = store.get(bytes([Opcode.STOP]))
+    first_rows = first.table_rows()
+    store.get(bytes([Opcode.ADD]))
+    assert first.buffer.closed
+    with pytest.raises(ValueError):
+        bytes(first.code)
+    assert first.table_rows() == first_rows
+    assert not store.get(bytes([Opcode.ADD])).buffer.closed
+
+
+def test_bytecode_store_mismatched_rows(tmp_path):
+    store = BytecodeStore(str(tmp_path))
+    unrolled = unroll(bytes([8, 2, 3, 8, 9, 7, 128]), randomness_keccak)
+    assign_bytecode_circuit(k, [unrolled], randomness_keccak, store)
+
+    # the rows hold another byte
+    invalid = deepcopy(unrolled)
+    row = unrolled.rows[3]
+    invalid.rows[3] = BytecodeTableRow(
+        row.bytecode_hash, row.field_tag, row.index, row.is_code, FQ(6)
+    )
+    with pytest.raises(AssertionError, match="don't match its bytes"):
+        assign_bytecode_circuit(k, [invalid], randomness_keccak, store)
+    # the rows miss a byte
+    invalid = UnrolledBytecode(unrolled.bytes, unrolled.rows[:-1])
+    with pytest.raises(AssertionError, match="don't match its bytes"):
+        assign_bytecode_circuit(k, [invalid], randomness_keccak, store)
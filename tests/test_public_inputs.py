@@ -1,7 +1,12 @@
+from dataclasses import FrozenInstanceError
 from typing import Union, Callable
+import pytest
+from zkevm_specs.evm_circuit import LookupUnsatFailure
 from zkevm_specs.pi_circuit import (
+    FIXED_U16_TABLE,
     Witness,
     PublicData,
+    RawPublicInputs,
     public_data2witness,
     verify_circuit,
     Block,
@@ -129,6 +134,46 @@ def test_basic():
     verify(public_data, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi)
 
 
+def test_verify_witness_twice():
+    random.seed(0)
+
+    MAX_TXS = 2
+    MAX_CALLDATA_BYTES = 8
+
+    public_data = rand_public_data(MAX_TXS - 1, MAX_CALLDATA_BYTES)
+    witness = public_data2witness(public_data, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi)
+    raw_public_inputs = witness.raw_public_inputs
+    assert bytes(raw_public_inputs.chunk(0)) == bytes(1)
+    assert len(raw_public_inputs.data) == witness.circuit_len
+    verify(witness, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi)
+    verify(witness, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi)
+
+
+def test_witness_rows_are_frozen():
+    random.seed(0)
+
+    MAX_TXS = 2
+    MAX_CALLDATA_BYTES = 8
+
+    public_data = rand_public_data(MAX_TXS - 1, MAX_CALLDATA_BYTES)
+    witness = public_data2witness(public_data, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi)
+    # Rows are built on read, so a write to one would be lost
+    with pytest.raises(FrozenInstanceError):
+        witness.rows[0].tx_id_inv = FQ(123)
+    # The witness is changed through its columns instead
+    witness.columns.tx_id_inv[0] = 123
+    assert witness.rows[0].tx_id_inv == FQ(123)
+    verify(witness, MAX_TXS, MAX_CALLDATA_BYTES, rand_rpi, success=False)
+
+
+def test_fixed_u16_table():
+    for value in [0, 1, (1 << 16) - 1]:
+        assert FIXED_U16_TABLE.lookup(FQ(value)).value == FQ(value)
+    for value in [1 << 16, -1]:
+        with pytest.raises(LookupUnsatFailure):
+            FIXED_U16_TABLE.lookup(FQ(value))
+
+
 def override_not_success(override: Callable[[Witness], None]):
     random.seed(0)
 
@@ -188,3 +233,13 @@ def test_bad_rand_rpi_state_root_prev_pub():
         witness.public_inputs.state_root_prev = word(123)
 
     override_not_success(override)
+
+
+def test_bad_raw_public_inputs():
+    def override(witness):
+        raw_public_inputs = witness.raw_public_inputs
+        chunks = [bytes(raw_public_inputs.chunk(i)) for i in range(len(raw_public_inputs))]
+        chunks[1] = bytes(len(chunks[1]) - 1) + b"\x01"  # coinbase
+        witness.raw_public_inputs = RawPublicInputs(chunks)
+
+    override_not_success(override)
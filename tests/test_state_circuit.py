@@ -1,6 +1,8 @@
 import traceback
 from typing import Union, List
 
+import pytest
+
 from zkevm_specs.state_circuit import *
 from zkevm_specs.util import FQ
 
@@ -18,24 +20,18 @@ def verify(
     ops_or_rows: Union[List[Operation], List[Row]],
     tables: Tables,
     success: bool = True,
+    workers: int = 1,
 ):
     rows = ops_or_rows
     if isinstance(ops_or_rows[0], Operation):
         rows = assign_state_circuit(ops_or_rows)
-    ok = True
-    for idx, row in enumerate(rows):
-        row_prev = rows[(idx - 1) % len(rows)]
-        row_next = rows[(idx + 1) % len(rows)]
-        try:
-            check_state_row(row, row_prev, row_next, tables)
-        except AssertionError as e:
-            if success:
-                traceback.print_exc()
-            print(f"row[{(idx-1) % len(rows)}]: {row_prev}")
-            print(f"row[{idx}]: {row}")
-            ok = False
-            break
-    assert ok == success
+    failures = verify_state_circuit(rows, tables, workers=workers)
+    for idx, e in failures:
+        if success:
+            traceback.print_exception(type(e), e, e.__traceback__)
+        print(f"row[{(idx-1) % len(rows)}]: {rows[(idx - 1) % len(rows)]}")
+        print(f"row[{idx}]: {rows[idx]}")
+    assert (len(failures) == 0) == success
 
 
 def test_state_ok():
@@ -370,3 +366,50 @@ def test_storage_committed_value_bad():
     # fmt: on
     tables = Tables(mpt_table_from_ops(ops))
     verify(ops, tables, success=False)
+
+
+def test_verify_state_circuit_workers():
+    ops = [StartOp(rw_counter=1, rw=RW.Read, lexicographic_ordering_selector=0)]
+    ops += [
+        MemoryOp(rw_counter=i + 1, rw=RW.Write, call_id=1, mem_addr=i, value=FQ(i % 256))
+        for i in range(40)
+    ]
+    tables = Tables(mpt_table_from_ops(ops))
+    rows = assign_state_circuit(ops)
+    verify(rows, tables, workers=3)
+
+    # rw_counter is 0 but tag is not Start, in two separate chunks
+    for idx in [27, 9]:
+        rows[idx] = rows[idx]._replace(rw_counter=FQ(0))
+    for workers in [1, 3]:
+        verify(rows, tables, success=False, workers=workers)
+        assert [idx for idx, _ in verify_state_circuit(rows, tables, workers=workers)] == [9]
+        assert [
+            idx for idx, _ in verify_state_circuit(rows, tables, workers=workers, fail_fast=False)
+        ] == [9, 27]
+
+
+def test_sort_key():
+    # fmt: off
+    ops = [
+        StartOp(rw_counter=1, rw=RW.Read, lexicographic_ordering_selector=0),
+        MemoryOp(rw_counter=1, rw=RW.Write, call_id=1, mem_addr=0, value=FQ(42)),
+        MemoryOp(rw_counter=2, rw=RW.Read,  call_id=1, mem_addr=0, value=FQ(42)),
+    ]
+    # fmt: on
+    tables = Tables(mpt_table_from_ops(ops))
+    rows = assign_state_circuit(ops)
+    assert all(row.sort_key == pack_sort_key(row) for row in rows)
+    assert sort_key_limbs(rows[1].sort_key)[0] == rows[1].rw_counter
+
+    # rows without a packed key are still verified
+    verify([row._replace(sort_key=None) for row in rows], tables)
+
+    # the assigned key of the previous row isn't trusted
+    assert check_state_row(rows[2], rows[1], rows[0], tables) == rows[2].sort_key
+    with pytest.raises(AssertionError):
+        check_state_row(rows[1], rows[2]._replace(sort_key=0), rows[2], tables)
+
+    # a packed key that doesn't match its row is rejected
+    rows[1] = rows[1]._replace(sort_key=rows[2].sort_key + 1)
+    verify(rows, tables, success=False)
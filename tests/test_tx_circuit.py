@@ -1,9 +1,12 @@
 from typing import Union, List
+import pytest
 from eth_keys import keys  # type: ignore
 from eth_utils import keccak
 import rlp  # type: ignore
+from zkevm_specs import pi_circuit
 from zkevm_specs.tx_circuit import *
-from zkevm_specs.util import FQ, U64
+from zkevm_specs.evm_circuit import KeccakCircuit
+from zkevm_specs.util import FQ, RLC, U64, U160, U256
 from common import rand_fq
 
 keccak_randomness = rand_fq()
@@ -151,6 +154,127 @@ def gen_valid_witness() -> Tuple[Witness, U64, int, int]:
     return witness, U64(chain_id), MAX_TXS, MAX_CALLDATA_BYTES
 
 
+def test_workers():
+    MAX_TXS = 5
+    MAX_CALLDATA_BYTES = 16
+    chain_id = U64(1337)
+    txs = [gen_tx(i, keys.PrivateKey(bytes([i + 1]) * 32), 0x1234, chain_id) for i in range(3)]
+    witness = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r, workers=2)
+    expected = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r)
+    assert [row.value for row in witness.rows] == [row.value for row in expected.rows]
+    assert witness.keccak_table.table == expected.keccak_table.table
+    verify_circuit(witness, MAX_TXS, MAX_CALLDATA_BYTES, r, workers=2)
+
+    witness.sign_verifications[1].ecdsa_chip.signature = (
+        Secp256k1ScalarField(1),
+        Secp256k1ScalarField(2),
+    )
+    with pytest.raises(AssertionError, match="tx_index = 1: ecdsa_verify failed"):
+        verify_circuit(witness, MAX_TXS, MAX_CALLDATA_BYTES, r, workers=2)
+
+
+def test_signature_cache(tmp_path):
+    MAX_TXS = 5
+    MAX_CALLDATA_BYTES = 16
+    chain_id = U64(1337)
+    txs = [gen_tx(i, keys.PrivateKey(bytes([i + 1]) * 32), 0x1234, chain_id) for i in range(3)]
+    expected = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r)
+
+    cache = SignatureCache(max_size=2, path=str(tmp_path / "senders.json"))
+    txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r, signature_cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 3, 2)
+    # The least recently used sender was evicted
+    witness = txs2witness(txs[1:], chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r, signature_cache=cache)
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert cache.hit_rate == 0.4
+
+    cache.save()
+    cache = SignatureCache(path=str(tmp_path / "senders.json"))
+    assert len(cache) == 2
+    keccak_table = KeccakTable()
+    rows, sign_verification = tx2witness(
+        1, txs[1], chain_id, r, keccak_table, signature_cache=cache
+    )
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 0, "hit_rate": 1.0}
+    assert sign_verification.address == expected.sign_verifications[1].address
+    fixed_rows = [row for row in rows if row.tag != Tag.CallData]
+    expected_rows = expected.rows[Tag.TxSignHash : 2 * Tag.TxSignHash]
+    assert [row.value for row in fixed_rows] == [row.value for row in expected_rows]
+    verify_circuit(witness, MAX_TXS, MAX_CALLDATA_BYTES, r)
+
+
+def test_shared_keccak_table():
+    MAX_TXS = 5
+    MAX_CALLDATA_BYTES = 16
+    chain_id = U64(1337)
+    sk = keys.PrivateKey(b"\x01" * 32)
+    txs = [gen_tx(i, sk, 0x1234, chain_id) for i in range(3)]
+    keccak_table = KeccakTable(r)
+    keccak_circuit = KeccakCircuit(keccak_table).add(b"\x01\x02", r)
+    witness = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r, keccak_table=keccak_table)
+    # The pub key of the single sender is hashed once
+    assert len(keccak_table) == 2
+    assert len(keccak_circuit.rows) == 2
+    expected = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r).keccak_table.table
+    expected.add((FQ(1), RLC(b"\x02\x01", r, n_bytes=2).expr(), FQ(2), Word(keccak(b"\x01\x02"))))
+    assert keccak_table.table == expected
+    verify_circuit(witness, MAX_TXS, MAX_CALLDATA_BYTES, r)
+    # an input added with another randomness has its own entry
+    entry = keccak_table.add(b"\x01\x02", r + 1)
+    assert len(keccak_table) == 3
+    assert entry.input_rlc == RLC(b"\x02\x01", r + 1, n_bytes=2).expr()
+    assert len(keccak_circuit.rows) == 3
+
+
+def test_keccak_table_shared_with_pi_circuit():
+    MAX_TXS = 5
+    MAX_CALLDATA_BYTES = 16
+    chain_id = U64(1337)
+    sk = keys.PrivateKey(b"\x01" * 32)
+    txs = [gen_tx(i, sk, 0x1234, chain_id) for i in range(3)]
+    block = pi_circuit.Block(
+        hash=U256(1),
+        parent_hash=U256(2),
+        uncle_hash=U256(3),
+        coinbase=U160(4),
+        state_root=U256(5),
+        tx_hash=U256(6),
+        receipt_hash=U256(7),
+        bloom=bytes(256),
+        difficulty=U256(8),
+        number=U64(9),
+        gas_limit=U64(10),
+        gas_used=U64(11),
+        time=U64(12),
+        extra=bytes([]),
+        mix_digest=U256(13),
+        nonce=U64(14),
+        base_fee=U256(0),
+    )
+    pi_tx = pi_circuit.Transaction(
+        nonce=U64(1),
+        gas_price=U256(2),
+        gas=U64(3),
+        from_addr=U160(4),
+        to_addr=U160(5),
+        value=U256(6),
+        data=b"\x01",
+        tx_sign_hash=U256(7),
+    )
+    public_data = pi_circuit.PublicData(
+        chain_id, block, U256(15), [U256(i) for i in range(256)], [pi_tx]
+    )
+    # The circuits RLC encode their inputs with different randomness
+    keccak_table = KeccakTable()
+    witness = txs2witness(txs, chain_id, MAX_TXS, MAX_CALLDATA_BYTES, r, keccak_table=keccak_table)
+    pi_witness = pi_circuit.public_data2witness(
+        public_data, MAX_TXS, MAX_CALLDATA_BYTES, FQ(7), keccak_table=keccak_table
+    )
+    assert pi_witness.keccak_table is keccak_table
+    verify_circuit(witness, MAX_TXS, MAX_CALLDATA_BYTES, r)
+    pi_circuit.verify_circuit(pi_witness, MAX_TXS, MAX_CALLDATA_BYTES)
+
+
 def test_bad_keccak():
     witness, chain_id, MAX_TXS, MAX_CALLDATA_BYTES = gen_valid_witness()
     # Set empty keccak lookup table